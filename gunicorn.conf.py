@@ -0,0 +1,44 @@
+"""
+Gunicorn config for the API
+N uvicorn workers, app imported once in the master (--preload) so the
+models, routes and SDK modules are shared copy-on-write by the workers.
+
+Run: gunicorn -c gunicorn.conf.py src.main:app
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+workers = int(os.environ.get("API_WORKERS") or 0) or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+timeout = 60              # Hung worker is killed and replaced by the master
+graceful_timeout = 30     # In-flight requests finish on SIGTERM
+keepalive = 5
+max_requests = 10000      # Recycle workers now and then (slow leaks)
+max_requests_jitter = 1000
+
+accesslog = None          # Request metrics/logs come from the app itself
+errorlog = "-"
+
+# Prometheus multiprocess mode: every worker writes samples here and
+# /metrics aggregates them. Must be set before prometheus_client is imported.
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/current-affairs-prometheus")
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    """Never share pooled DB connections inherited from the master"""
+    from src.database.session import engine, replica_engine
+    engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Drop live gauges of a dead worker from the aggregate"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,100 @@
+"""
+Benchmark: /content/fetch-daily response serialisation (40 items)
+Old path: FetchDailyResponse(**result) -> response_model re-validation ->
+jsonable_encoder -> json.dumps. New path: fast_response (orjson, no second
+validation). Both run through a real FastAPI app in-process; reports CPU
+time per request and checks the JSON bodies decode to the same data.
+
+Run: python -m scripts.bench_fetch_daily_response [requests]
+"""
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+import httpx
+from fastapi import FastAPI
+from src.api.responses import fast_response
+from src.schemas.content_schemas import ContentItem, FetchDailyResponse
+from src.utils.timezone_utils import now_ist
+
+NUM_REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+NUM_ITEMS = 40
+
+
+def make_result() -> dict:
+    """Service result shaped like ContentService.fetch_daily_content"""
+    base = now_ist().replace(hour=9, minute=0, second=0, microsecond=0)
+    items = []
+    for i in range(NUM_ITEMS):
+        item = {
+            "id": 10_000 + i,
+            "content_type": "question" if i % 7 == 0 else "fact",
+            "exam_type": "UPSC",
+            "title": f"RBI ne repo rate {i} basis points badhaya",
+            "description": "Reserve Bank of India ki Monetary Policy Committee ne " * 6,
+            "explanation": "Repo rate woh dar hai jis par RBI banks ko loan deta hai. " * 3,
+            "date_from": "2025-10-01",
+            "date_to": "2025-10-31",
+            "category": "Economy",
+            "scheduled_time": (base + timedelta(hours=4 * (i // 3))).isoformat(),
+            "delivered_at": None,
+        }
+        if item["content_type"] == "question":
+            item["options"] = ["A) 5.5%", "B) 6%", "C) 6.25%", "D) 6.5%"]
+            item["correct_answer"] = "C"
+        items.append(item)
+    return {
+        "success": True,
+        "items": items,
+        "metadata": {
+            "total_items": NUM_ITEMS, "fact_count": 34, "question_count": 6,
+            "exam_types": ["UPSC"], "subscription_status": "premium",
+            "period_start": datetime(2025, 10, 20).isoformat(),
+            "period_end": datetime(2025, 10, 21).isoformat(),
+            "notification_times": ["09:00", "13:00", "17:00", "21:00"],
+        },
+    }
+
+
+RESULT = make_result()
+app = FastAPI()
+
+
+@app.get("/old", response_model=FetchDailyResponse)
+async def old_path():
+    return FetchDailyResponse(**RESULT)
+
+
+@app.get("/new", response_model=FetchDailyResponse)
+async def new_path():
+    return fast_response(RESULT, FetchDailyResponse, "items", ContentItem)
+
+
+async def measure(client: httpx.AsyncClient, path: str) -> tuple:
+    """CPU ms per request and the last body"""
+    for _ in range(50):  # warm-up
+        await client.get(path)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(NUM_REQUESTS):
+        response = await client.get(path)
+    cpu = (time.process_time() - cpu_start) * 1000 / NUM_REQUESTS
+    wall = (time.perf_counter() - wall_start) * 1000 / NUM_REQUESTS
+    return cpu, wall, response.content
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        old_cpu, old_wall, old_body = await measure(client, "/old")
+        new_cpu, new_wall, new_body = await measure(client, "/new")
+
+    print(f"{NUM_ITEMS} items, {len(new_body)} bytes, {NUM_REQUESTS} requests")
+    print(f"old (pydantic + jsonable_encoder): {old_cpu:6.3f} ms CPU/request ({old_wall:6.3f} ms wall)")
+    print(f"new (fast_response, orjson):       {new_cpu:6.3f} ms CPU/request ({new_wall:6.3f} ms wall)")
+    print(f"CPU saved: {100 * (1 - new_cpu / old_cpu):.0f}%")
+    print(f"identical JSON: {json.loads(old_body) == json.loads(new_body)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Benchmark: "who is due at HH:MM" lookup
+ARRAY contains scan on user_preferences.notification_times vs the
+user_notification_slots primary-key index. Runs on scratch TEMP tables in
+the configured database, so real data is never touched.
+
+Run: python -m scripts.bench_notification_slots [users]
+"""
+import sys
+import time
+from sqlalchemy import text
+from src.database.session import engine
+
+NUM_USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+LOOKUPS = 50
+SLOT = "09:00"
+
+SETUP = [
+    "CREATE TEMP TABLE bench_prefs (user_id INTEGER PRIMARY KEY, notification_times VARCHAR[] NOT NULL)",
+    # Everyone has 4 slots spread over the day, ~1/15 of users are due at 09:00
+    """
+    INSERT INTO bench_prefs
+    SELECT g, ARRAY[
+        to_char(make_time((6 + g % 15), 0, 0), 'HH24:MI'),
+        to_char(make_time((12 + g % 4), (g % 4) * 15, 0), 'HH24:MI'),
+        to_char(make_time((17 + g % 3), 30, 0), 'HH24:MI'),
+        to_char(make_time(21, (g % 2) * 30, 0), 'HH24:MI')
+    ]::VARCHAR[]
+    FROM generate_series(1, :users) g
+    """,
+    "CREATE TEMP TABLE bench_slots (slot_minute SMALLINT, user_id INTEGER, PRIMARY KEY (slot_minute, user_id))",
+    """
+    INSERT INTO bench_slots
+    SELECT DISTINCT (split_part(t, ':', 1)::int * 60 + split_part(t, ':', 2)::int)::smallint, user_id
+    FROM bench_prefs CROSS JOIN LATERAL unnest(notification_times) t
+    """,
+    "ANALYZE bench_prefs",
+    "ANALYZE bench_slots",
+]
+
+ARRAY_QUERY = "SELECT user_id FROM bench_prefs WHERE notification_times @> ARRAY[:slot]::VARCHAR[]"
+SLOT_QUERY = "SELECT user_id FROM bench_slots WHERE slot_minute = :minute"
+
+
+def timed(conn, sql: str, params: dict) -> tuple:
+    """Average ms per lookup and row count"""
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        rows = conn.execute(text(sql), params).fetchall()
+    return (time.perf_counter() - start) * 1000 / LOOKUPS, len(rows)
+
+
+def main():
+    hour, minute = SLOT.split(":")
+    params = {"slot": SLOT, "minute": int(hour) * 60 + int(minute)}
+    with engine.connect() as conn:
+        for sql in SETUP:
+            conn.execute(text(sql), {"users": NUM_USERS})
+
+        for label, sql in (("array contains", ARRAY_QUERY), ("slot index", SLOT_QUERY)):
+            ms, count = timed(conn, sql, params)
+            plan = conn.execute(text(f"EXPLAIN {sql}"), params).scalars().first()
+            print(f"{label:<15} {ms:8.2f} ms/lookup  rows={count}  plan: {plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: enqueueing a 300-chunk PDF job
+Compares per-chunk RPUSH of plain JSON (old path) with what
+JobScheduler.enqueue_job sends (single variadic RPUSH of RedisQueue.encode
+payloads) - wall time and Redis memory.
+
+Run: python -m scripts.bench_redis_queue [num_chunks]
+"""
+import json
+import random
+import sys
+import time
+from src.integrations.redis_queue import RedisQueue, redis_queue
+
+NUM_CHUNKS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+BENCH_QUEUE = "bench:ai_processing_queue"
+
+WORDS = (
+    "Supreme Court ne Delhi pollution construction ban RBI repo rate policy "
+    "budget education allocation G20 summit renewable energy target 2030 "
+    "India China border talks infrastructure railway scheme defence deal"
+).split()
+
+
+def make_chunk(idx: int) -> dict:
+    """Build an AI queue job shaped like PDFProcessor output"""
+    text = f"{idx // 10 + 1}.{idx % 10 + 1} TOPIC\n" + " ".join(random.choice(WORDS) for _ in range(800))
+    return {
+        "job_id": 999999,
+        "chunk_index": idx,
+        "total_chunks": NUM_CHUNKS,
+        "text": text[:5000],
+        "exam_types": ["UPSC", "SSC"],
+        "date_from": "2025-10-01",
+        "date_to": "2025-10-31"
+    }
+
+
+def queue_memory() -> int:
+    """Bytes used by the benchmark queue key"""
+    return int(redis_queue.client.memory_usage(BENCH_QUEUE, samples=0) or 0)
+
+
+def main():
+    random.seed(42)
+    jobs = [make_chunk(i) for i in range(NUM_CHUNKS)]
+    client = redis_queue.raw_client
+    client.delete(BENCH_QUEUE)
+
+    # Old path: one RPUSH round-trip per chunk, plain JSON
+    start = time.perf_counter()
+    for job in jobs:
+        client.rpush(BENCH_QUEUE, json.dumps(job))
+    old_secs = time.perf_counter() - start
+    old_mem = queue_memory()
+    client.delete(BENCH_QUEUE)
+
+    # New path: one variadic RPUSH, compressed payloads (as enqueue_job does,
+    # minus adding the job to the live scheduler rotation)
+    start = time.perf_counter()
+    client.rpush(BENCH_QUEUE, *[RedisQueue.encode(job) for job in jobs])
+    new_secs = time.perf_counter() - start
+    new_mem = queue_memory()
+
+    # Round-trip check: pop decodes compressed payloads transparently
+    first = redis_queue.pop(BENCH_QUEUE, timeout=1)
+    assert first == jobs[0], "Decoded payload does not match original job"
+    client.delete(BENCH_QUEUE)
+
+    print(f"📦 {NUM_CHUNKS} chunks")
+    print(f"   per-chunk push : {old_secs * 1000:8.1f} ms   {old_mem / 1024:8.1f} KiB")
+    print(f"   batched push   : {new_secs * 1000:8.1f} ms   {new_mem / 1024:8.1f} KiB")
+    if new_secs and new_mem:
+        print(f"✅ {old_secs / new_secs:.1f}x faster, {old_mem / new_mem:.1f}x less queue memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Check: promo redemption under a burst
+Fires N simultaneous redemptions (one thread and one session each) at a
+code limited to MAX_USES and counts the winners, for the old
+read-check-increment path and for PromoCodeRepository.redeem (single
+conditional UPDATE ... RETURNING), optionally behind the Redis gate.
+
+Run: python -m scripts.check_promo_redemption postgresql://localhost/ca_check [n] [max_uses] [--gate]
+
+Use a scratch database: promo_codes is created there if missing and the
+check codes are deleted at the end. --gate also needs REDIS_URL.
+"""
+import random
+import sys
+import threading
+import time
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from src.models.promo_code import PromoCode, PromoType
+from src.core.repositories.promo_code_repository import PromoCodeRepository
+
+ARGS = [a for a in sys.argv[1:] if not a.startswith("--")]
+if not ARGS:
+    raise SystemExit(__doc__)
+URL = ARGS[0]
+N = int(ARGS[1]) if len(ARGS) > 1 else 1000
+MAX_USES = int(ARGS[2]) if len(ARGS) > 2 else 100
+USE_GATE = "--gate" in sys.argv
+
+
+def legacy_redeem(session, code: str) -> bool:
+    """The old path: read the row, check in Python, write back used_count + 1"""
+    promo = session.query(PromoCode).filter(PromoCode.code == code).first()
+    if promo.used_count >= promo.max_uses:
+        return False
+    promo.used_count += 1
+    session.commit()
+    return True
+
+
+def atomic_redeem(session, code: str) -> bool:
+    if USE_GATE:
+        from src.integrations.promo_gate import promo_gate
+        if promo_gate.reserve(code, MAX_USES) is False:
+            return False
+    redeemed = PromoCodeRepository(session).redeem(code) is not None
+    session.commit()
+    if USE_GATE and not redeemed:
+        promo_gate.release(code)
+    return redeemed
+
+
+def burst(Session, code: str, redeem) -> dict:
+    """N threads released at once; returns winners, errors and wall time"""
+    barrier = threading.Barrier(N)
+    lock = threading.Lock()
+    outcome = {"won": 0, "lost": 0, "errors": 0}
+
+    def attempt():
+        session = Session()
+        try:
+            barrier.wait()
+            result = "won" if redeem(session, code) else "lost"
+        except Exception:
+            session.rollback()
+            result = "errors"
+        finally:
+            session.close()
+        with lock:
+            outcome[result] += 1
+
+    threads = [threading.Thread(target=attempt) for _ in range(N)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    outcome["seconds"] = time.perf_counter() - started
+    return outcome
+
+
+def main():
+    engine = create_engine(URL, pool_size=50, max_overflow=0, pool_timeout=120)
+    PromoCode.__table__.create(engine, checkfirst=True)
+    Session = sessionmaker(bind=engine)
+    run_id = random.randint(10**5, 10**6)
+    codes = []
+    ok = True
+    print(f"{N} simultaneous redemptions, max_uses={MAX_USES}{' (Redis gate on)' if USE_GATE else ''}\n")
+    try:
+        for label, redeem in (("legacy read-check-increment", legacy_redeem), ("atomic UPDATE ... RETURNING", atomic_redeem)):
+            code = f"CHECK{run_id}{len(codes)}"
+            codes.append(code)
+            with Session() as session:
+                session.add(PromoCode(code=code, promo_type=PromoType.DISCOUNT.value, max_uses=MAX_USES, used_count=0))
+                session.commit()
+
+            outcome = burst(Session, code, redeem)
+            with Session() as session:
+                used = session.query(PromoCode.used_count).filter(PromoCode.code == code).scalar()
+            correct = outcome["won"] == MAX_USES == used
+            print(f"{'✅' if correct else '❌'} {label}: {outcome['won']} won, {outcome['lost']} refused, "
+                  f"{outcome['errors']} errors, used_count={used} ({outcome['seconds']:.2f} s)")
+            if redeem is atomic_redeem:
+                ok = correct
+    finally:
+        with Session() as session:
+            session.execute(delete(PromoCode).where(PromoCode.code.in_(codes)))
+            session.commit()
+
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Check: read-replica routing and read-your-writes
+Two databases on one local Postgres stand in for primary and replica; a
+lag simulator thread copies rows from the first to the second only once
+they are LAG seconds old, like a streaming replica falling behind.
+
+Run: createdb ca_primary && createdb ca_replica
+     python -m scripts.check_replica_routing \\
+         postgresql://localhost/ca_primary postgresql://localhost/ca_replica [lag_seconds]
+
+Needs REDIS_URL (the per-user primary pin lives in Redis). No Docker and
+no real replication; the check tables are dropped at the end.
+"""
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", sys.argv[1] if len(sys.argv) > 1 else "")
+os.environ.setdefault("REPLICA_STICKY_SECONDS", "3")
+
+import random
+import threading
+import time
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from src.config import settings
+from src.database.routing import RoutingSession, bind_user, install_replica_routing, primary_reads, replica_reads
+
+if len(sys.argv) < 3:
+    raise SystemExit(__doc__)
+PRIMARY_URL, REPLICA_URL = sys.argv[1], sys.argv[2]
+LAG = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+metadata = MetaData()
+notes = Table(
+    "replica_check_notes", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, nullable=False),
+    Column("body", String(100), nullable=False),
+    Column("written_at", Float, nullable=False),
+)
+
+
+class LagSimulator(threading.Thread):
+    """Copy primary rows to the replica once they are LAG seconds old"""
+
+    def __init__(self, primary, replica, lag: float):
+        super().__init__(daemon=True)
+        self.primary, self.replica, self.lag = primary, replica, lag
+        self.stop = threading.Event()
+        self.copied = 0
+
+    def run(self):
+        while not self.stop.wait(0.05):
+            with self.primary.connect() as conn:
+                rows = conn.execute(
+                    select(notes).where(notes.c.id > self.copied, notes.c.written_at <= time.time() - self.lag)
+                    .order_by(notes.c.id)
+                ).mappings().all()
+            if rows:
+                with self.replica.begin() as conn:
+                    conn.execute(insert(notes), [dict(row) for row in rows])
+                self.copied = rows[-1]["id"]
+
+
+def count_notes(session, user_id: int) -> int:
+    return session.execute(select(func.count()).select_from(notes).where(notes.c.user_id == user_id)).scalar_one()
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"{'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def main():
+    primary = create_engine(PRIMARY_URL)
+    replica = create_engine(REPLICA_URL)
+    for db_engine in (primary, replica):
+        metadata.drop_all(db_engine)
+        metadata.create_all(db_engine)
+
+    Session = sessionmaker(class_=RoutingSession, bind=primary, replica_bind=replica)
+    install_replica_routing(Session)
+    lag = LagSimulator(primary, replica, LAG)
+    lag.start()
+
+    writer_id = random.randint(10**8, 10**9)   # Fresh ids: no pins left over from earlier runs
+    other_id = writer_id + 1
+    results = []
+    print(f"Lag {LAG:.1f} s, sticky window {settings.REPLICA_STICKY_SECONDS} s\n")
+    try:
+        with Session() as session:
+            bind_user(session, writer_id)
+            session.execute(insert(notes).values(user_id=writer_id, body="hello", written_at=time.time()))
+            with replica_reads(session):
+                results.append(check("read inside the writing transaction hits the primary", count_notes(session, writer_id) == 1))
+            session.commit()
+
+        with Session() as session:
+            bind_user(session, writer_id)
+            with replica_reads(session):
+                results.append(check("writer's next request reads its own write (pinned to primary)", count_notes(session, writer_id) == 1))
+
+        with Session() as session:
+            bind_user(session, other_id)
+            with replica_reads(session):
+                results.append(check("another user's read-only request goes to the lagging replica", count_notes(session, writer_id) == 0))
+                with primary_reads(session):
+                    results.append(check("cache-filling reads (primary_reads) stay on the primary inside a read-only scope", count_notes(session, writer_id) == 1))
+            results.append(check("reads outside read-only scopes stay on the primary", count_notes(session, writer_id) == 1))
+
+        time.sleep(max(LAG, settings.REPLICA_STICKY_SECONDS) + 0.5)
+        with Session() as session:
+            bind_user(session, writer_id)
+            with replica_reads(session):
+                results.append(check("after lag and pin expiry the writer reads from the caught-up replica", count_notes(session, writer_id) == 1))
+                bind = session.get_bind(clause=select(notes))
+                results.append(check("replica engine chosen for read-only selects", bind is replica))
+    finally:
+        lag.stop.set()
+        lag.join()
+        for db_engine in (primary, replica):
+            metadata.drop_all(db_engine)
+
+    print(f"\n{sum(results)}/{len(results)} checks passed")
+    if not all(results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
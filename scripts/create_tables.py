@@ -1,17 +1,22 @@
 """
 Create database tables
-Run once: python create_tables.py
+One-shot schema step: start.sh runs it before the supervisor starts any
+process, so create_all runs once per deploy (not once per API worker) and a
+failure stops the deploy instead of leaving the API serving without tables.
+
+Run: python -m scripts.create_tables   (skipped unless DB_CREATE_ALL_ON_STARTUP)
 """
+import os
+
+os.environ.setdefault("PROCESS_ROLE", "script")  # Pool profile (read when settings load)
+
+import sys
+from src.config import settings
 from src.database.base import Base
 from src.database.session import engine
 
-# Import ALL models (existing + new)
-from src.models.pdf_job import PDFJob
-from src.models.question import Question
-from src.models.user import User
-from src.models.user_preferences import UserPreferences
-from src.models.device_token import DeviceToken
-from src.models.delivery_log import DeliveryLog
+# Import ALL models (registers every table on Base.metadata)
+import src.models
 
 import logging
 
@@ -23,13 +28,15 @@ def create_tables():
     """Create all tables (only creates missing ones)"""
     logger.info("Creating database tables...")
     
-    # This will ONLY create tables that don't exist yet
-    # Existing tables (pdf_jobs, questions) won't be touched
+    # This will ONLY create tables that don't exist yet; changes to
+    # existing tables go through Alembic migrations
     Base.metadata.create_all(bind=engine)
     
-    logger.info("✅ Tables created successfully!")
-    logger.info("Tables: pdf_jobs, questions, users, user_preferences, device_tokens, delivery_logs")
+    logger.info(f"✅ Tables ready: {', '.join(sorted(Base.metadata.tables))}")
 
 
 if __name__ == "__main__":
-    create_tables()
+    if not settings.DB_CREATE_ALL_ON_STARTUP and "--force" not in sys.argv:
+        logger.info("DB_CREATE_ALL_ON_STARTUP is off, skipping create_all (--force to run anyway)")
+    else:
+        create_tables()
@@ -4,6 +4,7 @@ API Dependencies - Authentication & Authorization
 from fastapi import Header, HTTPException, Depends
 from sqlalchemy.orm import Session
 from src.database.session import get_db
+from src.database.routing import bind_user
 from src.core.repositories.user_repository import UserRepository
 from src.integrations.firebase_auth import firebase_auth_client
 from src.models.user import User
@@ -76,7 +77,10 @@ async def get_current_user(
             detail="User account is deactivated"
         )
     
-    logger.info(f"✅ Authenticated user: {user.email or user.firebase_uid}")
+    # Read-your-writes: replica reads stay off while this user's writes replicate
+    bind_user(db, cast(int, user.id))
+    
+    logger.debug("✅ Authenticated user %s", user.id)
     return user
 
 async def get_optional_user(
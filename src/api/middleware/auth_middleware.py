@@ -4,6 +4,7 @@ Validates ADMIN_API_KEY header
 """
 from fastapi import Request, HTTPException, status
 from src.config import settings
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,6 @@ async def verify_admin_key(request: Request):
     Header: X-Admin-API-Key
     """
     api_key = request.headers.get("X-Admin-API-Key")
-    logger.info(f"DEBUG: Comparing incoming key against settings.ADMIN_API_KEY = '{settings.ADMIN_API_KEY}'")
     if not api_key:
         logger.warning("❌ Missing admin API key")
         raise HTTPException(
@@ -22,12 +22,12 @@ async def verify_admin_key(request: Request):
             detail="Missing API key. Provide X-Admin-API-Key header"
         )
     
-    if api_key != settings.ADMIN_API_KEY:
-        logger.warning(f"DEBUG: Comparison failed. Received '{api_key}...', expected '{settings.ADMIN_API_KEY}...'")
+    if not hmac.compare_digest(api_key.encode(), settings.ADMIN_API_KEY.encode()):
+        logger.warning("❌ Invalid admin API key from %s", request.client.host if request.client else "unknown")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key"
         )
     
-    logger.info("✅ Admin authenticated")
+    logger.debug("✅ Admin authenticated")
     return True
@@ -0,0 +1,154 @@
+"""
+Response Compression Middleware
+Brotli (if installed) or gzip for JSON/text responses above a size threshold
+
+Only complete (single-body) responses are compressed; streams such as the
+admin SSE endpoint pass through untouched. Responses that already carry a
+Content-Encoding (pre-compressed cache/precompute payloads) are sent as-is.
+Every complete compressible response, compressed or not, gets Accept-Encoding
+added to its Vary header (merged with e.g. CORS's Vary: Origin) so shared
+caches keep the variants apart.
+"""
+import gzip
+from src.config import settings
+from src.utils.metrics import COMPRESSION_BYTES_SAVED, COMPRESSED_RESPONSES
+import logging
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/",
+    "application/javascript",
+    "application/xml",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (honours q=0)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+def add_vary(headers: list, field: bytes = b"Accept-Encoding") -> list:
+    """Add a field to the response's Vary header, keeping what's there (e.g. CORS's Origin)"""
+    existing = [v for k, v in headers if k.lower() == b"vary"]
+    values = [v.strip() for value in existing for v in value.split(b",") if v.strip()]
+    lowered = {v.lower() for v in values}
+    if b"*" in lowered or field.lower() in lowered:
+        return headers
+    headers = [(k, v) for k, v in headers if k.lower() != b"vary"]
+    headers.append((b"vary", b", ".join(values + [field])))
+    return headers
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware (works with StreamingResponse, unlike BaseHTTPMiddleware)"""
+    
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        # None: nothing we can compress to, but the response still varies by the header
+        encoding = choose_encoding(accept) if accept else None
+        
+        start_message = None
+        passthrough = False
+        
+        async def send_uncompressed(message):
+            start_message["headers"] = add_vary(list(start_message.get("headers", [])))
+            await send(start_message)
+            await send(message)
+        
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if (
+                    b"content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # hold until we see the body
+                return
+            
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming response: send as-is from here on
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            if encoding is None or len(body) < self.minimum_size:
+                await send_uncompressed(message)
+                return
+            
+            compressed = compress(body, encoding)
+            if len(compressed) >= len(body):
+                await send_uncompressed(message)
+                return
+            
+            headers = [
+                (k, v) for k, v in start_message.get("headers", [])
+                if k.lower() != b"content-length"
+            ]
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+            ]
+            start_message["headers"] = add_vary(headers)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+            
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            COMPRESSION_BYTES_SAVED.labels(route_path, encoding).inc(len(body) - len(compressed))
+            COMPRESSED_RESPONSES.labels(route_path, encoding).inc()
+        
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,46 @@
+"""
+Request Metrics Middleware
+Latency, status and DB usage per route template for Prometheus
+"""
+from src.database.instrumentation import start_query_stats
+from src.utils.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+import time
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; added last so it times everything, compression included"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = start_query_stats()
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # The router stores the matched route in scope; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(route, scope["method"], str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.seconds)
@@ -0,0 +1,19 @@
+"""
+Query Inspector Middleware
+Per-request N+1 / slow-query report (enabled with SQL_INSPECTOR_ENABLED)
+"""
+from src.database.query_inspector import inspect_queries
+
+
+class QueryInspectorMiddleware:
+    """Wraps each HTTP request in inspect_queries(); the summary is logged on exit"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with inspect_queries(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
@@ -0,0 +1,213 @@
+"""
+Rate Limiting Middleware
+Token bucket per client in Redis, refilled and spent by one Lua script per request
+
+Policies:
+- admin_upload: POST /api/v1/admin/upload-pdf, RATE_LIMIT_ADMIN_UPLOADS per hour per admin key
+- user_api: any other /api/v1 request with a Bearer token, RATE_LIMIT_USER_API per minute
+
+Users are keyed by a hash of their bearer token: the user id is only known
+once get_current_user has verified the token, and trusting an unverified uid
+claim would let anyone drain another user's bucket. A client stuck in a retry
+loop keeps sending the same token, so it keeps hitting the same bucket.
+
+Once Redis rejects a client, this process answers its requests with 429 until
+Retry-After without asking Redis again, so a flooding client costs nothing but
+a dict lookup. If Redis is unavailable the request is let through.
+"""
+import redis.asyncio as aioredis
+from collections import OrderedDict
+from dataclasses import dataclass
+from src.config import settings
+from src.integrations.lazy import LazyClient
+from src.utils.metrics import RATE_LIMIT_BACKEND_ERRORS, RATE_LIMIT_REJECTIONS
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "rate_limit:{policy}:{client}"
+UPLOAD_PATH = "/api/v1/admin/upload-pdf"
+API_PREFIX = "/api/v1/"
+ERROR_LOG_INTERVAL_SECONDS = 60
+
+# Refill by elapsed time (Redis clock, so API hosts' clocks don't matter), then spend one token.
+# Returns {allowed, tokens left, seconds until one token, seconds until full}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+
+local full_in = (capacity - tokens) / rate
+redis.call('PEXPIRE', KEYS[1], math.ceil(full_in * 1000) + 1000)
+
+local retry_after = 0
+if allowed == 0 then
+    retry_after = (1 - tokens) / rate
+end
+return {allowed, math.floor(tokens), tostring(retry_after), tostring(full_in)}
+"""
+
+
+@dataclass(frozen=True)
+class Policy:
+    """capacity tokens per `per_seconds`, bursting up to capacity"""
+    name: str
+    capacity: int
+    per_seconds: int
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float
+    reset: float
+
+
+class RateLimiter:
+    """Async Redis client plus the registered token bucket script"""
+
+    def __init__(self):
+        self.client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        self._take = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, policy: Policy) -> Decision:
+        allowed, remaining, retry_after, reset = await self._take(
+            keys=[key], args=[policy.capacity, policy.rate]
+        )
+        return Decision(bool(int(allowed)), int(remaining), float(retry_after), float(reset))
+
+
+# Global instance (built on first use, inside the worker's event loop)
+rate_limiter = LazyClient(RateLimiter, "Rate limiter")
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _client_id(secret: str) -> str:
+    """Stable, non-reversible bucket id for a token or API key"""
+    return hashlib.sha256(secret.encode()).hexdigest()[:32]
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware; sits inside MetricsMiddleware so 429s are measured"""
+
+    def __init__(self, app):
+        self.app = app
+        self.admin_upload = Policy("admin_upload", settings.RATE_LIMIT_ADMIN_UPLOADS, 3600)
+        self.user_api = Policy("user_api", settings.RATE_LIMIT_USER_API, 60)
+        # bucket key -> monotonic time until which Redis said the bucket is empty
+        self._blocked: "OrderedDict[str, float]" = OrderedDict()
+        self._last_error_log = 0.0
+
+    def _classify(self, scope) -> Optional[Tuple[Policy, str]]:
+        """Which policy and bucket a request falls under (None = not limited)"""
+        path = scope["path"]
+        if path == UPLOAD_PATH and scope["method"] == "POST":
+            api_key = _header(scope, b"x-admin-api-key")
+            return (self.admin_upload, _client_id(api_key)) if api_key else None
+        if path.startswith(API_PREFIX):
+            authorization = _header(scope, b"authorization")
+            if authorization and authorization.startswith("Bearer "):
+                return self.user_api, _client_id(authorization[7:].strip())
+        return None
+
+    def _remember_block(self, key: str, until: float) -> None:
+        self._blocked[key] = until
+        self._blocked.move_to_end(key)
+        while len(self._blocked) > settings.RATE_LIMIT_LOCAL_KEYS:
+            self._blocked.popitem(last=False)
+
+    @staticmethod
+    def _headers(policy: Policy, remaining: int, reset: float) -> Dict[bytes, bytes]:
+        return {
+            b"ratelimit-limit": str(policy.capacity).encode(),
+            b"ratelimit-remaining": str(max(remaining, 0)).encode(),
+            b"ratelimit-reset": str(math.ceil(reset)).encode(),
+        }
+
+    async def _reject(self, send, policy: Policy, retry_after: float) -> None:
+        retry = max(1, math.ceil(retry_after))
+        body = json.dumps({"detail": f"Rate limit exceeded. Retry in {retry} s"}).encode()
+        headers = self._headers(policy, 0, retry)
+        headers[b"retry-after"] = str(retry).encode()
+        headers[b"content-type"] = b"application/json"
+        headers[b"content-length"] = str(len(body)).encode()
+        await send({"type": "http.response.start", "status": 429, "headers": list(headers.items())})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        match = self._classify(scope)
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+
+        policy, client = match
+        key = BUCKET_KEY.format(policy=policy.name, client=client)
+        now = time.monotonic()
+        blocked_until = self._blocked.get(key)
+        if blocked_until is not None:
+            if now < blocked_until:
+                RATE_LIMIT_REJECTIONS.labels(policy.name, "local").inc()
+                await self._reject(send, policy, blocked_until - now)
+                return
+            del self._blocked[key]
+
+        try:
+            decision = await rate_limiter.take(key, policy)
+        except Exception as e:
+            RATE_LIMIT_BACKEND_ERRORS.labels(policy.name).inc()
+            if now - self._last_error_log > ERROR_LOG_INTERVAL_SECONDS:
+                self._last_error_log = now
+                logger.warning(f"⚠️ Rate limiter unavailable, letting requests through: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            RATE_LIMIT_REJECTIONS.labels(policy.name, "redis").inc()
+            self._remember_block(key, now + decision.retry_after)
+            await self._reject(send, policy, decision.retry_after)
+            return
+
+        extra = self._headers(policy, decision.remaining, decision.reset)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + list(extra.items())
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,47 @@
+"""
+Fast JSON Responses
+orjson rendering, plus a fast path for routes whose payloads are already
+shaped by the service layer (no second pydantic pass, no jsonable_encoder)
+"""
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type
+import orjson
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-rendered JSON (UTC datetimes as "Z", like pydantic)"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def shape_items(items: List[Dict[str, Any]], model: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    Project service-built dicts onto a response model's fields
+    Same keys as model_dump() (missing optionals -> None, extras dropped), without validation
+    """
+    fields = _model_fields(model)
+    return [{name: item.get(name) for name in fields} for item in items]
+
+
+def fast_response(
+    result: Dict[str, Any],
+    response_model: Type[BaseModel],
+    items_key: str,
+    item_model: Type[BaseModel],
+    status_code: int = 200
+) -> FastJSONResponse:
+    """
+    Serialize a pre-validated service result straight to JSON
+    Top-level keys follow response_model, the list under items_key follows item_model
+    """
+    payload = {name: result.get(name) for name in _model_fields(response_model)}
+    payload[items_key] = shape_items(result.get(items_key) or [], item_model)
+    return FastJSONResponse(payload, status_code=status_code)
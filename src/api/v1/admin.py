@@ -2,28 +2,38 @@
 Admin API Routes
 PDF upload and job management
 """
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, cast
 from datetime import date
 from src.database.session import get_db
-from src.schemas.admin_schemas import PDFUploadResponse, JobStatusResponse
+from src.schemas.admin_schemas import PDFUploadResponse, JobStatusResponse, JobPriorityRequest
 from src.core.repositories.pdf_job_repository import PDFJobRepository
 from src.core.services.pdf_service import PDFService
 from src.api.middleware.auth_middleware import verify_admin_key
 from src.integrations.redis_queue import redis_queue
+from src.integrations.job_scheduler import job_scheduler
+from src.integrations.job_progress import job_progress
+from src.integrations.job_events import job_event_hub, FINAL_STAGES
+from src.constants import DEFAULT_JOB_PRIORITY, MAX_JOB_PRIORITY
+import asyncio
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+SSE_KEEPALIVE_SECONDS = 15
+
 @router.post("/upload-pdf", response_model=PDFUploadResponse)
 async def upload_pdf(
     pdf: UploadFile = File(..., description="PDF file to upload"),
     exam_types: str = Form(..., description="Comma-separated exam types"),
     date_from: str = Form(..., description="Start date (YYYY-MM-DD)"),
     date_to: str = Form(..., description="End date (YYYY-MM-DD)"),
+    priority: int = Form(DEFAULT_JOB_PRIORITY, ge=1, le=MAX_JOB_PRIORITY, description="AI queue priority (higher = faster)"),
     db: Session = Depends(get_db),
     _: bool = Depends(verify_admin_key)
 ):
@@ -39,7 +49,8 @@ async def upload_pdf(
       -F "pdf=@current_affairs.pdf" \
       -F "exam_types=UPSC,SSC" \
       -F "date_from=2025-10-01" \
-      -F "date_to=2025-10-07"
+      -F "date_to=2025-10-07" \
+      -F "priority=5"
     ```
     """
     # Parse exam types
@@ -64,7 +75,8 @@ async def upload_pdf(
         exam_types=exam_list,
         date_from=date_from,
         date_to=date_to,
-        uploaded_by="admin"  # Can be enhanced with Firebase auth later
+        uploaded_by="admin",  # Can be enhanced with Firebase auth later
+        priority=priority
     )
     
     if not result["success"]:
@@ -77,7 +89,8 @@ async def upload_pdf(
         "r2_key": result.get("r2_key"),
         "exam_types": exam_list,
         "date_from": date_from,
-        "date_to": date_to
+        "date_to": date_to,
+        "priority": priority
     }
     redis_queue.push("pdf_processing_queue", queue_job)
     logger.info(f"📤 Upload request: {filename}, Exams: {exam_types}, Dates: {date_from} to {date_to}")
@@ -89,7 +102,7 @@ async def upload_pdf(
     )
 
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(
+def get_job_status(
     job_id: int,
     db: Session = Depends(get_db),
     _: bool = Depends(verify_admin_key)
@@ -97,13 +110,98 @@ async def get_job_status(
     """
     Get PDF job status
     
+    While a job is being processed (and for a day after), status and live
+    progress (chunks done, ETA) come from Redis counters - no DB query.
+    
     **Authentication:** Requires `X-Admin-API-Key` header
     """
+    # Plain def: Redis and DB calls block, so FastAPI runs this in its threadpool
+    progress = job_progress.get(job_id)
+    if progress:
+        return _job_progress_response(progress)
+    
     pdf_repo = PDFJobRepository(db)
     job = pdf_repo.get_by_id(job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return _job_status_response(job)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    request: Request,
+    _: bool = Depends(verify_admin_key)
+):
+    """
+    Server-sent events stream of job progress (replaces polling /jobs/{job_id})
+    
+    Sends the current progress snapshot first, then one event per stage
+    transition published by the PDF/AI workers. Stream ends after
+    `completed` or `failed`. No DB queries.
+    
+    **Authentication:** Requires `X-Admin-API-Key` header
+    
+    **Example:**
+    ```
+    curl -N "http://localhost:8000/api/v1/admin/jobs/123/events" \
+      -H "X-Admin-API-Key: your-admin-key"
+    ```
+    """
+    async def event_stream():
+        queue = await job_event_hub.subscribe(job_id)
+        try:
+            snapshot = await run_in_threadpool(job_progress.get, job_id)
+            if snapshot:
+                yield _sse_message("progress", snapshot)
+                if snapshot["status"] in FINAL_STAGES:
+                    return
+            
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                yield _sse_message(event["stage"], event)
+                if event["stage"] in FINAL_STAGES:
+                    break
+        finally:
+            await job_event_hub.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.put("/jobs/{job_id}/priority", response_model=JobStatusResponse)
+def update_job_priority(
+    job_id: int,
+    request: JobPriorityRequest,
+    db: Session = Depends(get_db),
+    _: bool = Depends(verify_admin_key)
+):
+    """
+    Change AI queue priority of a job
+    
+    Takes effect immediately for chunks still waiting in the queue.
+    
+    **Authentication:** Requires `X-Admin-API-Key` header
+    """
+    pdf_repo = PDFJobRepository(db)
+    job = pdf_repo.update_priority(job_id, request.priority)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    job_scheduler.set_priority(job_id, request.priority)
+    job_progress.update(job_id, priority=request.priority)
+    return _job_status_response(job)
+
+def _job_status_response(job) -> JobStatusResponse:
+    """Build job status response from a PDFJob row"""
     return JobStatusResponse(
         job_id=cast(int, job.id),
         status=str(job.status),
@@ -112,6 +210,32 @@ async def get_job_status(
         date_from=cast(date, job.date_from),
         date_to=cast(date, job.date_to),
         created_at=cast(str, job.created_at.strftime("%d %b %Y, %I:%M %p")),
+        priority=cast(int, job.priority),
         total_questions_generated=cast(int, job.total_questions_generated),
         total_facts_generated=cast(int, job.total_facts_generated)
     )
+
+def _job_progress_response(progress: dict) -> JobStatusResponse:
+    """Build job status response from live Redis progress counters"""
+    return JobStatusResponse(
+        job_id=progress["job_id"],
+        status=progress["status"],
+        filename=progress["filename"],
+        exam_types=progress["exam_types"],
+        date_from=date.fromisoformat(progress["date_from"]),
+        date_to=date.fromisoformat(progress["date_to"]),
+        created_at=progress["created_at"],
+        priority=progress["priority"],
+        total_questions_generated=progress["questions"],
+        total_facts_generated=progress["facts"],
+        total_chunks=progress["total_chunks"],
+        chunks_done=progress["chunks_done"],
+        chunks_failed=progress["chunks_failed"],
+        tokens_used=progress["tokens"],
+        progress_percent=progress["progress_percent"],
+        eta_seconds=progress["eta_seconds"]
+    )
+
+def _sse_message(event: str, data: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -3,12 +3,15 @@
 Content API Routes
 Daily content sync for mobile app with OFFLINE-FIRST support
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from src.database.session import get_db
+from src.config import settings
+from src.database.session import get_db, pool_utilization
 from src.api.dependencies import get_current_user
 from src.models.user import User
 from src.schemas.content_schemas import (
+    ContentItem,
     DailySyncResponse,
     FetchDailyRequest,
     FetchDailyResponse,
@@ -16,15 +19,32 @@ from src.schemas.content_schemas import (
     MarkDeliveredResponse
 )
 from src.core.repositories.content_repository import ContentRepository
+from src.core.repositories.preference_repository import PreferenceRepository
 from src.core.services.content_service import ContentService
+from src.api.responses import fast_response
+from src.integrations.content_packs import content_packs, request_fingerprint
+from src.utils.metrics import FETCH_DAILY_COALESCED, FETCH_DAILY_SHED
+from src.utils.singleflight import SingleFlight
 import logging
+import zlib
 from datetime import datetime
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/content", tags=["content"])
 
 
+# Identical fetch-daily requests in flight in this worker share one DB fetch
+fetch_daily_flights = SingleFlight()
+
+
+def _shed_retry_after(user_id: int) -> int:
+    """Retry-After for a shed request: FETCH_SHED_RETRY_SECONDS plus up to as much again, per user"""
+    base = settings.FETCH_SHED_RETRY_SECONDS
+    return base + zlib.crc32(str(user_id).encode()) % max(base, 1)
+
+
 @router.post("/fetch-daily", response_model=FetchDailyResponse)
 async def fetch_daily_content(
     request: FetchDailyRequest,
@@ -35,7 +55,9 @@ async def fetch_daily_content(
     📱 OFFLINE-FIRST: Fetch content for entire day/period
     
     Frontend calls this:
-    1. Every night at 11:59 PM to fetch tomorrow's content
+    1. Nightly, at `next_sync_after` from the previous response (before
+       `next_sync_before`), to fetch tomorrow's content. Older app versions
+       without these fields sync at 11:59 PM
     2. When user changes preferences (more notifications, different times)
     3. When user opens app and local SQLite has insufficient content
     
@@ -45,44 +67,93 @@ async def fetch_daily_content(
     - Mix of facts (85%) and questions (15%)
     - Based on user's exam preferences
     - Only content NOT recently delivered to this user
+    - This user's next sync window (hashed across FETCH_SYNC_SPREAD_MINUTES)
+    
+    Under load:
+    - Identical requests already in flight in this worker share one fetch
+    - When the DB pool is saturated, the pack of an identical request from the
+      last FETCH_DAILY_PACK_TTL_SECONDS is served again (metadata.served_from_pack),
+      otherwise 503 with Retry-After. Packs are saved only while the pool is busy
     
     Frontend then:
     - Stores in local SQLite
     - Schedules LOCAL notifications (works offline)
     - Sends notifications even without internet
     """
+    user_id = current_user.id
     try:
-        logger.info(f"📥 Fetch daily content request from user {current_user.id}")
-        logger.info(f"   Period: {request.from_time} to {request.to_time}")
-        logger.info(f"   Notification times: {request.notification_times}")
-        logger.info(f"   Items per notification: {request.daily_item_count}")
+        logger.debug(
+            "📥 Fetch daily for user %s: %s to %s, times %s, %s per notification",
+            user_id, request.from_time, request.to_time, request.notification_times, request.daily_item_count
+        )
         
-        content_service = ContentService()
+        fingerprint = request_fingerprint(request.model_dump(mode="json"))
+        sync_after, sync_before = ContentService.sync_window(user_id)
         
-        # Fetch content for the entire period
-        result = content_service.fetch_daily_content(
-            user=current_user,
-            from_time=request.from_time,
-            to_time=request.to_time,
-            notification_times=request.notification_times,
-            daily_item_count=request.daily_item_count,
-            content_type_ratio=request.content_type_ratio,
-            exam_types=request.exam_types,
-            db=db
+        # Load shedding: don't queue more work on a saturated pool
+        if settings.FETCH_SHED_ENABLED and pool_utilization() >= settings.FETCH_SHED_POOL_UTILIZATION:
+            pack = content_packs.load(user_id, fingerprint)
+            if pack is None:
+                FETCH_DAILY_SHED.labels("rejected").inc()
+                retry_after = _shed_retry_after(user_id)
+                logger.warning(f"⚠️ DB pool saturated, shedding fetch-daily for user {user_id} (retry in {retry_after} s)")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server busy, please retry later",
+                    headers={"Retry-After": str(retry_after)}
+                )
+            FETCH_DAILY_SHED.labels("pack").inc()
+            logger.info("📦 DB pool saturated, serving last pack to user %s", user_id)
+            result = pack["result"]
+            result["metadata"] = {**(result.get("metadata") or {}), "served_from_pack": True, "pack_built_at": pack["built_at"]}
+            result.update(next_sync_after=sync_after, next_sync_before=sync_before)
+            return fast_response(result, FetchDailyResponse, "items", ContentItem)
+        
+        def fetch() -> dict:
+            result = ContentService().fetch_daily_content(
+                user=current_user,
+                from_time=request.from_time,
+                to_time=request.to_time,
+                notification_times=request.notification_times,
+                daily_item_count=request.daily_item_count,
+                content_type_ratio=request.content_type_ratio,
+                exam_types=request.exam_types,
+                db=db
+            )
+            # Packs only matter once shedding is near; a quiet pool pays no extra SET
+            if result['success'] and pool_utilization() >= settings.FETCH_PACK_SAVE_UTILIZATION:
+                content_packs.save(user_id, fingerprint, result)
+            return result
+        
+        # Fetch content for the entire period (off the event loop; duplicates wait for it)
+        result, shared = await fetch_daily_flights.do(
+            (user_id, fingerprint), lambda: run_in_threadpool(fetch)
         )
+        if shared:
+            FETCH_DAILY_COALESCED.inc()
+            logger.debug("🔗 Coalesced fetch-daily for user %s with an in-flight request", user_id)
         
         if not result['success']:
-            logger.warning(f"⚠️ Fetch failed for user {current_user.id}: {result.get('error')}")
+            logger.warning(f"⚠️ Fetch failed for user {user_id}: {result.get('error')}")
             raise HTTPException(status_code=404, detail=result.get('error', 'No content available'))
         
-        logger.info(f"✅ Fetched {len(result['items'])} items for user {current_user.id}")
+        # The one INFO line per fetch
+        logger.info(
+            "✅ Fetched %s items for user %s (%s to %s)",
+            len(result['items']), user_id, request.from_time, request.to_time
+        )
         
-        return FetchDailyResponse(**result)
+        # Items are built by ContentService from DB rows - skip re-validation
+        # (result may be shared with coalesced requests: copy, don't mutate)
+        return fast_response(
+            {**result, "next_sync_after": sync_after, "next_sync_before": sync_before},
+            FetchDailyResponse, "items", ContentItem
+        )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Fetch daily failed for user {current_user.id}: {e}")
+        logger.error(f"❌ Fetch daily failed for user {user_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch content: {str(e)}")
 
 
@@ -101,7 +172,7 @@ async def daily_sync(
     - Only returns undelivered content
     """
     try:
-        logger.info(f"📥 Daily sync request from user {current_user.id}")
+        logger.debug("📥 Daily sync request from user %s", current_user.id)
 
         content_service = ContentService()
         result = content_service.get_daily_content_for_user(current_user, db)
@@ -109,7 +180,7 @@ async def daily_sync(
         if not result['success']:
             logger.warning(f"⚠️ No content available for user {current_user.id}: {result.get('error')}")
 
-        return DailySyncResponse(**result)
+        return fast_response(result, DailySyncResponse, "content", ContentItem)
 
     except Exception as e:
         logger.error(f"❌ Daily sync failed for user {current_user.id}: {e}")
@@ -131,7 +202,7 @@ async def mark_content_as_read(
     - Expands explanation
     """
     try:
-        logger.info(f"✅ Marking content {content_id} as read for user {current_user.id}")
+        logger.debug("✅ Marking content %s as read for user %s", content_id, current_user.id)
 
         content_repo = ContentRepository()
         success = content_repo.mark_as_delivered(
@@ -163,7 +234,7 @@ async def get_random_fact(
     Get a single random fact based on user's exam preferences
     """
     try:
-        logger.info(f"📚 Random fact request from user {current_user.id}")
+        logger.debug("📚 Random fact request from user %s", current_user.id)
         
         content_service = ContentService()
         result = content_service.get_random_content(
@@ -193,7 +264,7 @@ async def get_random_question(
     Get a single random question based on user's exam preferences
     """
     try:
-        logger.info(f"❓ Random question request from user {current_user.id}")
+        logger.debug("❓ Random question request from user %s", current_user.id)
         
         content_service = ContentService()
         result = content_service.get_random_content(
@@ -217,16 +288,20 @@ async def get_random_question(
 @router.get("/history")
 async def get_content_history(
     page: int = 1,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get user's content history (past 30 days)
     Premium users only
+    
+    Scroll with `cursor` = previous response's `next_cursor` (null on the last page).
+    `page` is kept for older app versions.
     """
     try:
-        logger.info(f"📜 History request from user {current_user.id}")
+        logger.debug("📜 History request from user %s", current_user.id)
         
         # Check if premium
         if current_user.subscription_status not in ['premium', 'trial']:
@@ -236,14 +311,18 @@ async def get_content_history(
             )
         
         content_service = ContentService()
-        result = content_service.get_user_history(
-            user=current_user,
-            page=page,
-            limit=limit,
-            db=db
-        )
+        try:
+            result = content_service.get_user_history(
+                user=current_user,
+                page=page,
+                limit=limit,
+                db=db,
+                cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid history cursor")
         
-        return DailySyncResponse(**result)
+        return fast_response(result, DailySyncResponse, "content", ContentItem)
     
     except HTTPException:
         raise
@@ -259,12 +338,12 @@ async def mark_delivered(
     db: Session = Depends(get_db)
 ):
     try:
-        logger.info(f"✅ Marking {len(request.question_ids)} items as delivered for user {current_user.id}")
+        logger.debug("✅ Marking %s items as delivered for user %s", len(request.question_ids), current_user.id)
         delivered_at = None
         if request.delivered_at:
             try:
                 delivered_at = datetime.fromisoformat(request.delivered_at.replace('Z', '+00:00'))
-                logger.info(f"   Using custom timestamp: {delivered_at}")
+                logger.debug("   Using custom timestamp: %s", delivered_at)
             except Exception as e:
                 logger.warning(f"⚠️ Failed to parse delivered_at: {request.delivered_at}, using current time. Error: {e}")
         
@@ -296,8 +375,7 @@ async def get_scheduled_content(
 ):
     """Get scheduled content for a time range"""
     try:
-        logger.info(f"📅 Scheduled content request from user {current_user.id}")
-        logger.info(f"   Range: {start_time} to {end_time}")
+        logger.debug("📅 Scheduled content request from user %s: %s to %s", current_user.id, start_time, end_time)
         
         # ✅ CONVERT ISO STRINGS TO DATETIME WITH TIMEZONE
         from datetime import datetime
@@ -306,10 +384,9 @@ async def get_scheduled_content(
         start_dt = to_ist(start_time)  # Convert ISO string to datetime
         end_dt = to_ist(end_time)
         
-        # Get user preferences
-        from src.core.repositories.preference_repository import PreferenceRepository
+        # Get user preferences (versioned Redis snapshot, Postgres on miss)
         pref_repo = PreferenceRepository(db)
-        prefs = pref_repo.get_by_user_id(current_user.id)
+        prefs = pref_repo.get_snapshot(current_user.id)
         
         if not prefs:
             raise HTTPException(status_code=404, detail="User preferences not found")
@@ -320,18 +397,17 @@ async def get_scheduled_content(
             user=current_user,
             from_time=start_dt,  # ✅ Pass datetime object
             to_time=end_dt,       # ✅ Pass datetime object
-            notification_times=prefs.notification_times or ['09:00', '13:00', '18:00', '21:00'],
-            daily_item_count=prefs.daily_item_count or 3,
+            notification_times=prefs["notification_times"] or ['09:00', '13:00', '18:00', '21:00'],
+            daily_item_count=prefs["daily_item_count"] or 3,
             content_type_ratio={'fact': 85, 'question': 15},
-            exam_types=prefs.exam_types or ['UPSC'],
+            exam_types=prefs["exam_types"] or ['UPSC'],
             db=db
         )
-        print("The data return from backend is : ", result)
         if not result['success']:
             logger.warning(f"⚠️ No scheduled content for user {current_user.id}")
             return []
         
-        logger.info(f"✅ Returning {len(result['items'])} scheduled items")
+        logger.info("✅ Returning %s scheduled items to user %s", len(result['items']), current_user.id)
         return result['items']
     
     except HTTPException:
@@ -29,6 +29,15 @@ class Settings(BaseSettings):
     
     # Database (Render PostgreSQL)
     DATABASE_URL: Optional[str] = None
+    DB_CREATE_ALL_ON_STARTUP: bool = True   # scripts.create_tables in start.sh; Alembic-managed deployments turn this off
+    DATABASE_REPLICA_URL: Optional[str] = None   # Streaming replica for @read_only repository reads
+    REPLICA_STICKY_SECONDS: int = 5         # Reads stay on the primary this long after a write (> replica lag)
+    PROCESS_ROLE: str = "api"               # api | celery | pdf_worker | ai_worker | script - picks the pool profile
+    DB_POOL_SIZE: Optional[int] = None      # Overrides the role's profile
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800             # Seconds; below any server/proxy idle timeout
+    DB_PGBOUNCER: bool = False              # Transaction pooling: no startup options, timezone set on the role
     
     # Redis (Render Redis)
     REDIS_URL: Optional[str] = None
@@ -61,8 +70,12 @@ class Settings(BaseSettings):
     FIREBASE_UNIVERSE_DOMAIN: str = "googleapis.com"
     
     # FCM
-    FCM_MAX_BATCH_SIZE: int = 500
+    FCM_MAX_BATCH_SIZE: int = 500          # Tokens per dispatch batch (sent as multicasts of <= 500)
     FCM_RETRY_ATTEMPTS: int = 3
+    FCM_BACKEND: str = "firebase"          # "firebase" or "local" (stand-in, no network)
+    FCM_DISPATCH_CONCURRENCY: int = 8      # Multicast batches in flight per slot
+    FCM_LOCAL_LATENCY_MS: int = 50
+    FCM_LOCAL_FAILURE_RATE: float = 0.0
     
     # Cloudflare R2 (PDF Storage)
     R2_ENDPOINT: Optional[str] = None
@@ -90,15 +103,73 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: Optional[str] = None
     ADMIN_API_KEY: str = Field(default="change-me-in-production")
     
-    # Rate Limiting
-    RATE_LIMIT_ADMIN_UPLOADS: int = 10
-    RATE_LIMIT_USER_API: int = 100
+    # Rate Limiting (token buckets in Redis, see src/api/middleware/rate_limit.py)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_ADMIN_UPLOADS: int = 10      # PDF uploads per hour per admin key
+    RATE_LIMIT_USER_API: int = 100          # Requests per minute per user (also the burst size)
+    RATE_LIMIT_LOCAL_KEYS: int = 10000      # Rejected clients remembered in-process until Retry-After
 
 
     
+    # Profile cache (/user/profile, login)
+    PROFILE_CACHE_TTL_SECONDS: int = 300
+    PREFERENCE_CACHE_TTL_SECONDS: int = 3600   # Versioned, so stale entries are never served
+
+    # Nightly fetch-daily spike (see /content/fetch-daily)
+    FETCH_SYNC_WINDOW_START: str = "21:00"  # IST; each user's next sync is hashed into this window
+    FETCH_SYNC_SPREAD_MINUTES: int = 150    # Window length (keep start + spread before midnight)
+    FETCH_DAILY_PACK_TTL_SECONDS: int = 900     # Last served pack per user/request (~ client retry window)
+    FETCH_PACK_SAVE_UTILIZATION: float = 0.5    # Only save packs once this share of the DB pool is busy
+    FETCH_SHED_ENABLED: bool = True
+    FETCH_SHED_POOL_UTILIZATION: float = 0.9    # Shed when this share of the DB pool is checked out
+    FETCH_SHED_RETRY_SECONDS: int = 60      # Base Retry-After for shed requests with no pack (jittered up to 2x)
+
+    # Subscriptions
+    SUBSCRIPTION_EXPIRY_BATCH_SIZE: int = 1000
+    PROMO_REDIS_GATE: bool = False          # Redis pre-decrement of limited promo codes (launch bursts)
+    PROMO_GATE_TTL_SECONDS: int = 300       # Re-seed the Redis counter from Postgres this often
+
+    # Delivery log partitions (history reads 30 days, so keep >= 2 months)
+    DELIVERY_LOG_RETENTION_MONTHS: int = 3
+    DELIVERY_LOG_PARTITIONS_AHEAD: int = 2
+    DELIVERY_LOG_ARCHIVE_PREFIX: str = "archives/delivery_logs"
+
+    # Redis queues (payloads at/above this size are zlib-compressed)
+    QUEUE_COMPRESS_MIN_BYTES: int = 512
+    QUEUE_COMPRESS_LEVEL: int = 6
+
+    # Response compression (brotli if installed, else gzip)
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5   # Dynamic payloads: 4-5 is the speed/ratio sweet spot
+
+    # Prometheus (API serves /metrics; each worker gets its own port, 0 disables)
+    METRICS_PORT_PDF_WORKER: int = 9101
+    METRICS_PORT_AI_WORKER: int = 9102
+
+    # SQL inspector (off by default; slow-query/N+1 logging per request)
+    SQL_INSPECTOR_ENABLED: bool = False
+    SQL_SLOW_QUERY_MS: int = 200
+    SQL_REPEAT_THRESHOLD: int = 5           # Same statement shape this often in one request = N+1
+
+    # Process layout (workers/supervisor.py)
+    API_WORKERS: int = 0                   # gunicorn uvicorn workers; 0 = one per CPU
+    CELERY_CONCURRENCY: int = 2
+    PDF_WORKERS: int = 1
+    AI_WORKERS: int = 1                    # Each one adds Groq load - mind the rate limits
+    WORKER_HEARTBEAT_DIR: str = "/tmp/current-affairs-heartbeats"
+    WORKER_HEARTBEAT_TIMEOUT: int = 300    # Longer than the slowest Groq call
+    SUPERVISOR_GRACEFUL_TIMEOUT: int = 60
+
+    # Startup (integration clients are lazy; the API lifespan warms them in parallel)
+    STARTUP_WARMUP: bool = True
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_DIR: str = "/var/app/logs"
+    LOG_FORMAT: str = "json"               # "json" or "text"
+    LOG_SAMPLE_RATES: str = ""             # "logger.prefix=0.1,..." - share of INFO/DEBUG kept
+    SQL_ECHO: bool = False                 # Log every SQL statement (was tied to DEBUG)
 
 
     #misc
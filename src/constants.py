@@ -85,3 +85,7 @@ QUESTION_PERCENTAGE = 15
 # PDF Processing
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 5
+
+# AI queue scheduling (PDFJob.priority = round-robin weight)
+DEFAULT_JOB_PRIORITY = 1
+MAX_JOB_PRIORITY = 10
@@ -10,6 +10,7 @@ from src.models.question import Question
 from src.models.delivery_log import DeliveryLog
 from datetime import datetime, date
 from src.core.repositories.delivery_log_repository import DeliveryLogRepository
+from src.database.routing import read_only
 import logging
 from src.models.delivery_log import NotificationStatus
 
@@ -18,6 +19,7 @@ logger = logging.getLogger(__name__)
 class ContentRepository:
     """Repository for daily content operations"""
 
+    @read_only
     def get_undelivered_questions(
         self,
         user_id: int,
@@ -34,11 +36,9 @@ class ContentRepository:
         3. Respects fact_count/question_count ratio. Will always return at least one of each if possible.
         """
         try:
-            # Subquery of all delivered for user
-            delivered_ids = db.query(DeliveryLog.question_id).filter(
-                DeliveryLog.user_id == user_id
-            ).distinct()
-            logger.info(f"The fact count here is : {fact_count} and question count is : {question_count}")
+            # Subquery of all delivered for user: live logs + archived partitions' summary
+            delivered_ids = DeliveryLogRepository.delivered_question_ids(user_id)
+            logger.debug("Undelivered lookup for user %s: facts=%s, questions=%s", user_id, fact_count, question_count)
             # Fetch facts: newest first, not delivered, for allowed exams
             facts_query = (
                 db.query(Question)
@@ -67,7 +67,7 @@ class ContentRepository:
             questions = questions_query.all()
 
             content = facts + questions  # preserves facts-first
-            logger.info(f"✅ {len(content)} (facts={len(facts)}, questions={len(questions)}) found for user {user_id}")
+            logger.debug("✅ %s (facts=%s, questions=%s) found for user %s", len(content), len(facts), len(questions), user_id)
             return content
 
         except Exception as e:
@@ -92,6 +92,7 @@ class ContentRepository:
             logger.error(f"Failed to mark as delivered for user {user_id}: {e}")
             return False
 
+    @read_only
     def get_total_available_content(
         self,
         exam_types: List[str],
@@ -4,88 +4,100 @@ from datetime import datetime
 # Add import for explicit casting if needed, though usually not required for native enums
 # from sqlalchemy import cast, Enum as SQLEnumType -- Probably not needed yet
 
+from sqlalchemy import func, insert, select, union
 from src.models.delivery_log import DeliveryLog, NotificationStatus
+from src.models.delivered_question_summary import DeliveredQuestionSummary
 from src.utils.timezone_utils import now_ist
+from src.utils.pagination import encode_cursor, decode_cursor
+from src.database.routing import read_only
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 class DeliveryLogRepository:
+    @staticmethod
+    def delivered_question_ids(user_id: int):
+        """
+        Every question id ever delivered to a user, for NOT IN filters
+        Live delivery_logs partitions plus the summary of archived ones
+        """
+        return union(
+            select(DeliveryLog.question_id).where(DeliveryLog.user_id == user_id),
+            select(func.unnest(DeliveredQuestionSummary.question_ids)).where(
+                DeliveredQuestionSummary.user_id == user_id
+            )
+        )
+
     def mark_as_delivered(self, user_id: int, question_ids: List[int], db: Session, platform="mobile", delivery_status: NotificationStatus = NotificationStatus.SENT,delivered_at: Optional[datetime] = None) -> bool:
         """
         Mark items as delivered for a user, respecting atomic upserts (no repeats).
         """
         try:
             delivery_timestamp = delivered_at if delivered_at else now_ist()
-            new_logs = []
-            # --- DEBUG LOGGING START ---
-            logger.info(f"Attempting to mark {len(question_ids)} items for user {user_id}. Status enum provided: {delivery_status}, Enum value: {delivery_status.value}")
-            # --- DEBUG LOGGING END ---
-
-            for qid in question_ids:
-                already = db.query(DeliveryLog).filter(
+            wanted = list(dict.fromkeys(question_ids))
+            if not wanted:
+                return True
+
+            # One lookup for the whole batch instead of a SELECT per question id.
+            # Only live partitions are checked: content selection already excludes
+            # archived ids (delivered_question_ids), so an archived id only comes back
+            # from a client replaying a months-old mark - re-logging it is accepted
+            already = {
+                qid for (qid,) in db.query(DeliveryLog.question_id).filter(
                     DeliveryLog.user_id == user_id,
-                    DeliveryLog.question_id == qid
-                ).first()
-                if already:
-                    logger.info(f"Skipping already delivered item: user={user_id}, question={qid}")
-                    continue
-
-                # Prepare the status value explicitly and log it
-                status_value_to_insert = delivery_status.value
-                # --- DEBUG LOGGING START ---
-                logger.info(f"Preparing Log Entry for QID {qid}: user={user_id}, question={qid}, status_value='{status_value_to_insert}' (Type: {type(status_value_to_insert)})")
-                # --- DEBUG LOGGING END ---
-
-                # Try creating the object
-                try:
-                    log = DeliveryLog(
-                        user_id=user_id,
-                        question_id=qid,
-                        delivered_at=delivery_timestamp,
-                        platform=platform,
-                        # Ensure using the lowercase string value
-                        delivery_status=status_value_to_insert,
-                        retry_count=0
-                    )
-                    # --- DEBUG LOGGING START ---
-                    # Log the delivery_status attribute *after* object creation but *before* adding to session
-                    # This helps check if SQLAlchemy modifies it during object initialization
-                    logger.debug(f"Log object created for QID {qid}. delivery_status attribute on object: {log.delivery_status} (Type: {type(log.delivery_status)})")
-                    # --- DEBUG LOGGING END ---
-                    new_logs.append(log)
-                except Exception as create_exc:
-                    logger.error(f"Error creating DeliveryLog object for QID {qid}: {create_exc}", exc_info=True)
-                    # Optionally re-raise or handle, but this helps isolate the object creation step
-                    raise create_exc # Re-raise to see if creation itself fails
+                    DeliveryLog.question_id.in_(wanted)
+                )
+            }
+            if already:
+                logger.debug("Skipping %s already delivered items for user %s", len(already), user_id)
+
+            new_logs = [
+                {
+                    "user_id": user_id,
+                    "question_id": qid,
+                    "delivered_at": delivery_timestamp,
+                    "platform": platform,
+                    # Ensure using the lowercase string value
+                    "delivery_status": delivery_status.value,
+                    "retry_count": 0
+                }
+                for qid in wanted if qid not in already
+            ]
 
             if new_logs:
-                logger.info(f"Adding {len(new_logs)} new log entries to session for user {user_id}")
-                db.add_all(new_logs)
-                logger.info("Session prepared with new logs. Attempting commit...")
-                db.commit() # This is where the psycopg2 error likely occurs if the value is wrong at flush time
-                logger.info(f"Successfully committed {len(new_logs)} logs for user {user_id}")
+                # Core executemany, not add_all: the composite primary key (id,
+                # delivered_at) has no insert sentinel, so the ORM would fall back
+                # to one INSERT ... RETURNING per row. Nothing needs the new ids.
+                db.execute(insert(DeliveryLog), new_logs)
+                db.commit()
+                logger.debug("Committed %s delivery logs for user %s", len(new_logs), user_id)
             else:
-                 logger.info(f"No new logs to add for user {user_id} (all items previously delivered).")
+                logger.debug("No new logs to add for user %s (all items previously delivered).", user_id)
             return True
         except Exception as e:
             # Log the exception with traceback information for commit errors
             logger.error(f"DeliveryLog: failed mark_as_delivered during commit/add for user {user_id}: {e}", exc_info=True)
             try:
                 db.rollback() # Attempt rollback
-                logger.info("Rollback successful after error.")
             except Exception as rb_exc:
                 logger.error(f"Exception during rollback: {rb_exc}", exc_info=True)
             return False
 
-    def get_user_history(self, user, page: int, limit: int, db: Session):
+    @read_only
+    def get_user_history(self, user, page: int, limit: int, db: Session, cursor: Optional[str] = None):
         """
         Get user's 30-day/past delivered content history, respecting overall requirements.
+        
+        Keyset pagination: pass the previous response's next_cursor to get the
+        next page (seek on (delivered_at, id), constant cost per page). Without
+        a cursor, page > 1 falls back to the legacy OFFSET path.
+        Raises ValueError for a malformed cursor.
         """
+        cursor_key = decode_cursor(cursor) if cursor else None
         try:
             from datetime import timedelta, datetime
-            from sqlalchemy import and_
+            from sqlalchemy import and_, tuple_
             from src.models.question import Question
             from src.utils.timezone_utils import now_ist, today_ist
 
@@ -102,15 +114,13 @@ class DeliveryLogRepository:
             # End date should be beginning of today (exclude future items)
             history_end = today_ist()  # today_ist returns a date object
 
-            logger.debug(f"History Query for User {user.id}: Start={history_start}, End={history_end}, Page={page}, Limit={limit}")
-
             exam_types = getattr(user.preferences, "exam_types", ['General'])
-            offset = (page - 1) * limit
 
             # Query to get Question objects and their corresponding delivered_at timestamp
             content_query = db.query(
                 Question,
-                DeliveryLog.delivered_at
+                DeliveryLog.delivered_at,
+                DeliveryLog.id
             ).join(
                 DeliveryLog, DeliveryLog.question_id == Question.id
             ).filter(
@@ -121,21 +131,29 @@ class DeliveryLogRepository:
                     DeliveryLog.delivered_at < datetime.combine(history_end, datetime.min.time()).replace(tzinfo=history_start.tzinfo),
                     Question.exam_type.in_(exam_types)
                 )
-            ).order_by(DeliveryLog.delivered_at.desc())
-
-            # Execute the query with offset and limit
-            content_tuples = content_query.offset(offset).limit(limit).all()
-            logger.debug(f"History Query for User {user.id}: Found {len(content_tuples)} raw items for page {page}")
-            logger.info(f"[DEBUG] Sample tuple structure: {content_tuples[0] if content_tuples else 'EMPTY'}")
-            logger.info(f"[DEBUG] First item type: {type(content_tuples[0]) if content_tuples else 'N/A'}")
-            if content_tuples:
-                first_tuple = content_tuples[0]
-                logger.info(f"[DEBUG] Tuple length: {len(first_tuple)}")
-                logger.info(f"[DEBUG] Element 0 (Question): {first_tuple[0].id if hasattr(first_tuple[0], 'id') else first_tuple[0]}")
-                logger.info(f"[DEBUG] Element 1 (delivered_at): {first_tuple[1] if len(first_tuple) > 1 else 'MISSING'}")
-                        # Build formatted list directly from query tuples ensuring delivered_at is correctly matched
+            ).order_by(DeliveryLog.delivered_at.desc(), DeliveryLog.id.desc())
+
+            if cursor_key:
+                # Seek past the last row of the previous page (served by ix_delivery_logs_user_history)
+                content_query = content_query.filter(
+                    tuple_(DeliveryLog.delivered_at, DeliveryLog.id) < tuple_(*cursor_key)
+                )
+            elif page > 1:
+                # Legacy clients still page by number
+                content_query = content_query.offset((page - 1) * limit)
+
+            # One extra row tells us whether another page exists
+            content_tuples = content_query.limit(limit + 1).all()
+            has_more = len(content_tuples) > limit
+            content_tuples = content_tuples[:limit]
+            next_cursor = None
+            if has_more:
+                _, last_delivered_at, last_log_id = content_tuples[-1]
+                next_cursor = encode_cursor(last_delivered_at, last_log_id)
+
+            # Build formatted list directly from query tuples ensuring delivered_at is correctly matched
             formatted = []
-            for q, delivered_at_ts in content_tuples:
+            for q, delivered_at_ts, _ in content_tuples:
                 formatted.append({
                     "id": q.id,
                     "content_type": q.content_type,
@@ -152,14 +170,13 @@ class DeliveryLogRepository:
                     "scheduled_time": None  # History items don't have a future schedule
                 })
 
-            facts = [c for c, dt in content_tuples if c.content_type == 'fact']
-            questions = [c for c, dt in content_tuples if c.content_type == 'question']
-
-            logger.info(f"Successfully retrieved history page {page} for user {user.id}. Items: {len(formatted)}")
+            facts = [c for c, _, _ in content_tuples if c.content_type == 'fact']
+            questions = [c for c, _, _ in content_tuples if c.content_type == 'question']
 
             return {
                 'success': True,
                 'content': formatted,
+                'next_cursor': next_cursor,
                 'metadata': {
                     'total_items': len(formatted),  # This is count for the page, not total history
                     'fact_count': len(facts),
@@ -2,9 +2,11 @@
 Device Token Repository - FCM Token Management
 """
 from typing import Optional, List
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from src.models.device_token import DeviceToken
 from src.core.repositories.base_repository import BaseRepository
+from src.integrations.profile_cache import profile_cache
 from datetime import datetime
 from src.config import settings
 import logging
@@ -39,6 +41,7 @@ class DeviceTokenRepository(BaseRepository[DeviceToken]):
         existing = self.get_by_token(fcm_token)
         
         if existing:
+            previous_user_id = existing.user_id
             # Update existing token (may have changed user/device)
             self.db.query(DeviceToken).filter(
                 DeviceToken.fcm_token == fcm_token
@@ -52,6 +55,9 @@ class DeviceTokenRepository(BaseRepository[DeviceToken]):
                 "last_used_at": datetime.now(settings.IST)
             }, synchronize_session="fetch")
             self.db.commit()
+            # Bulk UPDATE: the session hooks don't see it, so invalidate by hand
+            # (device_count of the new and, if the token moved, the previous owner)
+            profile_cache.invalidate(*{user_id, previous_user_id} - {None})
             self.db.refresh(existing)
             logger.info(f"✅ FCM token updated for user {user_id}")
             return existing
@@ -73,16 +79,46 @@ class DeviceTokenRepository(BaseRepository[DeviceToken]):
     
     def deactivate_token(self, fcm_token: str) -> bool:
         """Mark token as inactive (user logged out or uninstalled)"""
-        updated = self.db.query(DeviceToken).filter(
-            DeviceToken.fcm_token == fcm_token
-        ).update({"is_active": False}, synchronize_session="fetch")
+        owners = self.db.execute(
+            update(DeviceToken)
+            .where(DeviceToken.fcm_token == fcm_token)
+            .values(is_active=False)
+            .returning(DeviceToken.user_id)
+            .execution_options(synchronize_session="fetch")
+        ).scalars().all()
         
-        if updated:
+        if owners:
             self.db.commit()
+            # Bulk UPDATE: invalidate the owner's profile (device_count) by hand
+            profile_cache.invalidate(*{user_id for user_id in owners if user_id is not None})
             logger.info(f"✅ FCM token deactivated: {fcm_token[:20]}...")
             return True
         return False
     
+    def deactivate_tokens(self, fcm_tokens: List[str], chunk_size: int = 1000) -> int:
+        """Mark many tokens inactive (FCM reported them unregistered) - one UPDATE per chunk"""
+        owners = set()
+        updated = 0
+        for i in range(0, len(fcm_tokens), chunk_size):
+            user_ids = self.db.execute(
+                update(DeviceToken)
+                .where(
+                    DeviceToken.fcm_token.in_(fcm_tokens[i:i + chunk_size]),
+                    DeviceToken.is_active == True
+                )
+                .values(is_active=False)
+                .returning(DeviceToken.user_id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            updated += len(user_ids)
+            owners.update(user_ids)
+        self.db.commit()
+        if updated:
+            # Bulk UPDATE: invalidate the owners' profiles (device_count) by hand
+            profile_cache.invalidate(*owners - {None})
+            logger.info(f"✅ Deactivated {updated} FCM tokens of {len(owners)} users")
+        return updated
+    
     def get_active_tokens_by_user(self, user_id: int) -> List[DeviceToken]:
         """Get all active tokens for a user"""
         return self.db.query(DeviceToken).filter(
@@ -6,7 +6,7 @@ from typing import List, Optional, Any, cast
 from sqlalchemy.orm import Session
 from src.models.pdf_job import PDFJob
 from src.core.repositories.base_repository import BaseRepository
-from src.constants import JobStatus
+from src.constants import JobStatus, DEFAULT_JOB_PRIORITY
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,8 @@ class PDFJobRepository(BaseRepository[PDFJob]):
         exam_types: List[str],
         date_from: str,
         date_to: str,
-        uploaded_by: Optional[str] = None
+        uploaded_by: Optional[str] = None,
+        priority: int = DEFAULT_JOB_PRIORITY
     ) -> PDFJob:
         """
         Create new PDF job
@@ -36,7 +37,8 @@ class PDFJobRepository(BaseRepository[PDFJob]):
             "date_from": date_from,
             "date_to": date_to,
             "status": JobStatus.PENDING.value,
-            "uploaded_by": uploaded_by
+            "uploaded_by": uploaded_by,
+            "priority": priority
         }
         
         job = self.create(job_data)
@@ -66,6 +68,15 @@ class PDFJobRepository(BaseRepository[PDFJob]):
             logger.info(f"✅ Job {job_id} status updated: {status}")
         return job
     
+    def update_priority(self, job_id: int, priority: int) -> Optional[PDFJob]:
+        """Update job scheduling priority"""
+        job = self.get_by_id(job_id)
+        if job:
+            job.priority = cast(Any, priority)
+            self.db.commit()
+            logger.info(f"✅ Job {job_id} priority updated: {priority}")
+        return job
+    
     def mark_processing(self, job_id: int) -> Optional[PDFJob]:
         """Mark job as processing"""
         from datetime import datetime
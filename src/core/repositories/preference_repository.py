@@ -1,10 +1,16 @@
 """
 User Preferences Repository
 """
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 from src.models.user_preferences import UserPreferences
+from src.models.user_notification_slot import UserNotificationSlot
 from src.core.repositories.base_repository import BaseRepository
+from src.database.routing import primary_only
+from src.integrations.preference_cache import SNAPSHOT_FIELDS, preference_cache
+from src.integrations.profile_cache import profile_cache
+from src.utils.timezone_utils import time_str_to_minute
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +27,26 @@ class PreferenceRepository(BaseRepository[UserPreferences]):
             UserPreferences.user_id == user_id
         ).first()
     
+    @primary_only
+    def get_snapshot(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Preference values with their version
+        Served from Redis while the version is current, otherwise read here (primary,
+        since the version can't reveal replica lag) and cached
+        """
+        snapshot, version = preference_cache.lookup(user_id)
+        if snapshot is not None:
+            return snapshot
+        
+        prefs = self.get_by_user_id(user_id)
+        if not prefs:
+            return None
+        snapshot = {name: getattr(prefs, name) for name in SNAPSHOT_FIELDS}
+        snapshot["version"] = version
+        if version is not None:
+            preference_cache.store(user_id, snapshot)
+        return snapshot
+    
     def create_default_preferences(self, user_id: int) -> UserPreferences:
         """Create default preferences for new user"""
         prefs_data = {
@@ -31,7 +57,13 @@ class PreferenceRepository(BaseRepository[UserPreferences]):
             "content_type_ratio": {"facts": 85, "questions": 15}
         }
         
-        prefs = self.create(prefs_data)
+        # Preferences row and slot rows in one transaction (no user without slots)
+        prefs = UserPreferences(**prefs_data)
+        self.db.add(prefs)
+        self.db.flush()
+        self.sync_notification_slots(user_id, prefs_data["notification_times"])
+        self.db.commit()
+        self.db.refresh(prefs)
         logger.info(f"✅ Default preferences created for user {user_id}")
         return prefs
     
@@ -65,7 +97,12 @@ class PreferenceRepository(BaseRepository[UserPreferences]):
             self.db.query(UserPreferences).filter(
                 UserPreferences.user_id == user_id
             ).update(update_data, synchronize_session="fetch")
+            if notification_times is not None:
+                self.sync_notification_slots(user_id, notification_times)
             self.db.commit()
+            # Bulk UPDATE: the session hooks don't see it, so invalidate by hand
+            preference_cache.bump(user_id)
+            profile_cache.invalidate(user_id)
             
             # Refresh object
             self.db.refresh(prefs)
@@ -73,6 +110,20 @@ class PreferenceRepository(BaseRepository[UserPreferences]):
         
         return prefs
     
+    def sync_notification_slots(self, user_id: int, notification_times: List[str]) -> None:
+        """
+        Replace the user's rows in user_notification_slots (caller commits)
+        Must run in the same transaction as every notification_times write
+        """
+        self.db.execute(delete(UserNotificationSlot).where(UserNotificationSlot.user_id == user_id))
+        minutes = sorted({time_str_to_minute(t) for t in notification_times})
+        if minutes:
+            self.db.execute(
+                insert(UserNotificationSlot).values([
+                    {"slot_minute": minute, "user_id": user_id} for minute in minutes
+                ])
+            )
+    
     def validate_notification_times(self, times: List[str], is_premium: bool) -> tuple[bool, Optional[str]]:
         """
         Validate notification times format and count
@@ -114,7 +165,9 @@ class PreferenceRepository(BaseRepository[UserPreferences]):
             return None
         
         prefs.notification_times = notification_times
+        self.sync_notification_slots(user_id, notification_times)
         self.db.commit()
+        preference_cache.bump(user_id)
         self.db.refresh(prefs)
         
         return prefs
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Promo Code Repository
+Redemption is one conditional UPDATE, so the usage limit holds under any concurrency
+"""
+from typing import Optional
+from sqlalchemy import func, or_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from src.models.promo_code import PromoCode
+from src.core.repositories.base_repository import BaseRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PromoCodeRepository(BaseRepository[PromoCode]):
+    """Repository for promo codes"""
+
+    def __init__(self, db: Session):
+        super().__init__(db, PromoCode)
+
+    def get_by_code(self, code: str) -> Optional[PromoCode]:
+        """Get promo code by code (case-insensitive: codes are stored upper-case)"""
+        return self.db.query(PromoCode).filter(PromoCode.code == code.upper()).first()
+
+    def redeem(self, code: str) -> Optional[Row]:
+        """
+        Count one use if the code is active, unexpired and under max_uses (caller commits)
+
+        The check and the increment are a single UPDATE ... RETURNING: Postgres
+        re-evaluates the WHERE clause against the latest row version after any
+        concurrent redemption commits, so the code can never be oversold. The
+        row lock is held until the caller's commit - do everything else first.
+
+        Returns: (id, used_count, max_uses) after the increment, or None if the
+        code can't be redeemed (missing, inactive, expired or used up)
+        """
+        used_count = func.coalesce(PromoCode.used_count, 0)
+        result = self.db.execute(
+            update(PromoCode)
+            .where(
+                PromoCode.code == code.upper(),
+                PromoCode.is_active.isnot(False),
+                or_(PromoCode.expires_at.is_(None), PromoCode.expires_at > func.now()),
+                # max_uses 0/NULL = unlimited
+                or_(func.coalesce(PromoCode.max_uses, 0) == 0, used_count < PromoCode.max_uses),
+            )
+            .values(used_count=used_count + 1)
+            .returning(PromoCode.id, PromoCode.used_count, PromoCode.max_uses)
+            .execution_options(synchronize_session=False)
+        )
+        return result.first()
@@ -0,0 +1,46 @@
+"""
+Trial Claim Repository
+"""
+from typing import Optional
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from src.models.trial_claim import TrialClaim
+from src.core.repositories.base_repository import BaseRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TrialClaimRepository(BaseRepository[TrialClaim]):
+    """Repository for trial claims (one per user, one per device)"""
+    
+    def __init__(self, db: Session):
+        super().__init__(db, TrialClaim)
+    
+    def find_claim(self, user_id: int, device_id: Optional[str] = None) -> Optional[TrialClaim]:
+        """
+        Existing claim by this user or on this device (unique index probes)
+        A claim by the user wins if both exist, so the caller can report it
+        """
+        condition = TrialClaim.user_id == user_id
+        if device_id:
+            condition = or_(condition, TrialClaim.device_id == device_id)
+        claims = self.db.execute(select(TrialClaim).where(condition).limit(2)).scalars().all()
+        for claim in claims:
+            if claim.user_id == user_id:
+                return claim
+        return claims[0] if claims else None
+    
+    def claim(self, user_id: int, device_id: Optional[str], source: str) -> bool:
+        """
+        Record a trial claim (caller commits)
+        Returns False if the user or the device already has one - including a
+        claim committed by a concurrent request a moment ago
+        """
+        stmt = (
+            insert(TrialClaim)
+            .values(user_id=user_id, device_id=device_id or None, source=source)
+            .on_conflict_do_nothing()
+            .returning(TrialClaim.id)
+        )
+        return self.db.execute(stmt).first() is not None
@@ -1,10 +1,18 @@
 """
 User Repository - Database Operations for Users
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from src.models.user import User
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert, select, true, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from src.models.user import User, SubscriptionStatus
+from src.models.subscription_history import SubscriptionHistory
+from src.models.user_notification_slot import UserNotificationSlot
+from src.models.user_preferences import UserPreferences
+from src.models.device_token import DeviceToken
+from src.integrations.profile_cache import profile_cache
+from src.utils.timezone_utils import time_str_to_minute
 from src.core.repositories.base_repository import BaseRepository
+from src.database.routing import primary_only
 from datetime import datetime
 from src.config import settings
 import logging
@@ -50,6 +58,44 @@ class UserRepository(BaseRepository[User]):
         logger.info(f"✅ User created: {user.email or user.firebase_uid}")
         return user
     
+    @primary_only
+    def get_profile(self, user_id: int) -> Optional[Tuple[User, Optional[UserPreferences], int]]:
+        """
+        User, preferences and active device count in ONE round-trip
+        (LEFT JOIN preferences + correlated COUNT subquery)
+        Read from the primary: the result refills the profile cache
+        """
+        device_count = (
+            select(func.count(DeviceToken.id))
+            .where(DeviceToken.user_id == User.id, DeviceToken.is_active == true())
+            .correlate(User)
+            .scalar_subquery()
+        )
+        row = self.db.execute(
+            select(User, UserPreferences, device_count.label("device_count"))
+            .outerjoin(UserPreferences, UserPreferences.user_id == User.id)
+            .where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        user, preferences, count = row
+        return user, preferences, int(count or 0)
+    
+    def record_login(self, user_id: int, fields: dict) -> bool:
+        """
+        Login bookkeeping (last_login_at + synced profile fields) as a single
+        UPDATE, without loading and refreshing the row first
+        """
+        updated = self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**fields)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        profile_cache.invalidate(user_id)
+        return bool(updated)
+    
     def update_last_login(self, user_id: int) -> Optional[User]:
         """Update last login timestamp"""
         # Use a DB-level update to avoid assigning to a Column[...] attribute (type-checker issue)
@@ -59,6 +105,7 @@ class UserRepository(BaseRepository[User]):
 
         if updated:
             self.db.commit()
+            profile_cache.invalidate(user_id)
             user = self.get_by_id(user_id)
             if user:
                 self.db.refresh(user)
@@ -88,19 +135,46 @@ class UserRepository(BaseRepository[User]):
         Returns:
             List of users with matching notification time
         """
-        from src.models.user_preferences import UserPreferences
-        
+        # Slot index (PK btree) instead of scanning the notification_times arrays;
+        # selectinload avoids a users x tokens row explosion
         return self.db.query(User).join(
-            UserPreferences, User.id == UserPreferences.user_id
+            UserNotificationSlot, User.id == UserNotificationSlot.user_id
         ).filter(
+            UserNotificationSlot.slot_minute == time_str_to_minute(time_str),
             User.is_active == True,
-            User.is_notification_enabled == True,
-            UserPreferences.notification_times.contains([time_str])  # PostgreSQL array contains
+            User.is_notification_enabled == True
         ).options(
-            joinedload(User.preferences),
-            joinedload(User.device_tokens)
+            selectinload(User.preferences),
+            selectinload(User.device_tokens)
         ).all()
     
+    def iter_notification_tokens(self, time_str: str, batch_size: int = 1000) -> Iterator[List[Tuple[int, str]]]:
+        """
+        Stream (user_id, fcm_token) for every active device of users notified at time_str
+        Same filters as get_users_by_notification_time, but a server-side cursor
+        over plain rows instead of loading User objects with joined tokens
+        
+        Args:
+            time_str: Time in "HH:MM" format (IST)
+            batch_size: Rows fetched per round-trip
+        """
+        from src.models.device_token import DeviceToken
+        
+        rows = self.db.execute(
+            select(User.id, DeviceToken.fcm_token)
+            .join(UserNotificationSlot, User.id == UserNotificationSlot.user_id)
+            .join(DeviceToken, User.id == DeviceToken.user_id)
+            .where(
+                UserNotificationSlot.slot_minute == time_str_to_minute(time_str),
+                User.is_active == True,
+                User.is_notification_enabled == True,
+                DeviceToken.is_active == True
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in rows.partitions(batch_size):
+            yield [(user_id, fcm_token) for user_id, fcm_token in partition]
+    
     def upgrade_to_premium(self, user_id: int, expires_at: datetime) -> Optional[User]:
         """Upgrade user to premium subscription"""
         # Use a DB-level update to avoid static typing issues with ORM Column attributes
@@ -111,8 +185,89 @@ class UserRepository(BaseRepository[User]):
 
         if updated:
             self.db.commit()
+            profile_cache.invalidate(user_id)
             user = self.get_by_id(user_id)
             logger.info(f"✅ User {user_id} upgraded to premium")
             return user
 
         return None
+    
+    def expire_subscriptions_batch(
+        self,
+        now: datetime,
+        batch_size: int,
+        user_ids: Optional[List[int]] = None,
+        skip_locked: bool = True
+    ) -> List[Tuple[int, str]]:
+        """
+        Downgrade one batch of expired trial/premium users to FREE (set-based)
+        
+        One UPDATE ... RETURNING plus one multi-row history INSERT, committed
+        per batch so row locks stay short. Rows locked by a concurrent
+        transaction are skipped and picked up by the next run. Idempotent:
+        users that are already FREE never match.
+        
+        Args:
+            now: Expiry cut-off
+            batch_size: Max users per batch
+            user_ids: Optional candidate ids (only these are considered)
+            skip_locked: Skip rows locked by other transactions instead of waiting
+        
+        Returns:
+            List of (user_id, previous_status) that were downgraded
+        """
+        due_query = select(User.id, User.subscription_status).where(
+            User.subscription_status.in_([SubscriptionStatus.TRIAL.value, SubscriptionStatus.PREMIUM.value]),
+            User.subscription_expires_at < now
+        )
+        if user_ids is not None:
+            due_query = due_query.where(User.id.in_(user_ids))
+        due = due_query.order_by(User.subscription_expires_at).limit(batch_size) \
+            .with_for_update(skip_locked=skip_locked).cte("due")
+        
+        expired = self.db.execute(
+            update(User)
+            .where(User.id == due.c.id)
+            .values(
+                subscription_status=SubscriptionStatus.FREE.value,
+                subscription_expires_at=None,
+                updated_at=now
+            )
+            .returning(User.id, due.c.subscription_status)
+            .execution_options(synchronize_session=False)
+        ).all()
+        
+        if expired:
+            self.db.execute(
+                insert(SubscriptionHistory).values([
+                    {
+                        "user_id": user_id,
+                        "action": "subscription_expired",
+                        "notes": f"Auto-downgraded from {old_status} to FREE",
+                        "granted_by": "system",
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    for user_id, old_status in expired
+                ])
+            )
+        self.db.commit()
+        profile_cache.invalidate(*(user_id for user_id, _ in expired))
+        
+        return [(user_id, old_status) for user_id, old_status in expired]
+    
+    def iter_subscription_expiries(self, batch_size: int = 1000) -> Iterator[List[Tuple[int, datetime]]]:
+        """
+        Stream (user_id, expires_at) of all expiring trial/premium users in batches
+        Used to re-seed the Redis expiry timers
+        """
+        rows = self.db.execute(
+            select(User.id, User.subscription_expires_at)
+            .where(
+                User.subscription_status.in_([SubscriptionStatus.TRIAL.value, SubscriptionStatus.PREMIUM.value]),
+                User.subscription_expires_at.isnot(None)
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in rows.partitions(batch_size):
+            yield [(user_id, expires_at) for user_id, expires_at in partition]
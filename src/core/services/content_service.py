@@ -3,7 +3,7 @@
 Content Service
 Business logic for daily content sync
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from src.core.services.base_service import BaseService
@@ -11,10 +11,13 @@ from src.core.repositories.content_repository import ContentRepository
 from src.core.repositories.preference_repository import PreferenceRepository
 from src.models.user import User, SubscriptionStatus
 from sqlalchemy import cast
+from src.config import settings
 import logging
+import zlib
 from datetime import datetime, timedelta
-from src.utils.timezone_utils import now_ist, to_ist 
+from src.utils.timezone_utils import now_ist, time_str_to_minute, to_ist
 from src.core.repositories.delivery_log_repository import DeliveryLogRepository
+from src.database.routing import read_only
 logger = logging.getLogger(__name__)
 
 
@@ -192,20 +195,20 @@ class ContentService(BaseService):
                 item_data["correct_answer"] = q.correct_answer
             formatted.append(item_data)
         return formatted
+
+    @read_only
     def get_random_content(self, user: User, content_type: str, db: Session) -> Dict[str, Any]:
         """Get a single random content item"""
         try:
-            exam_types = user.preferences.exam_types if user.preferences else ['UPSC']
+            prefs = PreferenceRepository(db).get_snapshot(user.id)
+            exam_types = prefs["exam_types"] if prefs else ['UPSC']
             
             # Get random content from repo
             from sqlalchemy import and_, func, not_
             from src.models.question import Question
-            from src.models.delivery_log import DeliveryLog
             
-            # Subquery: delivered content
-            delivered_ids = db.query(DeliveryLog.question_id).filter(
-                DeliveryLog.user_id == user.id
-            ).subquery() 
+            # Subquery: delivered content (live logs + archived summary)
+            delivered_ids = DeliveryLogRepository.delivered_question_ids(user.id)
             
             # Get undelivered random content
             content = db.query(Question).filter(
@@ -242,18 +245,41 @@ class ContentService(BaseService):
     
    # In backend/src/core/services/content_service.py
 
-    def get_user_history(self, user: User, page: int, limit: int, db: Session) -> Dict[str, Any]:
+    def get_user_history(self, user: User, page: int, limit: int, db: Session, cursor: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieves user's content history via DeliveryLogRepository.
+        Raises ValueError for a malformed cursor.
         """
         try:
             delivery_repo = DeliveryLogRepository()
-            return delivery_repo.get_user_history(user, page, limit, db)
+            return delivery_repo.get_user_history(user, page, limit, db, cursor=cursor)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error getting history for user {user.id}: {e}")
             return {'success': False, 'content': [], 'metadata': {}, 'error': str(e)}
             
 
+    @staticmethod
+    def sync_window(user_id: int, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+        """
+        This user's next nightly fetch-daily window (IST): (next_sync_after, next_sync_before)
+        Users are spread over FETCH_SYNC_SPREAD_MINUTES from FETCH_SYNC_WINDOW_START by a
+        stable hash of their id, so devices stop syncing in the same minute
+        """
+        now = now or now_ist()
+        spread = max(settings.FETCH_SYNC_SPREAD_MINUTES * 60, 1)
+        window_start = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+            minutes=time_str_to_minute(settings.FETCH_SYNC_WINDOW_START)
+        )
+        sync_after = window_start + timedelta(seconds=zlib.crc32(str(user_id).encode()) % spread)
+        sync_before = window_start + timedelta(seconds=spread)
+        if now >= sync_after:
+            # Today's slot has passed (or this is that sync) - point at tomorrow's
+            sync_after += timedelta(days=1)
+            sync_before += timedelta(days=1)
+        return sync_after, sync_before
+
     def fetch_daily_content(
         self,
         user: User,
@@ -270,7 +296,7 @@ class ContentService(BaseService):
             to_time_ist = to_ist(to_time)     # Convert request end time to IST
             now = now_ist()
 
-            logger.info(f"📅 Fetch content for User ID {user.id} requested range (IST): {from_time_ist.isoformat()} to {to_time_ist.isoformat()}")
+            logger.debug("📅 Fetch content for User ID %s requested range (IST): %s to %s", user.id, from_time_ist, to_time_ist)
 
             # --- START OF CORRECTED LOGIC ---
 
@@ -287,15 +313,15 @@ class ContentService(BaseService):
                 # If user was created today, start scheduling from their creation time.
                 if user_creation_time_ist.date() == now.date():
                     effective_start_time_for_today = user_creation_time_ist
-                    logger.info(f"User created today. Effective start time for today's schedule: {effective_start_time_for_today.isoformat()}")
+                    logger.debug("User created today. Effective start time for today's schedule: %s", effective_start_time_for_today)
                 # If user is existing, schedule for the entire day (start from midnight IST).
                 else:
                     effective_start_time_for_today = from_time_ist # Use the request's start time (midnight)
-                    logger.info(f"Existing user full-day sync. Effective start time for today's schedule: {effective_start_time_for_today.isoformat()}")
+                    logger.debug("Existing user full-day sync. Effective start time for today's schedule: %s", effective_start_time_for_today)
             else:
                  # If it's not a full-day sync request, it's likely a preference change,
                  # so only schedule for future slots relative to 'now'.
-                 logger.info(f"Mid-day request detected (likely preference change). Effective start time for today's schedule (future only): {effective_start_time_for_today.isoformat()}")
+                 logger.debug("Mid-day request detected (likely preference change). Effective start time for today's schedule (future only): %s", effective_start_time_for_today)
 
 
             # 1. Determine the relevant notification slots for TODAY based on the effective start time.
@@ -321,11 +347,11 @@ class ContentService(BaseService):
 
             # --- END OF CORRECTED LOGIC ---
 
-            logger.info(f"Slots calculated: Today={len(todays_slots)}, Tomorrow={slots_for_tomorrow}, Total Slots={total_slots_to_fill}")
-            logger.info(f"Total items to fetch: {total_slots_to_fill} slots * {daily_item_count} items/slot = {total_items_to_fetch}")
+            logger.debug("Slots calculated: Today=%s, Tomorrow=%s, Total Slots=%s, items to fetch=%s",
+                         len(todays_slots), slots_for_tomorrow, total_slots_to_fill, total_items_to_fetch)
 
             if total_items_to_fetch <= 0:
-                logger.info("No slots require content. Returning empty list.")
+                logger.debug("No slots require content. Returning empty list.")
                 return {
                     "success": True,
                     "items": [],
@@ -351,7 +377,7 @@ class ContentService(BaseService):
                  question_count = total_items_to_fetch - 1
 
 
-            logger.info(f"Requesting {fact_count} facts and {question_count} questions.")
+            logger.debug("Requesting %s facts and %s questions.", fact_count, question_count)
 
             # Fetch undelivered content 
             content = self.content_repo.get_undelivered_questions(
@@ -362,10 +388,9 @@ class ContentService(BaseService):
                 question_count=question_count,
                 db=db,
             )
-            if(len(content) == 0): logger.info(f"The content is 0 {content}")
             actual_fetched_count = len(content)
             if actual_fetched_count < total_items_to_fetch:
-                logger.warning(f"Fetch Shortfall for user {user.id}: Wanted {total_items_to_fetch}, Got {actual_fetched_count}.")
+                logger.warning("Fetch Shortfall for user %s: Wanted %s, Got %s.", user.id, total_items_to_fetch, actual_fetched_count)
 
             # Assign scheduled times to the fetched content
             scheduled = self._assign_scheduled_times(
@@ -379,7 +404,7 @@ class ContentService(BaseService):
             formatted = self._format_content_for_mobile(scheduled)
             final_item_count = len(formatted)
 
-            logger.info(f"Returning {final_item_count} scheduled items for user {user.id}")
+            logger.debug("Returning %s scheduled items for user %s", final_item_count, user.id)
 
             return {
                 "success": True,
@@ -423,7 +448,7 @@ class ContentService(BaseService):
         today_date = now.date() 
 
         # 1. Schedule for Today's calculated slots
-        logger.info(f"Assigning times for today ({today_date}) for slots: {sorted(todays_slots)}")
+        logger.debug("Assigning times for today (%s) for slots: %s", today_date, todays_slots)
         skipped_past_slots_today = 0
         assigned_today_count = 0
         for time_str in sorted(todays_slots):
@@ -444,12 +469,12 @@ class ContentService(BaseService):
             else:
                 # Skip slots that are in the past relative to 'now'
                 skipped_past_slots_today += 1
-                logger.info(f"Skipping assignment for past/present slot today: {time_str} ({scheduled_time.isoformat()})")
+                logger.debug("Skipping assignment for past/present slot today: %s (%s)", time_str, scheduled_time)
 
         # 2. Schedule for Tomorrow's slots (if needed and content remains)
         if item_index < len(content) and tomorrows_slots:
             tomorrow_date = today_date + timedelta(days=1)
-            logger.info(f"Assigning times for tomorrow ({tomorrow_date}) for slots: {sorted(tomorrows_slots)}")
+            logger.debug("Assigning times for tomorrow (%s) for slots: %s", tomorrow_date, tomorrows_slots)
             for time_str in sorted(tomorrows_slots):
                 if item_index >= len(content): break
                 hour, minute = map(int, time_str.split(":"))
@@ -467,7 +492,7 @@ class ContentService(BaseService):
                         break
 
         final_scheduled_count = len(scheduled_content)
-        logger.info(f"✅ Assigned scheduled times to {final_scheduled_count} items.")
+        logger.debug("✅ Assigned scheduled times to %s items.", final_scheduled_count)
         if item_index < len(content):
             logger.warning(f"⚠️ {len(content) - item_index} fetched items were not assigned a schedule time (insufficient slots or fetch shortfall).")
 
@@ -0,0 +1,146 @@
+"""
+Delivery Log Archive Service
+Retention pipeline for the monthly delivery_logs partitions
+
+For every partition older than DELIVERY_LOG_RETENTION_MONTHS:
+1. Export its raw rows to Parquet in R2
+2. Merge delivered question ids into delivered_question_summaries
+3. Detach and drop the partition (same transaction as 2)
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.config import settings
+from src.database import partitions
+from src.utils.timezone_utils import today_ist
+from datetime import date
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_ROWS = 50_000
+
+EXPORT_COLUMNS = (
+    "id", "user_id", "question_id", "delivered_at", "platform", "delivery_status",
+    "fcm_message_id", "error_message", "retry_count", "created_at", "updated_at"
+)
+
+# Union this partition's ids into each user's summary (sorted, de-duplicated)
+MERGE_SUMMARY_SQL = """
+    INSERT INTO delivered_question_summaries (user_id, question_ids, archived_through, updated_at)
+    SELECT user_id, array_agg(DISTINCT question_id ORDER BY question_id), :archived_through, now()
+    FROM {partition}
+    GROUP BY user_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        question_ids = ARRAY(
+            SELECT DISTINCT qid
+            FROM unnest(delivered_question_summaries.question_ids || EXCLUDED.question_ids) AS qid
+            ORDER BY qid
+        ),
+        archived_through = GREATEST(delivered_question_summaries.archived_through, EXCLUDED.archived_through),
+        updated_at = now()
+"""
+
+
+class DeliveryArchiveService:
+    """Partition maintenance and archival for delivery_logs"""
+    
+    def __init__(self, db: Session, storage=None):
+        self.db = db
+        if storage is None:
+            from src.integrations.r2_storage import r2_storage
+            storage = r2_storage
+        self.storage = storage
+    
+    def ensure_partitions(self, today: Optional[date] = None) -> List[str]:
+        """Create this month's and upcoming monthly partitions"""
+        conn = self.db.connection()
+        created = partitions.ensure_partitions(
+            conn, today or today_ist(), settings.DELIVERY_LOG_PARTITIONS_AHEAD
+        )
+        self.db.commit()
+        return created
+    
+    def export_partition(self, name: str, month: date) -> str:
+        """
+        Stream a partition's rows into a Parquet file in R2; returns the R2 key
+        Rows go to a local temp file one EXPORT_BATCH_ROWS batch at a time and the
+        file is uploaded in parts, so memory stays at one batch whatever the month's size
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("user_id", pa.int64()),
+            ("question_id", pa.int64()),
+            ("delivered_at", pa.timestamp("us", tz="UTC")),
+            ("platform", pa.string()),
+            ("delivery_status", pa.string()),
+            ("fcm_message_id", pa.string()),
+            ("error_message", pa.string()),
+            ("retry_count", pa.int32()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("updated_at", pa.timestamp("us", tz="UTC")),
+        ])
+        rows_written = 0
+        key = f"{settings.DELIVERY_LOG_ARCHIVE_PREFIX}/{month.year:04d}/{month.month:02d}.parquet"
+        
+        with tempfile.TemporaryDirectory(prefix="delivery_archive_") as tmp_dir:
+            path = os.path.join(tmp_dir, f"{name}.parquet")
+            result = self.db.connection().execution_options(stream_results=True).execute(text(
+                f"SELECT {', '.join(EXPORT_COLUMNS)} FROM {name} ORDER BY delivered_at, id"
+            ))
+            with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+                for rows in result.partitions(EXPORT_BATCH_ROWS):
+                    columns = list(zip(*rows))
+                    data = {
+                        column: list(values) for column, values in zip(EXPORT_COLUMNS, columns)
+                    }
+                    data["delivery_status"] = [str(getattr(v, "value", v)) for v in data["delivery_status"]]
+                    writer.write_table(pa.Table.from_pydict(data, schema=schema))
+                    rows_written += len(rows)
+            
+            self.storage.upload_file(path, key, content_type="application/vnd.apache.parquet")
+        
+        logger.info(f"✅ Exported {rows_written} rows of {name} to {key}")
+        return key
+    
+    def archive_partition(self, name: str, month: date) -> Dict[str, object]:
+        """Export, summarize and drop one monthly partition"""
+        start = time.perf_counter()
+        key = self.export_partition(name, month)
+        
+        # Summary merge and drop commit together: ids are never lost, and a
+        # re-run after a failure just merges the same ids again
+        conn = self.db.connection()
+        archived_through = partitions.month_bound(partitions.add_months(month, 1))
+        merged = conn.execute(
+            text(MERGE_SUMMARY_SQL.format(partition=name)),
+            {"archived_through": archived_through}
+        ).rowcount
+        conn.execute(text(f"ALTER TABLE {partitions.PARENT_TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        self.db.commit()
+        
+        logger.info(f"✅ Archived {name}: {merged} user summaries merged ({time.perf_counter() - start:.1f}s)")
+        return {"partition": name, "r2_key": key, "users_merged": merged}
+    
+    def run(self, today: Optional[date] = None) -> Dict[str, object]:
+        """Daily maintenance: create upcoming partitions, archive expired ones"""
+        today = today or today_ist()
+        created = self.ensure_partitions(today)
+        archived = []
+        for name, month in partitions.partitions_to_archive(
+            self.db.connection(), today, settings.DELIVERY_LOG_RETENTION_MONTHS
+        ):
+            try:
+                archived.append(self.archive_partition(name, month))
+            except Exception as e:
+                logger.error(f"❌ Archiving {name} failed: {e}")
+                self.db.rollback()
+                raise
+        return {"created": created, "archived": archived}
@@ -0,0 +1,119 @@
+"""
+FCM Dispatch Service
+Sends multicast batches concurrently with retries
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.config import settings
+from src.integrations.fcm_client import FCM_MULTICAST_LIMIT, empty_result
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_DELAY_SECONDS = 0.5
+
+
+class FCMService:
+    """Concurrent multicast sender on top of an FCM client"""
+    
+    def __init__(self, client=None, concurrency: Optional[int] = None):
+        if client is None:
+            from src.integrations.fcm_client import fcm_client
+            client = fcm_client
+        self.client = client
+        self.concurrency = concurrency or settings.FCM_DISPATCH_CONCURRENCY
+    
+    def send_batch(
+        self,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Send one batch as multicasts of at most FCM_MULTICAST_LIMIT tokens
+        Every token is accounted for in exactly one bucket of the result
+        """
+        result = empty_result()
+        for i in range(0, len(tokens), FCM_MULTICAST_LIMIT):
+            outcome = self._send_multicast(tokens[i:i + FCM_MULTICAST_LIMIT], title, body, data)
+            for bucket, bucket_tokens in outcome.items():
+                result[bucket].extend(bucket_tokens)
+        return result
+    
+    def _send_multicast(
+        self,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Send one multicast (<= 500 tokens), retrying transient failures with backoff
+        Only the tokens that failed transiently are re-sent
+        """
+        result = empty_result()
+        pending = tokens
+        for attempt in range(settings.FCM_RETRY_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+            try:
+                outcome = self.client.send_multicast(pending, title, body, data)
+            except Exception as e:
+                # Whole request failed (network/auth) - retry every token
+                logger.warning(f"⚠️ FCM multicast of {len(pending)} failed (attempt {attempt + 1}): {e}")
+                outcome = {**empty_result(), "retry": pending}
+            result["sent"].extend(outcome["sent"])
+            result["invalid"].extend(outcome["invalid"])
+            result["failed"].extend(outcome["failed"])
+            pending = outcome["retry"]
+            if not pending:
+                break
+        result["retry"] = pending
+        if pending:
+            logger.error(f"❌ FCM gave up on {len(pending)} tokens after {settings.FCM_RETRY_ATTEMPTS} attempts")
+        return result
+    
+    def send_batches(
+        self,
+        batches: Iterable[List[str]],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None,
+        on_invalid=None
+    ) -> Dict[str, int]:
+        """
+        Send token batches over a thread pool
+        
+        Batches are pulled lazily from the iterable and at most
+        2 x concurrency are in flight, so a slot with 100k users never has
+        all tokens in memory. on_invalid(tokens) is called from this thread
+        for every batch that reported dead tokens.
+        
+        Returns:
+            {"batches", "sent", "invalid", "failed"} - failed = retries exhausted + unclassified errors
+        """
+        stats = {"batches": 0, "sent": 0, "invalid": 0, "failed": 0}
+        
+        def collect(future):
+            outcome = future.result()
+            stats["batches"] += 1
+            stats["sent"] += len(outcome["sent"])
+            stats["invalid"] += len(outcome["invalid"])
+            stats["failed"] += len(outcome["retry"]) + len(outcome["failed"])
+            if outcome["invalid"] and on_invalid:
+                on_invalid(outcome["invalid"])
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fcm") as pool:
+            in_flight = set()
+            for tokens in batches:
+                if len(in_flight) >= self.concurrency * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                in_flight.add(pool.submit(self.send_batch, tokens, title, body, data))
+            for future in in_flight:
+                collect(future)
+        
+        return stats
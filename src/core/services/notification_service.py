@@ -0,0 +1,71 @@
+"""
+Notification Service
+Fans out the "new content" push for one HH:MM notification slot
+"""
+from sqlalchemy.orm import Session
+from src.config import settings
+from src.core.repositories.user_repository import UserRepository
+from src.core.repositories.device_token_repository import DeviceTokenRepository
+from src.core.services.fcm_service import FCMService
+import logging
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TITLE = "Your current affairs are ready 📚"
+NOTIFICATION_BODY = "Fresh facts and questions for your exams are waiting."
+
+
+def group_tokens(rows: Iterable[List[Tuple[int, str]]], batch_size: int) -> Iterator[List[str]]:
+    """Regroup streamed (user_id, token) row batches into multicast-sized token lists"""
+    batch: List[str] = []
+    for rows_batch in rows:
+        for _, token in rows_batch:
+            batch.append(token)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+class NotificationService:
+    """Push notification dispatch for notification time slots"""
+    
+    def __init__(self, db: Session, fcm_service: Optional[FCMService] = None):
+        self.db = db
+        self.user_repo = UserRepository(db)
+        self.token_repo = DeviceTokenRepository(db)
+        self.fcm_service = fcm_service or FCMService()
+    
+    def dispatch_slot(self, time_str: str) -> Dict[str, int]:
+        """
+        Notify every active device of users scheduled at time_str ("HH:MM" IST)
+        Tokens are streamed from Postgres, sent in FCM_MAX_BATCH_SIZE batches
+        (multicasts of up to 500 tokens) over a thread pool, and dead tokens
+        are deactivated in bulk
+        """
+        start = time.perf_counter()
+        rows = self.user_repo.iter_notification_tokens(time_str)
+        batches = group_tokens(rows, settings.FCM_MAX_BATCH_SIZE)
+        
+        # Dead tokens are collected and deactivated once the stream is done;
+        # the session is busy with the server-side cursor until then
+        invalid: List[str] = []
+        stats = self.fcm_service.send_batches(
+            batches,
+            NOTIFICATION_TITLE,
+            NOTIFICATION_BODY,
+            data={"type": "daily_content", "slot": time_str},
+            on_invalid=invalid.extend
+        )
+        if invalid:
+            self.token_repo.deactivate_tokens(invalid)
+        
+        stats["seconds"] = round(time.perf_counter() - start, 2)
+        logger.info(
+            f"✅ Slot {time_str}: {stats['sent']} sent, {stats['invalid']} invalid, "
+            f"{stats['failed']} failed in {stats['batches']} batches ({stats['seconds']}s)"
+        )
+        return stats
@@ -7,6 +7,7 @@ from src.core.services.base_service import BaseService
 from src.core.repositories.pdf_job_repository import PDFJobRepository
 from src.integrations.r2_storage import r2_storage
 from src.config import settings
+from src.constants import DEFAULT_JOB_PRIORITY
 import logging
 
 logger = logging.getLogger(__name__)
@@ -68,7 +69,8 @@ class PDFService(BaseService):
         exam_types: List[str],
         date_from: str,
         date_to: str,
-        uploaded_by: Optional[str] = None
+        uploaded_by: Optional[str] = None,
+        priority: int = DEFAULT_JOB_PRIORITY
     ) -> dict:
         """
         Main upload flow:
@@ -99,7 +101,8 @@ class PDFService(BaseService):
                 exam_types=exam_types,
                 date_from=date_from,
                 date_to=date_to,
-                uploaded_by=uploaded_by
+                uploaded_by=uploaded_by,
+                priority=priority
             )
             
             # Step 4: Upload to R2 with job_id (cast to int to satisfy type checker)
@@ -4,15 +4,18 @@ Subscription Management Service
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 from src.core.repositories.user_repository import UserRepository
+from src.core.repositories.promo_code_repository import PromoCodeRepository
+from src.core.repositories.trial_claim_repository import TrialClaimRepository
 from src.models.user import User, SubscriptionStatus
 from src.models.promo_code import PromoCode, PromoType
 from src.models.subscription_plan import SubscriptionPlan
 from src.models.subscription_history import SubscriptionHistory
+from src.integrations.subscription_timers import subscription_timers
+from src.integrations.promo_gate import promo_gate
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 import logging
 from src.config import settings
-from sqlalchemy import or_
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +25,8 @@ class SubscriptionService:
     def __init__(self, db: Session):
         self.db = db
         self.user_repo = UserRepository(db)
+        self.promo_repo = PromoCodeRepository(db)
+        self.trial_repo = TrialClaimRepository(db)
     
     def grant_trial(self, user_email: str, days: int, granted_by: str, notes: Optional[str] = None) -> User:
         """Grant free trial to user"""
@@ -43,8 +48,11 @@ class SubscriptionService:
             notes=notes or f"{days}-day trial"
         )
         self.db.add(history)
+        # Admin grants override eligibility, but still use up the user's trial
+        self.trial_repo.claim(user.id, None, "trial_granted")
         self.db.commit()
         self.db.refresh(user)
+        subscription_timers.schedule(user.id, expires_at)
         
         logger.info(f"Granted {days}-day trial to user {user.email}")
         return user
@@ -78,13 +86,19 @@ class SubscriptionService:
         self.db.add(history)
         self.db.commit()
         self.db.refresh(user)
+        subscription_timers.schedule(user.id, expires_at)
         
         logger.info(f"Granted premium ({plan_name}) to user {user.email}")
         return user
     
     def apply_promo_code(self, user_id: int, code: str, device_id: str | None = None) -> Dict[str, Any]:
-        """User applies promo code"""
-        promo = self.db.query(PromoCode).filter(PromoCode.code == code.upper()).first()
+        """
+        User applies promo code
+        The usage limit is enforced by one conditional UPDATE at the very end
+        (PromoCodeRepository.redeem); checks on the plain read above it only
+        fail fast and pick the right error message
+        """
+        promo = self.promo_repo.get_by_code(code)
         if not promo:
             raise HTTPException(status_code=404, detail="Invalid promo code")
         
@@ -94,33 +108,20 @@ class SubscriptionService:
         
         promo_type_val = getattr(promo, "promo_type", None)
         
-        # ✅ FIX: Check trial usage with correct action names
+        # One probe of trial_claims' unique indexes (user, device)
         if promo_type_val == PromoType.TRIAL.value:
-            # Check if THIS USER has ever used a trial
-            user_trial_history = self.db.query(SubscriptionHistory).filter(
-                SubscriptionHistory.action.in_(['trial_granted', 'trial_applied']),
-                SubscriptionHistory.user_id == user_id
-            ).first()
-            
-            if user_trial_history:
+            claim = self.trial_repo.find_claim(user_id, device_id)
+            if claim is not None and claim.user_id == user_id:
                 raise HTTPException(
                     status_code=400, 
-                    detail=f"You already used a free trial on {user_trial_history.created_at.strftime('%d %b %Y')}"
+                    detail=f"You already used a free trial on {claim.claimed_at.strftime('%d %b %Y')}"
                 )
-            
-            # ✅ Check if THIS DEVICE has ever been used for a trial
-            if device_id:
-                device_trial_history = self.db.query(SubscriptionHistory).filter(
-                    SubscriptionHistory.action.in_(['trial_granted', 'trial_applied']),
-                    SubscriptionHistory.device_id == device_id
-                ).first()
-                
-                if device_trial_history:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail="A free trial has already been claimed on this device"
-                    )
-            else:
+            if claim is not None:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="A free trial has already been claimed on this device"
+                )
+            if not device_id:
                 logger.warning(f"⚠️ User {user.email} applying trial WITHOUT device_id - device check skipped!")
         
         # Validate promo code
@@ -153,8 +154,6 @@ class SubscriptionService:
             message = f"{discount_percent}% discount applied!"
             action_name = "promo_applied"
         
-        promo.used_count += 1
-        
         # ✅ FIX: Save history with correct action name
         history = SubscriptionHistory(
             user_id=user.id,
@@ -164,8 +163,33 @@ class SubscriptionService:
             device_id=device_id if device_id else None
         )
         self.db.add(history)
-        self.db.commit()
+        
+        # Burst absorber: once Redis says the code is used up, don't queue on its row lock
+        gated = bool(max_uses_val) and settings.PROMO_REDIS_GATE
+        if gated and promo_gate.reserve(code, max_uses_val - used_count_val) is False:
+            self.db.rollback()
+            raise HTTPException(status_code=400, detail="Promo code usage limit reached")
+        
+        # Redeem last, right before COMMIT: the promo row stays locked for as short as possible
+        try:
+            self.db.flush()
+            # Loses to a concurrent claim by the same user/device on the unique indexes
+            if promo_type_val == PromoType.TRIAL.value and not self.trial_repo.claim(user_id, device_id, action_name):
+                self.db.rollback()
+                raise HTTPException(status_code=400, detail="A free trial has already been claimed for this account or device")
+            redeemed = self.promo_repo.redeem(code)
+            if redeemed is None:
+                self.db.rollback()
+                raise HTTPException(status_code=400, detail="Promo code usage limit reached")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            if gated:
+                promo_gate.release(code)
+            raise
         self.db.refresh(user)
+        if promo_type_val == PromoType.TRIAL.value:
+            subscription_timers.schedule(user.id, user.subscription_expires_at)
         
         logger.info(f"✅ User {user.email} applied {action_name} ({code}) | Device: {device_id or 'NO_DEVICE_ID'}")
         return {"message": message, "user": user}
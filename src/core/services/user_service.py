@@ -8,6 +8,7 @@ from src.core.repositories.user_repository import UserRepository
 from src.core.repositories.preference_repository import PreferenceRepository
 from src.core.repositories.device_token_repository import DeviceTokenRepository
 from src.integrations.firebase_auth import firebase_auth_client
+from src.integrations.profile_cache import profile_cache
 from src.models.user import User
 from datetime import datetime
 from src.config import settings
@@ -66,8 +67,9 @@ class UserService(BaseService):
             if picture_from_token and picture_from_token != user.photo_url:
                 update_data["photo_url"] = picture_from_token
             
-            user = self.user_repo.update(cast(int, user.id), update_data)
-            logger.info(f"✅ User logged in & profile synced: {getattr(user, 'email', 'unknown')}")
+            # Single UPDATE; the profile below is re-read in one query anyway
+            self.user_repo.record_login(cast(int, user.id), update_data)
+            logger.info(f"✅ User logged in & profile synced: {user.id}")
         else:
             # ✅ FIX: New user - Fetch full profile directly from Firebase to guarantee freshness
             logger.info("First time login, fetching full profile from Firebase...")
@@ -96,6 +98,8 @@ class UserService(BaseService):
     def get_user_profile(self, user_id: int) -> Optional[Dict]:
         """
         Get complete user profile with preferences
+        Served from the profile cache; a miss costs one query (user +
+        preferences + device count) and refills the cache.
         
         Args:
             user_id: User ID
@@ -103,13 +107,21 @@ class UserService(BaseService):
         Returns:
             Profile dict with user info, preferences, device count
         """
-        user = self.user_repo.get_by_id(user_id)
-        if not user:
-            return None
+        profile = profile_cache.get(user_id)
+        if profile is not None:
+            return profile
         
-        preferences = self.preference_repo.get_by_user_id(user_id)
-        device_count = len(self.device_token_repo.get_active_tokens_by_user(user_id))
+        row = self.user_repo.get_profile(user_id)
+        if row is None:
+            return None
         
+        profile = self._build_profile(*row)
+        profile_cache.set(user_id, profile)
+        return profile
+    
+    @staticmethod
+    def _build_profile(user: User, preferences, device_count: int) -> Dict:
+        """Serialisable profile dict (the cached blob)"""
         return {
             "user": {
                 "id": user.id,
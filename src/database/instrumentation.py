@@ -0,0 +1,109 @@
+"""
+Database Instrumentation
+Per-statement timing, per-request query accounting, pool checkout wait and occupancy
+
+The metrics middleware opens a QueryStats for each request in a context
+variable; every statement executed in that context (including sync routes
+run in the threadpool, which inherit a copy of the context) adds to it.
+"""
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from src.utils.metrics import (
+    DB_POOL_CAPACITY, DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECTIONS, DB_QUERY_DURATION
+)
+import time
+from typing import Optional
+
+
+class QueryStats:
+    """Mutable counters shared by everything running in one request's context"""
+    
+    __slots__ = ("count", "seconds")
+    
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Begin counting statements for the current request/task"""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement executed on the engine"""
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_DURATION.observe(elapsed)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+    
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+def instrument_pool(engine: Engine, name: str, pool_size: int, max_overflow: int) -> None:
+    """Track open and checked-out connections against the configured limits"""
+    DB_POOL_CAPACITY.labels(name, "pool_size").set(pool_size)
+    DB_POOL_CAPACITY.labels(name, "max_overflow").set(max_overflow)
+    opened = DB_POOL_CONNECTIONS.labels(name, "open")
+    checked_out = DB_POOL_CONNECTIONS.labels(name, "checked_out")
+    
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, connection_record):
+        opened.inc()
+    
+    @event.listens_for(engine, "close")
+    def _close(dbapi_conn, connection_record):
+        opened.dec()
+    
+    @event.listens_for(engine, "detach")
+    def _detach(dbapi_conn, connection_record):
+        # Detached connections leave the pool's accounting for good
+        opened.dec()
+    
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, connection_record, connection_proxy):
+        checked_out.inc()
+    
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_conn, connection_record):
+        checked_out.dec()
@@ -0,0 +1,25 @@
+"""pdf job priority
+
+Revision ID: 3f1a9c2d7b10
+Revises: 
+Create Date: 2026-10-19 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c2d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: tables may already have been created by metadata.create_all
+    op.execute("ALTER TABLE pdf_jobs ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 1")
+
+
+def downgrade() -> None:
+    op.drop_column('pdf_jobs', 'priority')
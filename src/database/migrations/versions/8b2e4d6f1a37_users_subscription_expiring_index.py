@@ -0,0 +1,31 @@
+"""users subscription expiring partial index
+
+Revision ID: 8b2e4d6f1a37
+Revises: 3f1a9c2d7b10
+Create Date: 2026-10-19 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a37'
+down_revision = '3f1a9c2d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; avoids locking users for writes
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_subscription_expiring "
+            "ON users (subscription_expires_at) "
+            "WHERE subscription_status IN ('trial', 'premium')"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_subscription_expiring")
@@ -0,0 +1,66 @@
+"""trial claims
+
+Revision ID: a9c4e1f7d2b3
+Revises: e7a3c1d9f4b6
+Create Date: 2026-10-19 16:00:00
+
+One row per trial (unique user_id, unique device_id), backfilled from the
+trial_granted / trial_applied rows of subscription_history. Trial
+eligibility stops scanning subscription_history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c4e1f7d2b3'
+down_revision = 'e7a3c1d9f4b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: tables may already have been created by metadata.create_all
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS trial_claims (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users (id) ON DELETE SET NULL,
+            device_id VARCHAR(255),
+            source VARCHAR(50) NOT NULL,
+            claimed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT trial_claims_user_id_key UNIQUE (user_id),
+            CONSTRAINT trial_claims_device_id_key UNIQUE (device_id)
+        )
+    """)
+
+    # Backfill: each user's first trial; a device goes to the first user who
+    # claimed a trial on it (older data predates the device check, so later
+    # users of a shared device keep their claim without the device)
+    op.execute("""
+        WITH trials AS (
+            SELECT DISTINCT ON (user_id) user_id, action, created_at
+            FROM subscription_history
+            WHERE action IN ('trial_granted', 'trial_applied')
+            ORDER BY user_id, created_at
+        ),
+        first_device AS (
+            SELECT DISTINCT ON (device_id) device_id, user_id, created_at
+            FROM subscription_history
+            WHERE action IN ('trial_granted', 'trial_applied') AND device_id IS NOT NULL
+            ORDER BY device_id, created_at
+        )
+        INSERT INTO trial_claims (user_id, device_id, source, claimed_at)
+        SELECT t.user_id, d.device_id, t.action, t.created_at
+        FROM trials t
+        LEFT JOIN LATERAL (
+            SELECT fd.device_id FROM first_device fd
+            WHERE fd.user_id = t.user_id
+            ORDER BY fd.created_at
+            LIMIT 1
+        ) d ON true
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS trial_claims")
@@ -0,0 +1,47 @@
+"""user notification slots
+
+Revision ID: c4d7a9e2b5f1
+Revises: 8b2e4d6f1a37
+Create Date: 2026-10-19 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7a9e2b5f1'
+down_revision = '8b2e4d6f1a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: tables may already have been created by metadata.create_all
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_notification_slots (
+            slot_minute SMALLINT NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            PRIMARY KEY (slot_minute, user_id)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_user_notification_slots_user_id "
+        "ON user_notification_slots (user_id)"
+    )
+
+    # Backfill from the notification_times arrays ("HH:MM" -> minute of day)
+    op.execute(r"""
+        INSERT INTO user_notification_slots (slot_minute, user_id)
+        SELECT DISTINCT
+            (split_part(t, ':', 1)::int * 60 + split_part(t, ':', 2)::int)::smallint,
+            p.user_id
+        FROM user_preferences p
+        CROSS JOIN LATERAL unnest(p.notification_times) AS t
+        WHERE t ~ '^\d{1,2}:\d{2}$'
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS user_notification_slots")
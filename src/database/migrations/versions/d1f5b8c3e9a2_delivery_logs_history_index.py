@@ -0,0 +1,30 @@
+"""delivery logs history keyset index
+
+Revision ID: d1f5b8c3e9a2
+Revises: c4d7a9e2b5f1
+Create Date: 2026-10-19 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1f5b8c3e9a2'
+down_revision = 'c4d7a9e2b5f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; delivery_logs takes writes all day
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_delivery_logs_user_history "
+            "ON delivery_logs (user_id, delivered_at DESC, id DESC) INCLUDE (question_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_delivery_logs_user_history")
@@ -0,0 +1,128 @@
+"""partition delivery_logs by month
+
+Revision ID: e7a3c1d9f4b6
+Revises: d1f5b8c3e9a2
+Create Date: 2026-10-19 14:00:00
+
+Rebuilds delivery_logs as a RANGE (delivered_at) partitioned table with one
+partition per month holding data (+ 2 months ahead) and a DEFAULT partition,
+copies the rows over and adds delivered_question_summaries. Takes an
+exclusive lock on delivery_logs for the copy - run in a maintenance window.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3c1d9f4b6'
+down_revision = 'd1f5b8c3e9a2'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('delivery_logs_id_seq'),
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    delivered_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    platform VARCHAR(20) NOT NULL,
+    delivery_status notification_status NOT NULL,
+    fcm_message_id VARCHAR(255),
+    error_message TEXT,
+    retry_count INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL
+"""
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_delivery_logs_id ON delivery_logs (id)",
+    "CREATE INDEX IF NOT EXISTS ix_delivery_logs_user_id ON delivery_logs (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_delivery_logs_question_id ON delivery_logs (question_id)",
+    "CREATE INDEX IF NOT EXISTS ix_delivery_logs_delivered_at ON delivery_logs (delivered_at)",
+    "CREATE INDEX IF NOT EXISTS ix_delivery_logs_user_history "
+    "ON delivery_logs (user_id, delivered_at DESC, id DESC) INCLUDE (question_id)",
+]
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS delivered_question_summaries (
+            user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+            question_ids INTEGER[] NOT NULL DEFAULT '{}',
+            archived_through TIMESTAMP WITH TIME ZONE,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+
+    conn = op.get_bind()
+    relkind = conn.execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE relname = 'delivery_logs' AND relkind IN ('r', 'p')"
+    )).scalar()
+    if relkind == 'p':
+        # Already partitioned (fresh database built by create_all)
+        return
+
+    op.execute("LOCK TABLE delivery_logs IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE delivery_logs RENAME TO delivery_logs_legacy")
+    # Free the index/constraint names for the new table
+    op.execute("ALTER TABLE delivery_logs_legacy RENAME CONSTRAINT delivery_logs_pkey TO delivery_logs_legacy_pkey")
+    op.execute(f"CREATE TABLE delivery_logs ({COLUMNS}, PRIMARY KEY (id, delivered_at)) PARTITION BY RANGE (delivered_at)")
+    op.execute("ALTER SEQUENCE delivery_logs_id_seq OWNED BY delivery_logs.id")
+    op.execute("CREATE TABLE delivery_logs_default PARTITION OF delivery_logs DEFAULT")
+
+    # One partition per month from the oldest row up to 2 months ahead (IST month boundaries)
+    op.execute("""
+        DO $$
+        DECLARE
+            -- IST wall-clock month starts
+            month_start timestamp;
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'Asia/Kolkata') + interval '2 months';
+        BEGIN
+            SELECT date_trunc('month', min(delivered_at) AT TIME ZONE 'Asia/Kolkata')
+            INTO month_start FROM delivery_logs_legacy;
+            month_start := COALESCE(month_start, date_trunc('month', now() AT TIME ZONE 'Asia/Kolkata'));
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF delivery_logs FOR VALUES FROM (%L) TO (%L)',
+                    'delivery_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+                    month_start AT TIME ZONE 'Asia/Kolkata',
+                    (month_start + interval '1 month') AT TIME ZONE 'Asia/Kolkata'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END $$
+    """)
+
+    op.execute("""
+        INSERT INTO delivery_logs (
+            id, user_id, question_id, delivered_at, platform, delivery_status,
+            fcm_message_id, error_message, retry_count, created_at, updated_at
+        )
+        SELECT
+            id, user_id, question_id, delivered_at, platform, delivery_status,
+            fcm_message_id, error_message, retry_count, created_at, updated_at
+        FROM delivery_logs_legacy
+    """)
+    op.execute("DROP TABLE delivery_logs_legacy")
+
+    # Indexes after the copy (faster); created on the parent they cascade to every partition
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    # Partitions already archived to R2 are not restored
+    op.execute("ALTER TABLE delivery_logs RENAME TO delivery_logs_partitioned")
+    op.execute("ALTER TABLE delivery_logs_partitioned RENAME CONSTRAINT delivery_logs_pkey TO delivery_logs_partitioned_pkey")
+    op.execute(f"CREATE TABLE delivery_logs ({COLUMNS}, PRIMARY KEY (id))")
+    op.execute("""
+        INSERT INTO delivery_logs
+        SELECT id, user_id, question_id, delivered_at, platform, delivery_status,
+               fcm_message_id, error_message, retry_count, created_at, updated_at
+        FROM delivery_logs_partitioned
+    """)
+    op.execute("ALTER SEQUENCE delivery_logs_id_seq OWNED BY delivery_logs.id")
+    op.execute("DROP TABLE delivery_logs_partitioned")
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute("DROP TABLE IF EXISTS delivered_question_summaries")
@@ -0,0 +1,102 @@
+"""
+delivery_logs Monthly Partitions
+Naming: delivery_logs_yYYYYmMM covers [1st of month, 1st of next month) IST;
+delivery_logs_default catches anything outside the created ranges
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from datetime import date, datetime
+from src.config import settings
+import logging
+import re
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "delivery_logs"
+DEFAULT_PARTITION = "delivery_logs_default"
+PARTITION_PATTERN = re.compile(r"^delivery_logs_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    """First day of the month `count` months after month (count may be negative)"""
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def month_bound(month: date) -> datetime:
+    """Partition boundary: midnight IST on the 1st"""
+    return settings.IST.localize(datetime(month.year, month.month, 1))
+
+
+def list_partitions(conn: Connection) -> List[Tuple[str, date]]:
+    """Existing monthly partitions as (name, month), oldest first (default excluded)"""
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+    """), {"parent": PARENT_TABLE}).scalars().all()
+    partitions = []
+    for name in rows:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def create_month_partition(conn: Connection, month: date) -> bool:
+    """
+    Create the partition for one month (no-op if it exists)
+    Rows for that month already sitting in the default partition are moved
+    into it before ATTACH, otherwise Postgres refuses the new range.
+    Caller commits.
+    """
+    name = partition_name(month)
+    if name in {existing for existing, _ in list_partitions(conn)}:
+        return False
+    start, end = month_bound(month), month_bound(add_months(month, 1))
+    conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE delivered_at >= :start AND delivered_at < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), {"start": start, "end": end})
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info(f"✅ Created partition {name}")
+    return True
+
+
+def ensure_partitions(conn: Connection, today: date, months_ahead: int) -> List[str]:
+    """Make sure this month and the next `months_ahead` months have partitions"""
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_month_partition(conn, month):
+            created.append(partition_name(month))
+    return created
+
+
+def partitions_to_archive(conn: Connection, today: date, retention_months: int) -> List[Tuple[str, date]]:
+    """Monthly partitions that end before the retention horizon"""
+    horizon = add_months(month_start(today), -retention_months)
+    return [(name, month) for name, month in list_partitions(conn) if month < horizon]
@@ -0,0 +1,160 @@
+"""
+SQL Query Inspector
+Opt-in N+1 and slow-query detection on the SQLAlchemy engine
+
+Statements are grouped by shape (the SQL text with expanded IN lists
+collapsed), so the same SELECT issued once per id shows up as one shape
+repeated N times. Parameter values are never logged, only their types.
+
+Usage:
+    with inspect_queries("fetch-daily") as summary:
+        ...
+    summary.assert_max_queries(5)
+    summary.assert_no_repeats()
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.config import settings
+import logging
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# "IN (%(id_1_1)s, %(id_1_2)s, ...)" / "IN (?, ?, ...)" -> "IN (...)"
+_IN_LIST = re.compile(r"\(\s*(?:%\([^)]+\)s|\?|\$\d+)(?:\s*,\s*(?:%\([^)]+\)s|\?|\$\d+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so repeats with different values/list sizes match"""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(...)", statement)).strip()
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of the bound parameters (never their values)"""
+    if executemany:
+        rows = len(parameters) if parameters is not None else 0
+        first = parameters[0] if rows else None
+        return f"executemany[{rows}] {parameter_shape(first)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+@dataclass
+class QueryRecord:
+    shape: str
+    params: str
+    ms: float
+
+
+@dataclass
+class QuerySummary:
+    """Statements seen inside one inspect_queries() block"""
+    label: str
+    repeat_threshold: int
+    slow_ms: float
+    queries: List[QueryRecord] = field(default_factory=list)
+    
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+    
+    @property
+    def total_ms(self) -> float:
+        return sum(q.ms for q in self.queries)
+    
+    @property
+    def slow(self) -> List[QueryRecord]:
+        return [q for q in self.queries if q.ms >= self.slow_ms]
+    
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Shapes executed at least `threshold` times (likely N+1)"""
+        threshold = threshold or self.repeat_threshold
+        counts = Counter(q.shape for q in self.queries)
+        return {shape: n for shape, n in counts.most_common() if n >= threshold}
+    
+    def assert_max_queries(self, limit: int) -> None:
+        if self.count > limit:
+            shapes = "\n".join(f"  {q.ms:7.1f} ms  {q.shape[:200]}" for q in self.queries)
+            raise AssertionError(f"{self.label}: {self.count} queries, expected <= {limit}\n{shapes}")
+    
+    def assert_no_repeats(self, threshold: Optional[int] = None) -> None:
+        repeats = self.repeated(threshold)
+        if repeats:
+            shapes = "\n".join(f"  x{n}  {shape[:200]}" for shape, n in repeats.items())
+            raise AssertionError(f"{self.label}: repeated statement shapes (N+1?)\n{shapes}")
+    
+    def report(self) -> None:
+        """Log repeated shapes; quiet when the block looks healthy"""
+        for shape, n in self.repeated().items():
+            logger.warning(f"🔁 {self.label}: {n}x same statement (N+1?): {shape[:300]}")
+        logger.debug(f"🔎 {self.label}: {self.count} queries in {self.total_ms:.1f} ms")
+
+
+_current_summary: ContextVar[Optional[QuerySummary]] = ContextVar("query_summary", default=None)
+
+
+@contextmanager
+def inspect_queries(
+    label: str = "block",
+    repeat_threshold: Optional[int] = None,
+    slow_ms: Optional[float] = None,
+    report: bool = True
+) -> Iterator[QuerySummary]:
+    """Collect every statement executed in this context into a QuerySummary"""
+    summary = QuerySummary(
+        label=label,
+        repeat_threshold=repeat_threshold or settings.SQL_REPEAT_THRESHOLD,
+        slow_ms=settings.SQL_SLOW_QUERY_MS if slow_ms is None else slow_ms
+    )
+    token = _current_summary.set(summary)
+    try:
+        yield summary
+    finally:
+        _current_summary.reset(token)
+        if report:
+            summary.report()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inspector_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    ms = (time.perf_counter() - conn.info["inspector_start"].pop()) * 1000
+    summary = _current_summary.get()
+    slow_ms = summary.slow_ms if summary else settings.SQL_SLOW_QUERY_MS
+    if summary is None and ms < slow_ms:
+        return
+    shape = statement_shape(statement)
+    params = parameter_shape(parameters, executemany)
+    if ms >= slow_ms:
+        logger.warning(f"🐢 Slow query {ms:.1f} ms: {shape[:500]} | params {params}")
+    if summary is not None:
+        summary.queries.append(QueryRecord(shape, params, ms))
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("inspector_start"):
+        conn.info["inspector_start"].pop()
+
+
+def install_query_inspector(engine: Engine) -> None:
+    """Attach the inspector listeners to an engine (idempotent)"""
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    logger.info(f"🔎 SQL inspector on (slow >= {settings.SQL_SLOW_QUERY_MS} ms, repeats >= {settings.SQL_REPEAT_THRESHOLD})")
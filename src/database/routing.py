@@ -0,0 +1,167 @@
+"""
+Read-Replica Routing
+Sends reads from repository methods marked @read_only to the replica pool
+
+Everything else goes to the primary: writes, flushes, and any read outside
+a read-only scope. Reads also stay on the primary:
+- for the rest of a transaction that has written (the replica can't see it yet)
+- for REPLICA_STICKY_SECONDS after a session commits a write
+- for REPLICA_STICKY_SECONDS after a user's own write, in any process
+  (read-your-writes: the pin lives in Redis, keyed by the user id that
+  get_current_user stores in session.info)
+- inside @primary_only methods, even when called from a read-only scope:
+  reads that refill a cache must not store replica lag for the cache's TTL
+  (writes made without a bound user, e.g. Celery or admin grants, pin no one)
+"""
+from contextlib import contextmanager
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from src.config import settings
+from src.integrations.redis_queue import redis_queue
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_KEY = "db_primary_pin:{user_id}"
+
+# session.info keys
+READ_ONLY_DEPTH = "replica_read_depth"
+PRIMARY_DEPTH = "primary_read_depth"
+USER_ID = "user_id"
+WROTE = "replica_wrote"
+PRIMARY_UNTIL = "replica_primary_until"
+USER_PINNED = "replica_user_pinned"
+
+
+def bind_user(session: Session, user_id: int) -> None:
+    """Tell the session whose request it serves (enables the read-your-writes pin)"""
+    session.info[USER_ID] = user_id
+
+
+def _user_pinned(session: Session) -> bool:
+    """Whether the session's user wrote recently (checked once per session)"""
+    pinned = session.info.get(USER_PINNED)
+    if pinned is None:
+        user_id = session.info.get(USER_ID)
+        if user_id is None:
+            pinned = False
+        else:
+            try:
+                pinned = bool(redis_queue.client.exists(PRIMARY_PIN_KEY.format(user_id=user_id)))
+            except Exception as e:
+                # Can't tell - the primary is always correct
+                logger.warning(f"⚠️ Primary pin lookup failed for user {user_id}: {e}")
+                pinned = True
+        session.info[USER_PINNED] = pinned
+    return pinned
+
+
+def _is_plain_select(clause) -> bool:
+    """SELECT without FOR UPDATE (anything else may write or lock)"""
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+class RoutingSession(Session):
+    """Session that picks the primary or the replica engine per statement"""
+
+    def __init__(self, *args, replica_bind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._flushing or (clause is not None and not _is_plain_select(clause)):
+            self.info[WROTE] = True
+            return primary
+        if clause is None or self.replica_bind is None or not self.info.get(READ_ONLY_DEPTH):
+            return primary
+        if self.info.get(PRIMARY_DEPTH):
+            return primary
+        if self.info.get(WROTE) or time.monotonic() < self.info.get(PRIMARY_UNTIL, 0.0):
+            return primary
+        if _user_pinned(self):
+            return primary
+        return self.replica_bind
+
+
+@contextmanager
+def replica_reads(session: Session):
+    """Route this block's SELECTs to the replica (if the session allows it)"""
+    session.info[READ_ONLY_DEPTH] = session.info.get(READ_ONLY_DEPTH, 0) + 1
+    try:
+        yield session
+    finally:
+        session.info[READ_ONLY_DEPTH] -= 1
+
+
+@contextmanager
+def primary_reads(session: Session):
+    """Keep this block's SELECTs on the primary, even inside replica_reads"""
+    session.info[PRIMARY_DEPTH] = session.info.get(PRIMARY_DEPTH, 0) + 1
+    try:
+        yield session
+    finally:
+        session.info[PRIMARY_DEPTH] -= 1
+
+
+def _find_session(args, kwargs) -> Optional[Session]:
+    """The session a repository method works with: self.db or a db argument"""
+    session = kwargs.get("db")
+    if isinstance(session, Session):
+        return session
+    if args and isinstance(getattr(args[0], "db", None), Session):
+        return args[0].db
+    for arg in args:
+        if isinstance(arg, Session):
+            return arg
+    return None
+
+
+def _scoped(method, scope):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        session = _find_session(args, kwargs)
+        if session is None:
+            return method(*args, **kwargs)
+        with scope(session):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def read_only(method):
+    """Mark a repository (or service) method as safe to serve from the replica"""
+    return _scoped(method, replica_reads)
+
+
+def primary_only(method):
+    """Mark a method whose reads must hit the primary (results refill a cache)"""
+    return _scoped(method, primary_reads)
+
+
+def _after_commit(session: Session) -> None:
+    if not session.info.pop(WROTE, False):
+        return
+    window = settings.REPLICA_STICKY_SECONDS
+    session.info[PRIMARY_UNTIL] = time.monotonic() + window
+    user_id = session.info.get(USER_ID)
+    if user_id is None:
+        return
+    session.info[USER_PINNED] = True
+    try:
+        redis_queue.client.set(PRIMARY_PIN_KEY.format(user_id=user_id), 1, ex=window)
+    except Exception as e:
+        logger.warning(f"⚠️ Primary pin failed for user {user_id}: {e}")
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(WROTE, None)
+
+
+def install_replica_routing(session_factory) -> None:
+    """Attach the read-your-writes hooks to a sessionmaker"""
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
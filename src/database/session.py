@@ -1,11 +1,14 @@
 """
 Database Session with IST Timezone
 """
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from src.config import settings
-from typing import Generator
+from src.database.instrumentation import TimedQueuePool, instrument_engine, instrument_pool
+from src.database.query_inspector import install_query_inspector
+from src.database.routing import RoutingSession, install_replica_routing
+from src.integrations.profile_cache import install_profile_cache_invalidation
+from typing import Generator, Tuple
 import logging
 
 # ✅ IMPORT ALL MODELS
@@ -16,35 +19,91 @@ logger = logging.getLogger(__name__)
 if settings.DATABASE_URL is None:
     raise RuntimeError("DATABASE_URL is not set in settings")
 
-# Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    echo=settings.DEBUG,
-)  # ✅ ADDED CLOSING PARENTHESIS
+# Pool per process role: (pool_size, max_overflow). Every process has its own
+# pool, so the Postgres connection budget is the sum over all processes, e.g.
+# API_WORKERS * 20 + CELERY_CONCURRENCY * 4 + PDF_WORKERS * 2 + AI_WORKERS * 3
+POOL_PROFILES = {
+    "api": (10, 10),         # Per gunicorn worker
+    "celery": (2, 2),        # Per prefork child; tasks run one at a time
+    "pdf_worker": (2, 0),    # One job at a time
+    "ai_worker": (2, 1),     # One chunk at a time, plus progress/completion writes
+    "script": (1, 2),
+}
 
 
-# Force IST timezone on every connection
-@event.listens_for(engine, "connect")
-def set_timezone(dbapi_conn, connection_record):
-    """Set timezone to Asia/Kolkata for all connections"""
-    cursor = dbapi_conn.cursor()
-    cursor.execute("SET timezone='Asia/Kolkata'")
-    cursor.close()
-    logger.info("✅ Database connection with IST timezone")
+def pool_settings() -> Tuple[int, int]:
+    """(pool_size, max_overflow) for this process (DB_POOL_SIZE / DB_MAX_OVERFLOW override)"""
+    pool_size, max_overflow = POOL_PROFILES.get(settings.PROCESS_ROLE, POOL_PROFILES["api"])
+    if settings.DB_POOL_SIZE is not None:
+        pool_size = settings.DB_POOL_SIZE
+    if settings.DB_MAX_OVERFLOW is not None:
+        max_overflow = settings.DB_MAX_OVERFLOW
+    return pool_size, max_overflow
 
 
-# Session factory
+def connect_args() -> dict:
+    """
+    libpq startup parameters - no per-connection SET round-trip
+    Behind PgBouncer (transaction pooling) startup `options` are rejected or
+    dropped, so the timezone must come from ALTER ROLE/DATABASE ... SET timezone
+    """
+    args = {"application_name": f"current-affairs-{settings.PROCESS_ROLE}"}
+    if not settings.DB_PGBOUNCER:
+        args["options"] = f"-c timezone={settings.TIMEZONE}"
+    return args
+
+
+def _create_engine(url: str, name: str):
+    """Engine with this role's pool, instrumentation and IST session timezone"""
+    pool_size, max_overflow = pool_settings()
+    db_engine = create_engine(
+        url,
+        poolclass=TimedQueuePool,  # QueuePool + checkout wait histogram
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args=connect_args(),
+        echo=settings.SQL_ECHO,
+    )
+
+    # Statement timing + per-request query counts, pool occupancy (Prometheus)
+    instrument_engine(db_engine)
+    instrument_pool(db_engine, name, pool_size, max_overflow)
+    if settings.SQL_INSPECTOR_ENABLED:
+        install_query_inspector(db_engine)
+    return db_engine
+
+
+# Create engines (the replica is optional; without it every read hits the primary)
+engine = _create_engine(settings.DATABASE_URL, "primary")
+replica_engine = _create_engine(settings.DATABASE_REPLICA_URL, "replica") if settings.DATABASE_REPLICA_URL else None
+
+
+def pool_utilization() -> float:
+    """Busiest engine's share of its connections (pool_size + max_overflow) checked out"""
+    pool_size, max_overflow = pool_settings()
+    capacity = max(pool_size + max(max_overflow, 0), 1)
+    engines = (engine, replica_engine) if replica_engine is not None else (engine,)
+    return max(db_engine.pool.checkedout() for db_engine in engines) / capacity
+
+
+# Session factory (@read_only repository methods read from the replica)
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    replica_bind=replica_engine
 )
 
 
+# Drop cached profiles when their rows change; keep read-your-writes on the primary
+install_profile_cache_invalidation(SessionLocal)
+install_replica_routing(SessionLocal)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency for FastAPI routes
@@ -0,0 +1,72 @@
+"""
+Content Pack Store
+The last successful /content/fetch-daily response per user and request, kept in
+Redis so it can be served again while the database is saturated (load shedding)
+
+A pack is keyed by user and a fingerprint of the request body (period, times,
+counts, exams), so only an identical request - typically a client retrying
+after a timeout during the nightly spike - gets it back. Packs are therefore
+only saved while the pool is already busy (FETCH_PACK_SAVE_UTILIZATION) and
+live for about a retry window (FETCH_DAILY_PACK_TTL_SECONDS).
+
+Memory budget: a pack is zlib-compressed orjson, roughly 3-6 KB for a 12-item
+day and up to ~20 KB for a 40-item premium day. Redis holds at most
+(fetches completed while busy, per TTL) x pack size - e.g. 5,000 fetches per
+15 minutes x 5 KB = 25 MB - in the same instance as the job queues.
+"""
+from src.config import settings
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+from datetime import datetime, timezone
+import hashlib
+import logging
+import orjson
+import zlib
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PACK_KEY = "fetch_daily_pack:{user_id}:{fingerprint}"
+
+
+def request_fingerprint(body: Dict[str, Any]) -> str:
+    """Stable id for a request body (same fields and values -> same id)"""
+    raw = orjson.dumps(body, option=orjson.OPT_SORT_KEYS | orjson.OPT_UTC_Z)
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+class ContentPackStore:
+    """Redis-backed fetch-daily packs (all operations fail open)"""
+
+    def __init__(self, queue: RedisQueue):
+        self.client = queue.raw_client
+
+    @staticmethod
+    def _key(user_id: int, fingerprint: str) -> str:
+        return PACK_KEY.format(user_id=user_id, fingerprint=fingerprint)
+
+    def save(self, user_id: int, fingerprint: str, result: Dict[str, Any]) -> None:
+        """Store a fetch_daily_content result (datetimes become ISO strings)"""
+        try:
+            pack = {"built_at": datetime.now(timezone.utc), "result": result}
+            raw = orjson.dumps(pack, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+            self.client.set(
+                self._key(user_id, fingerprint),
+                zlib.compress(raw, settings.QUEUE_COMPRESS_LEVEL),
+                ex=settings.FETCH_DAILY_PACK_TTL_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Content pack write failed for user {user_id}: {e}")
+
+    def load(self, user_id: int, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """{"built_at": ISO string, "result": {...}} or None"""
+        try:
+            raw = self.client.get(self._key(user_id, fingerprint))
+            return orjson.loads(zlib.decompress(raw)) if raw else None
+        except Exception as e:
+            logger.warning(f"⚠️ Content pack read failed for user {user_id}: {e}")
+            return None
+
+
+# Global instance (built on first use)
+content_packs = LazyClient(lambda: ContentPackStore(redis_queue), "Content pack store")
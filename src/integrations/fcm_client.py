@@ -0,0 +1,129 @@
+"""
+Firebase Cloud Messaging Client
+Multicast sends of up to 500 tokens per call
+
+FCM_BACKEND=firebase sends through the Firebase Admin SDK.
+FCM_BACKEND=local uses an in-process stand-in (no network) for
+development, load tests and benchmarks.
+"""
+from src.config import settings
+from src.integrations.lazy import LazyClient
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# FCM hard limit for one multicast request
+FCM_MULTICAST_LIMIT = 500
+
+
+def empty_result() -> Dict[str, List[str]]:
+    """Per-batch outcome: delivered, dead (deactivate), retryable and otherwise failed tokens"""
+    return {"sent": [], "invalid": [], "retry": [], "failed": []}
+
+
+class FirebaseFCMClient:
+    """FCM client backed by firebase_admin.messaging"""
+    
+    def __init__(self):
+        # The auth client owns the default Firebase app
+        from src.integrations.firebase_auth import firebase_auth_client
+        firebase_auth_client.instance()
+        from firebase_admin import messaging, exceptions
+        self.messaging = messaging
+        # Token is gone for good - deactivate it. InvalidArgumentError is not
+        # here: FCM also raises it for a bad message (e.g. oversized data),
+        # which would deactivate every token in the batch
+        self.invalid_errors = (
+            messaging.UnregisteredError,
+            messaging.SenderIdMismatchError,
+        )
+        # Transient - worth another attempt
+        self.retry_errors = (
+            messaging.QuotaExceededError,
+            exceptions.UnavailableError,
+            exceptions.InternalError,
+            exceptions.DeadlineExceededError,
+        )
+        logger.info("✅ FCM client initialized (firebase)")
+    
+    def send_multicast(
+        self,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[str]]:
+        """Send one notification to up to 500 tokens (one HTTP batch)"""
+        message = self.messaging.MulticastMessage(
+            tokens=tokens,
+            notification=self.messaging.Notification(title=title, body=body),
+            data=data or {},
+            android=self.messaging.AndroidConfig(priority="high"),
+        )
+        result = empty_result()
+        response = self.messaging.send_each_for_multicast(message)
+        for token, send_response in zip(tokens, response.responses):
+            if send_response.success:
+                result["sent"].append(token)
+            elif isinstance(send_response.exception, self.invalid_errors):
+                result["invalid"].append(token)
+            elif isinstance(send_response.exception, self.retry_errors):
+                result["retry"].append(token)
+            else:
+                # Unclassified error - not worth retrying, but counted
+                result["failed"].append(token)
+                logger.warning(f"⚠️ FCM send failed for token {token[:20]}...: {send_response.exception}")
+        return result
+
+
+class LocalFCMClient:
+    """
+    In-process FCM stand-in
+    Sleeps FCM_LOCAL_LATENCY_MS per batch, treats tokens starting with
+    "invalid" as unregistered and fails FCM_LOCAL_FAILURE_RATE of tokens transiently
+    """
+    
+    def __init__(self, latency_ms: Optional[int] = None, failure_rate: Optional[float] = None):
+        self.latency = (settings.FCM_LOCAL_LATENCY_MS if latency_ms is None else latency_ms) / 1000
+        self.failure_rate = settings.FCM_LOCAL_FAILURE_RATE if failure_rate is None else failure_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+        logger.info("✅ FCM client initialized (local stand-in)")
+    
+    def send_multicast(
+        self,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[str]]:
+        """Simulate one multicast request"""
+        if len(tokens) > FCM_MULTICAST_LIMIT:
+            raise ValueError(f"Multicast limited to {FCM_MULTICAST_LIMIT} tokens")
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        result = empty_result()
+        for token in tokens:
+            if token.startswith("invalid"):
+                result["invalid"].append(token)
+            elif self.failure_rate and random.random() < self.failure_rate:
+                result["retry"].append(token)
+            else:
+                result["sent"].append(token)
+        return result
+
+
+def create_fcm_client():
+    """Build the client selected by FCM_BACKEND"""
+    if settings.FCM_BACKEND == "local":
+        return LocalFCMClient()
+    return FirebaseFCMClient()
+
+
+# Global instance (built on first use)
+fcm_client = LazyClient(create_fcm_client, "FCM")
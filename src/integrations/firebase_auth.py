@@ -2,8 +2,8 @@
 Firebase Authentication Integration
 Verify ID tokens from mobile app
 """
-from firebase_admin import credentials, auth, initialize_app
 from src.config import settings
+from src.integrations.lazy import LazyClient
 import logging
 from typing import Optional, Dict
 
@@ -14,6 +14,9 @@ class FirebaseAuthClient:
     
     def __init__(self):
         """Initialize Firebase Admin SDK using config.py settings"""
+        # firebase_admin pulls in google-auth/grpc; import it only when the client is built
+        from firebase_admin import credentials, auth, initialize_app
+        self.auth = auth
         try:
             # Build service account dict from .env variables
             service_account_info = {
@@ -59,7 +62,7 @@ class FirebaseAuthClient:
         """
         try:
             # Verify token with Firebase Admin SDK
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = self.auth.verify_id_token(id_token)
             
             user_info = {
                 "uid": decoded_token.get("uid"),
@@ -73,13 +76,13 @@ class FirebaseAuthClient:
             logger.info(f"✅ Token verified for user: {user_info['email'] or user_info['uid']}")
             return user_info
             
-        except auth.ExpiredIdTokenError:
+        except self.auth.ExpiredIdTokenError:
             logger.error("❌ Expired Firebase ID token")
             return None
-        except auth.RevokedIdTokenError:
+        except self.auth.RevokedIdTokenError:
             logger.error("❌ Revoked Firebase ID token")
             return None
-        except auth.InvalidIdTokenError:
+        except self.auth.InvalidIdTokenError:
             logger.error("❌ Invalid Firebase ID token")
             return None
         except Exception as e:
@@ -97,7 +100,7 @@ class FirebaseAuthClient:
             User info dict or None
         """
         try:
-            user = auth.get_user(uid)
+            user = self.auth.get_user(uid)
             return {
                 "uid": user.uid,
                 "email": user.email,
@@ -107,7 +110,7 @@ class FirebaseAuthClient:
                 "disabled": user.disabled,
                 "email_verified": user.email_verified
             }
-        except auth.UserNotFoundError:
+        except self.auth.UserNotFoundError:
             logger.error(f"❌ Firebase user not found: {uid}")
             return None
         except Exception as e:
@@ -131,5 +134,5 @@ class FirebaseAuthClient:
         # Fetch full user details from Firebase
         return self.get_user_by_uid(token_data["uid"])
 
-# Global instance (initialized on import)
-firebase_auth_client = FirebaseAuthClient()
+# Global instance (Firebase app initialized on first use)
+firebase_auth_client = LazyClient(FirebaseAuthClient, "Firebase Auth")
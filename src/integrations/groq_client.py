@@ -2,11 +2,13 @@
 Groq AI Client - JSON Object Mode with Rich Content
 Generates detailed Hinglish content with title, description, explanation
 """
-from groq import Groq
 from src.config import settings
+from src.integrations.lazy import LazyClient
 from src.constants import HINGLISH_SYSTEM_PROMPT, EXAM_FOCUS
+from src.utils.metrics import GROQ_REQUEST_DURATION, GROQ_TOKENS
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,7 @@ class GroqClient:
     """Groq API client for rich Hinglish content generation"""
     
     def __init__(self):
+        from groq import Groq  # ~0.5 s import, only needed by the AI worker
         self.client = Groq(api_key=settings.GROQ_API_KEY)
         self.model = settings.GROQ_MODEL
         logger.info(f"✅ Groq initialized: {self.model}")
@@ -27,6 +30,17 @@ class GroqClient:
         date_to: str
     ) -> list[dict]:
         """Generate rich Hinglish facts + questions using JSON Object Mode"""
+        items, _ = self.generate_content_with_usage(text_chunk, exam_types, date_from, date_to)
+        return items
+    
+    def generate_content_with_usage(
+        self,
+        text_chunk: str,
+        exam_types: list[str],
+        date_from: str,
+        date_to: str
+    ) -> tuple[list[dict], int]:
+        """Same as generate_content, also returns total tokens used by the call"""
         
         exam_instructions = "\n".join([
             f"- {exam}: {EXAM_FOCUS.get(exam, 'General')}"
@@ -93,27 +107,37 @@ FOR QUESTIONS (MCQ):
 """
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Hinglish current affairs content creator for Indian competitive exams. You ONLY respond with valid JSON objects containing rich, detailed Hinglish content. Never use plain text responses."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                temperature=0.6,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
+            started = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert Hinglish current affairs content creator for Indian competitive exams. You ONLY respond with valid JSON objects containing rich, detailed Hinglish content. Never use plain text responses."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    model=self.model,
+                    temperature=0.6,
+                    max_tokens=2000,
+                    response_format={"type": "json_object"}
+                )
+            except Exception:
+                GROQ_REQUEST_DURATION.labels("error").observe(time.perf_counter() - started)
+                raise
+            GROQ_REQUEST_DURATION.labels("ok").observe(time.perf_counter() - started)
             
             content = response.choices[0].message.content
             finish_reason = response.choices[0].finish_reason
+            tokens_used = response.usage.total_tokens if response.usage else 0
+            if response.usage:
+                GROQ_TOKENS.labels("prompt").inc(response.usage.prompt_tokens or 0)
+                GROQ_TOKENS.labels("completion").inc(response.usage.completion_tokens or 0)
             
-            logger.info(f"📥 Response: {len(content)} chars, finish: {finish_reason}")
+            logger.info(f"📥 Response: {len(content)} chars, {tokens_used} tokens, finish: {finish_reason}")
             
             # Parse JSON
             result = json.loads(content)
@@ -129,14 +153,14 @@ FOR QUESTIONS (MCQ):
                         logger.warning(f"⚠️ Invalid item skipped: {item.get('text', 'NO TEXT')[:50]}")
                 
                 logger.info(f"✅ Generated {len(valid_items)} valid items")
-                return valid_items
+                return valid_items, tokens_used
             else:
                 logger.warning("⚠️ No items in response")
-                return []
+                return [], tokens_used
                     
         except Exception as e:
             logger.error(f"❌ Groq API error: {e}")
-            return []
+            return [], 0
     
     def _validate_item(self, item: dict) -> bool:
         """Validate item structure"""
@@ -163,5 +187,5 @@ FOR QUESTIONS (MCQ):
         return True
 
 
-# Global instance
-groq_client = GroqClient()
+# Global instance (built on first use)
+groq_client = LazyClient(GroqClient, "Groq")
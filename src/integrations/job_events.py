@@ -0,0 +1,103 @@
+"""
+PDF Job Events
+Redis pub/sub channel for job stage transitions
+
+Workers publish (sync client). Each API process keeps ONE async
+subscription to the channel and fans events out to every connected
+admin SSE stream for that job.
+"""
+import redis
+import redis.asyncio as aioredis
+from src.config import settings
+from src.integrations.redis_queue import redis_queue
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL = "pdf_job_events"
+SUBSCRIBER_QUEUE_SIZE = 100
+RECONNECT_DELAY_SECONDS = 2
+
+# Stages after which nothing more will be published for a job
+FINAL_STAGES = ("completed", "failed")
+
+
+def publish_job_event(job_id: int, stage: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """Publish a stage transition for a job (never raises - events are best effort)"""
+    event = {"job_id": job_id, "stage": stage, "ts": time.time()}
+    if data:
+        event.update(data)
+    try:
+        redis_queue.client.publish(JOB_EVENTS_CHANNEL, json.dumps(event, default=str))
+    except Exception as e:
+        logger.warning(f"⚠️ Job event publish failed for Job {job_id} ({stage}): {e}")
+
+
+class JobEventHub:
+    """Single pub/sub subscription per process, fanned out to local subscribers"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    async def subscribe(self, job_id: int) -> asyncio.Queue:
+        """Register a subscriber queue for a job (starts the listener on first use)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return queue
+
+    async def unsubscribe(self, job_id: int, queue: asyncio.Queue) -> None:
+        """Remove a subscriber queue"""
+        queues = self._subscribers.get(job_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                self._subscribers.pop(job_id, None)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        """Hand an event to every local subscriber of its job"""
+        for queue in list(self._subscribers.get(event.get("job_id"), ())):
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than blocking everyone
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        """Read the channel forever, reconnecting on Redis errors"""
+        while True:
+            client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(JOB_EVENTS_CHANNEL)
+                logger.info(f"✅ Subscribed to {JOB_EVENTS_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        self._dispatch(json.loads(message["data"]))
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"⚠️ Bad job event skipped: {e}")
+            except asyncio.CancelledError:
+                raise
+            except (redis.RedisError, OSError) as e:
+                logger.error(f"❌ Job event subscription lost: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+# Global instance (one per API process)
+job_event_hub = JobEventHub()
@@ -0,0 +1,188 @@
+"""
+PDF Job Progress Tracker
+Atomic per-job counters in Redis, updated by the AI workers
+
+The PDF processor opens a progress hash when it queues a job's chunks,
+every processed chunk increments it, and the worker that finishes the
+last chunk completes the job in Postgres. Admin status reads come
+straight from the hash, without touching the database.
+"""
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+from src.constants import JobStatus, IST_DISPLAY_FORMAT
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = "pdf_job:{job_id}:progress"
+ACTIVE_TTL_SECONDS = 7 * 24 * 3600     # Long monthly PDFs in slow mode
+FINISHED_TTL_SECONDS = 24 * 3600       # Keep final stats around for status polls
+
+# Counters only move if the job was opened by the PDF processor; the caller
+# whose increment reaches total_chunks is told it processed the last chunk
+RECORD_CHUNK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('HINCRBY', KEYS[1], 'facts', ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'questions', ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'tokens', ARGV[3])
+redis.call('HINCRBY', KEYS[1], 'chunks_failed', ARGV[4])
+local done = redis.call('HINCRBY', KEYS[1], 'chunks_done', 1)
+local total = tonumber(redis.call('HGET', KEYS[1], 'total_chunks'))
+local last = 0
+if done == total then
+    last = 1
+end
+return {done, total, last}
+"""
+
+UPDATE_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+INT_FIELDS = (
+    "job_id", "priority", "total_chunks", "chunks_done", "chunks_failed",
+    "facts", "questions", "tokens"
+)
+
+
+class JobProgressTracker:
+    """Redis-backed progress counters for PDF jobs"""
+
+    def __init__(self, queue: RedisQueue):
+        self.client = queue.client
+        self._record_chunk = self.client.register_script(RECORD_CHUNK_SCRIPT)
+        self._update = self.client.register_script(UPDATE_IF_EXISTS_SCRIPT)
+
+    @staticmethod
+    def _key(job_id: int) -> str:
+        return PROGRESS_KEY.format(job_id=job_id)
+
+    def start(self, job_id: int, total_chunks: int, job_info: Dict[str, Any]) -> bool:
+        """
+        Open progress counters for a job (called before its chunks are queued)
+        job_info: filename, exam_types, date_from, date_to, created_at, priority
+        """
+        created_at = job_info.get("created_at")
+        mapping = {
+            "job_id": job_id,
+            "status": JobStatus.PROCESSING.value,
+            "filename": job_info.get("filename") or "",
+            "exam_types": json.dumps(job_info.get("exam_types") or []),
+            "date_from": str(job_info.get("date_from")),
+            "date_to": str(job_info.get("date_to")),
+            "created_at": created_at.strftime(IST_DISPLAY_FORMAT) if hasattr(created_at, "strftime") else str(created_at),
+            "priority": job_info.get("priority") or 1,
+            "total_chunks": total_chunks,
+            "chunks_done": 0,
+            "chunks_failed": 0,
+            "facts": 0,
+            "questions": 0,
+            "tokens": 0,
+            "started_at": time.time(),
+        }
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.delete(self._key(job_id))
+            pipe.hset(self._key(job_id), mapping=mapping)
+            pipe.expire(self._key(job_id), ACTIVE_TTL_SECONDS)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Progress start failed for Job {job_id}: {e}")
+            return False
+
+    def record_chunk(
+        self,
+        job_id: int,
+        facts: int = 0,
+        questions: int = 0,
+        tokens: int = 0,
+        failed: bool = False
+    ) -> Optional[Dict[str, int]]:
+        """
+        Count one processed chunk
+        Returns: {"chunks_done", "total_chunks", "is_last"} or None if the job isn't tracked
+        """
+        try:
+            result = self._record_chunk(
+                keys=[self._key(job_id)],
+                args=[facts, questions, tokens, 1 if failed else 0]
+            )
+            if not result:
+                return None
+            done, total, last = (int(v) for v in result)
+            return {"chunks_done": done, "total_chunks": total, "is_last": bool(last)}
+        except Exception as e:
+            logger.error(f"❌ Progress update failed for Job {job_id}: {e}")
+            return None
+
+    def update(self, job_id: int, **fields) -> bool:
+        """Set fields on a tracked job (no-op if the job isn't tracked)"""
+        args = []
+        for name, value in fields.items():
+            args.extend([name, value])
+        try:
+            return bool(self._update(keys=[self._key(job_id)], args=args))
+        except Exception as e:
+            logger.error(f"❌ Progress field update failed for Job {job_id}: {e}")
+            return False
+
+    def finish(self, job_id: int, status: str, error_message: Optional[str] = None) -> None:
+        """Mark tracked job as finished and shorten its TTL"""
+        fields: Dict[str, Any] = {"status": status, "finished_at": time.time()}
+        if error_message:
+            fields["error_message"] = error_message[:500]
+        if self.update(job_id, **fields):
+            try:
+                self.client.expire(self._key(job_id), FINISHED_TTL_SECONDS)
+            except Exception as e:
+                logger.error(f"❌ Progress expire failed for Job {job_id}: {e}")
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Live progress snapshot with percent and ETA
+        Returns None if the job isn't tracked (not started yet or expired)
+        """
+        try:
+            raw = self.client.hgetall(self._key(job_id))
+        except Exception as e:
+            logger.error(f"❌ Progress read failed for Job {job_id}: {e}")
+            return None
+        if not raw:
+            return None
+
+        progress: Dict[str, Any] = dict(raw)
+        for name in INT_FIELDS:
+            progress[name] = int(raw.get(name) or 0)
+        progress["exam_types"] = json.loads(raw.get("exam_types") or "[]")
+
+        total = progress["total_chunks"]
+        done = progress["chunks_done"]
+        started_at = float(raw.get("started_at") or time.time())
+        finished_at = float(raw["finished_at"]) if raw.get("finished_at") else None
+        elapsed = (finished_at or time.time()) - started_at
+
+        progress["progress_percent"] = round(100.0 * done / total, 1) if total else 0.0
+        progress["elapsed_seconds"] = int(elapsed)
+        if finished_at or done >= total:
+            progress["eta_seconds"] = 0
+        elif done:
+            progress["eta_seconds"] = int(elapsed / done * (total - done))
+        else:
+            progress["eta_seconds"] = None
+        return progress
+
+
+# Global instance (built on first use)
+job_progress = LazyClient(lambda: JobProgressTracker(redis_queue), "Job progress")
@@ -0,0 +1,136 @@
+"""
+AI Job Scheduler
+Fair-share scheduling of PDF chunks on top of RedisQueue
+
+Every PDF job gets its own sub-queue. Workers pop through a smooth
+weighted round-robin across all active jobs (weight = PDFJob.priority),
+so a small urgent PDF is not stuck behind hundreds of chunks of a
+monthly PDF, while workers never idle as long as any job has chunks.
+"""
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+from src.constants import DEFAULT_JOB_PRIORITY, MAX_JOB_PRIORITY
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_JOBS_KEY = "ai_processing_queue:active"    # hash: job_id -> weight
+CREDITS_KEY = "ai_processing_queue:credits"       # hash: job_id -> current WRR credit
+JOB_QUEUE_PREFIX = "ai_processing_queue:job:"     # list per job: encoded chunks
+
+# Smooth weighted round-robin (same algorithm as nginx upstreams), atomic in Redis:
+# every active job earns its weight in credit, the richest job is served and pays
+# the total weight back. Jobs whose sub-queue is empty leave the rotation.
+POP_SCRIPT = """
+while true do
+    local active = redis.call('HGETALL', KEYS[1])
+    if #active == 0 then
+        return false
+    end
+
+    local total = 0
+    local best, best_credit = nil, nil
+    for i = 1, #active, 2 do
+        local job = active[i]
+        local weight = tonumber(active[i + 1])
+        total = total + weight
+        local credit = redis.call('HINCRBY', KEYS[2], job, weight)
+        if best == nil or credit > best_credit then
+            best, best_credit = job, credit
+        end
+    end
+    redis.call('HINCRBY', KEYS[2], best, -total)
+
+    local item = redis.call('LPOP', ARGV[1] .. best)
+    if item then
+        return item
+    end
+
+    -- Job fully drained: drop it from the rotation and pick again
+    redis.call('HDEL', KEYS[1], best)
+    redis.call('HDEL', KEYS[2], best)
+end
+"""
+
+SET_WEIGHT_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+def clamp_priority(priority: Optional[int]) -> int:
+    """Normalise a priority into a valid round-robin weight"""
+    if priority is None:
+        return DEFAULT_JOB_PRIORITY
+    return max(1, min(MAX_JOB_PRIORITY, int(priority)))
+
+
+class JobScheduler:
+    """Per-job sub-queues with weighted round-robin across active jobs"""
+
+    def __init__(self, queue: RedisQueue):
+        self.queue = queue
+        self._pop = queue.raw_client.register_script(POP_SCRIPT)
+        self._set_weight = queue.raw_client.register_script(SET_WEIGHT_SCRIPT)
+
+    def enqueue_job(self, job_id: int, chunks: List[dict], priority: Optional[int] = None) -> int:
+        """
+        Queue all chunks of a job and add it to the rotation (one MULTI round-trip)
+        Returns: number of chunks queued (0 on failure)
+        """
+        if not chunks:
+            return 0
+        weight = clamp_priority(priority)
+        try:
+            payloads = [self.queue.encode(chunk) for chunk in chunks]
+            pipe = self.queue.raw_client.pipeline(transaction=True)
+            pipe.rpush(f"{JOB_QUEUE_PREFIX}{job_id}", *payloads)
+            pipe.hset(ACTIVE_JOBS_KEY, str(job_id), weight)
+            pipe.execute()
+            logger.info(f"✅ Scheduled {len(chunks)} chunks for Job {job_id} (priority {weight})")
+            return len(chunks)
+        except Exception as e:
+            logger.error(f"❌ Scheduling Job {job_id} failed: {e}")
+            return 0
+
+    def pop(self) -> Optional[dict]:
+        """Pop the next chunk according to weighted round-robin (non-blocking)"""
+        try:
+            raw = self._pop(keys=[ACTIVE_JOBS_KEY, CREDITS_KEY], args=[JOB_QUEUE_PREFIX])
+            return self.queue.decode(raw) if raw else None
+        except Exception as e:
+            logger.error(f"❌ Scheduler pop failed: {e}")
+            return None
+
+    def set_priority(self, job_id: int, priority: int) -> bool:
+        """Change the weight of a job that is currently in the rotation"""
+        try:
+            updated = self._set_weight(keys=[ACTIVE_JOBS_KEY], args=[str(job_id), clamp_priority(priority)])
+            return bool(updated)
+        except Exception as e:
+            logger.error(f"❌ Scheduler priority update failed for Job {job_id}: {e}")
+            return False
+
+    def pending(self, job_id: int) -> int:
+        """Chunks still waiting for a job"""
+        return self.queue.length(f"{JOB_QUEUE_PREFIX}{job_id}")
+
+    def active_jobs(self) -> dict:
+        """Active job ids mapped to their weights"""
+        try:
+            return {int(k): int(v) for k, v in self.queue.client.hgetall(ACTIVE_JOBS_KEY).items()}
+        except Exception as e:
+            logger.error(f"❌ Scheduler active jobs lookup failed: {e}")
+            return {}
+
+    def length(self) -> int:
+        """Total chunks waiting across all active jobs"""
+        return sum(self.pending(job_id) for job_id in self.active_jobs())
+
+
+# Global instance (built on first use)
+job_scheduler = LazyClient(lambda: JobScheduler(redis_queue), "Job scheduler")
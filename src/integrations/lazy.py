@@ -0,0 +1,55 @@
+"""
+Lazy Integration Providers
+Global clients are built on first use instead of at import time
+
+    groq_client = LazyClient(GroqClient, "Groq")
+    groq_client.generate_content(...)   # constructs GroqClient once, then delegates
+
+Importing a module therefore needs no credentials and opens no connections;
+the API lifespan hook warms the providers in parallel at startup.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LazyClient(Generic[T]):
+    """Thread-safe, build-once proxy around an integration client"""
+    
+    def __init__(self, factory: Callable[[], T], name: str):
+        self._factory = factory
+        self._name = name
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+    
+    def instance(self) -> T:
+        """Return the client, building it on first call (a failed build is retried next time)"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    self._instance = instance
+                    logger.info(f"⚡ {self._name} ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return instance
+    
+    def __getattr__(self, item):
+        # Only reached for attributes the proxy itself doesn't have, so the
+        # proxy's own API (instance/initialized) must not shadow client methods
+        return getattr(self.instance(), item)
+    
+    def __repr__(self) -> str:
+        state = "ready" if self.initialized else "not initialized"
+        return f"<LazyClient {self._name} ({state})>"
+
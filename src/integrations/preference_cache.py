@@ -0,0 +1,97 @@
+"""
+User Preference Cache
+Preference snapshots in Redis, guarded by a per-user version counter
+
+Every preference write INCRs user_prefs:{id}:version after its commit.
+A cached snapshot is only served while its version matches the counter,
+and a snapshot loaded from Postgres is only stored if the counter did not
+move while it was being read - so a reader racing a writer can never put
+stale preferences back.
+"""
+from src.config import settings
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+import json
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "user_prefs:{user_id}"
+VERSION_KEY = "user_prefs:{user_id}:version"   # No TTL - must only ever go up
+
+# Store the snapshot only if nobody bumped the version since it was read
+SET_IF_VERSION_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or '0'
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+SNAPSHOT_FIELDS = ("exam_types", "notification_times", "daily_item_count", "content_type_ratio")
+
+
+class PreferenceCache:
+    """Versioned preference snapshots (all operations fail open)"""
+
+    def __init__(self, queue: RedisQueue):
+        self.client = queue.client
+        self._set_if_version = self.client.register_script(SET_IF_VERSION_SCRIPT)
+
+    @staticmethod
+    def _keys(user_id: int) -> tuple:
+        return SNAPSHOT_KEY.format(user_id=user_id), VERSION_KEY.format(user_id=user_id)
+
+    def lookup(self, user_id: int) -> tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Cached snapshot (if still current) and the current version, in one round-trip
+        Returns (None, None) if Redis is unavailable
+        """
+        try:
+            raw, version = self.client.mget(self._keys(user_id))
+        except Exception as e:
+            logger.warning(f"⚠️ Preference cache read failed for user {user_id}: {e}")
+            return None, None
+        version = int(version or 0)
+        if raw:
+            try:
+                snapshot = json.loads(raw)
+                if snapshot.get("version") == version:
+                    return snapshot, version
+            except ValueError:
+                pass
+        return None, version
+
+    def store(self, user_id: int, snapshot: Dict[str, Any]) -> bool:
+        """Cache a snapshot read at snapshot["version"] (skipped if the version moved on)"""
+        try:
+            return bool(self._set_if_version(
+                keys=list(self._keys(user_id)),
+                args=[
+                    snapshot["version"],
+                    json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")),
+                    settings.PREFERENCE_CACHE_TTL_SECONDS,
+                ]
+            ))
+        except Exception as e:
+            logger.warning(f"⚠️ Preference cache write failed for user {user_id}: {e}")
+            return False
+
+    def bump(self, user_id: int) -> Optional[int]:
+        """Advance the user's preference version and drop the snapshot (call after commit)"""
+        snapshot_key, version_key = self._keys(user_id)
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.incr(version_key)
+            pipe.delete(snapshot_key)
+            version, _ = pipe.execute()
+            return int(version)
+        except Exception as e:
+            logger.error(f"❌ Preference version bump failed for user {user_id}: {e}")
+            return None
+
+
+# Global instance (built on first use)
+preference_cache = LazyClient(lambda: PreferenceCache(redis_queue), "Preference cache")
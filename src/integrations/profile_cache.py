@@ -0,0 +1,95 @@
+"""
+User Profile Cache
+One serialised profile blob per user in Redis (GET on /user/profile hits)
+
+Invalidation:
+- ORM writes to User, UserPreferences or DeviceToken rows are collected on
+  flush and the affected profiles are dropped after the commit (session hooks)
+- Bulk UPDATEs bypass the ORM, so the repositories doing them call
+  profile_cache.invalidate() themselves
+- Anything missed (e.g. FCM token cleanup) ages out via PROFILE_CACHE_TTL_SECONDS
+"""
+from itertools import chain
+from sqlalchemy import event
+from src.config import settings
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+from src.models.device_token import DeviceToken
+from src.models.user import User
+from src.models.user_preferences import UserPreferences
+import json
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "user_profile:{user_id}"
+DIRTY_PROFILES = "profile_cache_dirty"   # session.info key
+
+
+class ProfileCache:
+    """Redis-backed profile blobs (all operations fail open)"""
+
+    def __init__(self, queue: RedisQueue):
+        self.client = queue.client
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return PROFILE_KEY.format(user_id=user_id)
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(self._key(user_id))
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"⚠️ Profile cache read failed for user {user_id}: {e}")
+            return None
+
+    def set(self, user_id: int, profile: Dict[str, Any]) -> None:
+        try:
+            self.client.set(
+                self._key(user_id),
+                json.dumps(profile, ensure_ascii=False, separators=(",", ":")),
+                ex=settings.PROFILE_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Profile cache write failed for user {user_id}: {e}")
+
+    def invalidate(self, *user_ids: int) -> None:
+        if not user_ids:
+            return
+        try:
+            self.client.delete(*(self._key(user_id) for user_id in user_ids))
+        except Exception as e:
+            logger.warning(f"⚠️ Profile cache invalidation failed for {len(user_ids)} users: {e}")
+
+
+def _collect_dirty_profiles(session, flush_context) -> None:
+    """after_flush: remember whose profile rows this transaction touched"""
+    dirty = session.info.setdefault(DIRTY_PROFILES, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User):
+            dirty.add(obj.id)
+        elif isinstance(obj, (UserPreferences, DeviceToken)):
+            dirty.add(obj.user_id)
+
+
+def _invalidate_after_commit(session) -> None:
+    dirty = session.info.pop(DIRTY_PROFILES, None)
+    if dirty:
+        profile_cache.invalidate(*(user_id for user_id in dirty if user_id is not None))
+
+
+def _forget_after_rollback(session) -> None:
+    session.info.pop(DIRTY_PROFILES, None)
+
+
+def install_profile_cache_invalidation(session_factory) -> None:
+    """Attach the invalidation hooks to a sessionmaker"""
+    event.listen(session_factory, "after_flush", _collect_dirty_profiles)
+    event.listen(session_factory, "after_commit", _invalidate_after_commit)
+    event.listen(session_factory, "after_rollback", _forget_after_rollback)
+
+
+# Global instance (built on first use)
+profile_cache = LazyClient(lambda: ProfileCache(redis_queue), "Profile cache")
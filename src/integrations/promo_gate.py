@@ -0,0 +1,81 @@
+"""
+Promo Redemption Gate
+Redis counter of remaining uses per limited promo code (PROMO_REDIS_GATE)
+
+During a launch burst most requests arrive after the code is used up.
+Each request DECRs the counter first, and once it reaches zero the rest
+are turned away without taking the promo row lock in Postgres. The gate
+only ever rejects when Redis says nothing is left; Postgres
+(PromoCodeRepository.redeem) stays the source of truth, and the counter
+is re-seeded from it every PROMO_GATE_TTL_SECONDS to undo any drift
+(e.g. a process dying between reserve and release).
+"""
+from src.config import settings
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+REMAINING_KEY = "promo_remaining:{code}"
+
+# Seed from Postgres on first use, then take one use if any are left
+RESERVE_SCRIPT = """
+local remaining = redis.call('GET', KEYS[1])
+if not remaining then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    remaining = ARGV[1]
+end
+if tonumber(remaining) <= 0 then
+    return -1
+end
+return redis.call('DECR', KEYS[1])
+"""
+
+# Give a use back, unless the counter expired meanwhile (the re-seed already counts it)
+RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCR', KEYS[1])
+end
+return false
+"""
+
+
+class PromoGate:
+    """Redis-side pre-decrement of promo uses (fails open)"""
+
+    def __init__(self, queue: RedisQueue):
+        self.client = queue.client
+        self._reserve = self.client.register_script(RESERVE_SCRIPT)
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+
+    @staticmethod
+    def _key(code: str) -> str:
+        return REMAINING_KEY.format(code=code.upper())
+
+    def reserve(self, code: str, remaining: int) -> Optional[bool]:
+        """
+        Take one use (remaining = max_uses - used_count as last read from Postgres)
+        Returns: True (go ahead), False (used up), None (Redis unavailable - go ahead)
+        """
+        try:
+            left = int(self._reserve(
+                keys=[self._key(code)],
+                args=[max(remaining, 0), settings.PROMO_GATE_TTL_SECONDS]
+            ))
+            return left >= 0
+        except Exception as e:
+            logger.warning(f"⚠️ Promo gate unavailable for {code}: {e}")
+            return None
+
+    def release(self, code: str) -> None:
+        """Return a reserved use whose Postgres redemption didn't happen"""
+        try:
+            self._release(keys=[self._key(code)])
+        except Exception as e:
+            logger.warning(f"⚠️ Promo gate release failed for {code}: {e}")
+
+
+# Global instance (built on first use)
+promo_gate = LazyClient(lambda: PromoGate(redis_queue), "Promo gate")
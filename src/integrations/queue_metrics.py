@@ -0,0 +1,35 @@
+"""
+Queue Depth Metrics
+Prometheus collector that reads Redis queue lengths at scrape time
+"""
+from prometheus_client.core import GaugeMetricFamily
+from src.integrations.redis_queue import redis_queue
+from src.integrations.job_scheduler import job_scheduler
+
+PLAIN_QUEUES = ("pdf_processing_queue", "ai_processing_queue")
+
+
+class QueueDepthCollector:
+    """Gauge per queue, computed on scrape so idle processes cost nothing"""
+    
+    def describe(self):
+        # Lets the registry learn metric names without hitting Redis at import
+        yield GaugeMetricFamily("redis_queue_depth", "Jobs waiting in a Redis queue", labels=["queue"])
+        yield GaugeMetricFamily("ai_scheduler_active_jobs", "PDF jobs in the AI round-robin")
+    
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "redis_queue_depth",
+            "Jobs waiting in a Redis queue",
+            labels=["queue"]
+        )
+        for name in PLAIN_QUEUES:
+            depth.add_metric([name], redis_queue.length(name))
+        # Fair-share sub-queues of the AI stage (one list per active PDF job)
+        depth.add_metric(["ai_processing_queue:jobs"], job_scheduler.length())
+        yield depth
+        
+        active = GaugeMetricFamily("ai_scheduler_active_jobs", "PDF jobs in the AI round-robin")
+        active.add_metric([], len(job_scheduler.active_jobs()))
+        yield active
+
@@ -2,10 +2,8 @@
 Cloudflare R2 Storage Client
 S3-compatible storage for PDFs
 """
-import boto3
-from botocore.config import Config
-from botocore.exceptions import ClientError
 from src.config import settings
+from src.integrations.lazy import LazyClient
 import logging
 from datetime import datetime
 from typing import Optional
@@ -16,6 +14,10 @@ class R2Storage:
     """Cloudflare R2 storage handler"""
     
     def __init__(self):
+        # boto3/botocore are slow to import; only pay for them when R2 is actually
+        # used (the methods import ClientError locally for the same reason)
+        import boto3
+        from botocore.config import Config
         self.client = boto3.client(
             's3',
             endpoint_url=settings.R2_ENDPOINT,
@@ -32,6 +34,8 @@ class R2Storage:
         Upload PDF to R2
         Returns: R2 key (path)
         """
+        from botocore.exceptions import ClientError
+        
         # Generate unique key with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         key = f"pdfs/{job_id}_{timestamp}_{filename}"
@@ -49,11 +53,32 @@ class R2Storage:
             logger.error(f"❌ R2 upload failed: {e}")
             raise Exception(f"Failed to upload PDF: {str(e)}")
     
+    def upload_file(self, path: str, key: str, content_type: str = 'application/octet-stream') -> str:
+        """
+        Upload a local file under an explicit key (large archives)
+        boto3's managed transfer reads it in parts (multipart above 8 MB), never whole
+        Returns: R2 key (path)
+        """
+        try:
+            self.client.upload_file(
+                Filename=path,
+                Bucket=self.bucket,
+                Key=key,
+                ExtraArgs={'ContentType': content_type}
+            )
+            logger.info(f"✅ Uploaded {path} to R2: {key}")
+            return key
+        except Exception as e:
+            # Managed transfers wrap ClientError in boto3's S3UploadFailedError
+            logger.error(f"❌ R2 upload failed: {e}")
+            raise Exception(f"Failed to upload {key}: {str(e)}")
+    
     def download_pdf(self, r2_key: str, local_path: str):
         """
         Download PDF from R2 to local path
         For worker processing
         """
+        from botocore.exceptions import ClientError
         try:
             self.client.download_file(
                 Bucket=self.bucket,
@@ -69,6 +94,7 @@ class R2Storage:
         """
         Generate presigned URL for PDF (temporary access)
         """
+        from botocore.exceptions import ClientError
         try:
             url = self.client.generate_presigned_url(
                 'get_object',
@@ -82,6 +108,7 @@ class R2Storage:
     
     def delete_pdf(self, r2_key: str):
         """Delete PDF from R2 (if needed)"""
+        from botocore.exceptions import ClientError
         try:
             self.client.delete_object(Bucket=self.bucket, Key=r2_key)
             logger.info(f"✅ PDF deleted from R2: {r2_key}")
@@ -89,5 +116,5 @@ class R2Storage:
             logger.error(f"❌ R2 delete failed: {e}")
             raise Exception(f"Failed to delete PDF: {str(e)}")
 
-# Global R2 client
-r2_storage = R2Storage()
+# Global R2 client (built on first use)
+r2_storage = LazyClient(R2Storage, "R2")
@@ -4,7 +4,9 @@ Simple queue operations for job processing
 """
 import redis
 import json
+import zlib
 from src.config import settings
+from src.integrations.lazy import LazyClient
 import logging
 from typing import Optional
 
@@ -18,13 +20,36 @@ class RedisQueue:
             settings.REDIS_URL,
             decode_responses=True
         )
+        # Queue payloads may be zlib-compressed (binary), so queue I/O goes
+        # through a client that returns raw bytes
+        self.raw_client = redis.from_url(settings.REDIS_URL)
         logger.info("✅ Redis Queue initialized")
     
+    @staticmethod
+    def encode(job_data: dict) -> bytes:
+        """
+        Serialize job for the queue
+        Large payloads (PDF chunk text) are zlib-compressed JSON, small ones stay plain JSON
+        """
+        payload = json.dumps(job_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(payload) >= settings.QUEUE_COMPRESS_MIN_BYTES:
+            return zlib.compress(payload, settings.QUEUE_COMPRESS_LEVEL)
+        return payload
+    
+    @staticmethod
+    def decode(raw) -> dict:
+        """Deserialize job from the queue (plain JSON or zlib-compressed JSON)"""
+        if isinstance(raw, str):
+            return json.loads(raw)
+        # Plain JSON objects always start with "{", zlib streams never do
+        if raw[:1] != b"{":
+            raw = zlib.decompress(raw)
+        return json.loads(raw)
+    
     def push(self, queue_name: str, job_data: dict) -> bool:
         """Push job to queue"""
         try:
-            job_json = json.dumps(job_data)
-            self.client.rpush(queue_name, job_json)
+            self.raw_client.rpush(queue_name, self.encode(job_data))
             logger.info(f"✅ Pushed to {queue_name}: Job {job_data.get('job_id')}")
             return True
         except Exception as e:
@@ -35,12 +60,11 @@ class RedisQueue:
         """Pop job from queue (blocking)"""
         try:
             # blpop returns tuple: (queue_name, value) or None
-            result = self.client.blpop([queue_name], timeout=timeout)
+            result = self.raw_client.blpop([queue_name], timeout=timeout)
             
             if result:
-                # result[1] is the job JSON string
-                job_json = result[1]
-                return json.loads(job_json)
+                # result[1] is the encoded job payload
+                return self.decode(result[1])
             
             return None
             
@@ -56,5 +80,5 @@ class RedisQueue:
             logger.error(f"❌ Queue length failed: {e}")
             return 0
 
-# Global instance
-redis_queue = RedisQueue()
\ No newline at end of file
+# Global instance (built on first use)
+redis_queue = LazyClient(RedisQueue, "Redis")
\ No newline at end of file
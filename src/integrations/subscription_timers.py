@@ -0,0 +1,89 @@
+"""
+Subscription Expiry Timers
+Redis sorted set of user_id scored by subscription_expires_at (epoch seconds)
+
+SubscriptionService schedules a timer whenever it sets an expiry. A beat
+task pops due timers every minute and expires those users in Postgres, so
+paid access ends within a minute instead of at the next midnight sweep.
+The nightly task only reconciles what Redis missed and re-seeds the set.
+"""
+from src.integrations.redis_queue import RedisQueue, redis_queue
+from src.integrations.lazy import LazyClient
+from datetime import datetime
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TIMERS_KEY = "subscription_expiry_timers"
+
+# Read and remove due timers in one step so concurrent beat runs never
+# process the same user twice. The bound is exclusive, like the expiry query
+# (subscription_expires_at < now): a timer due exactly at `now` waits for the
+# next run instead of being popped and then not expired
+POP_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+class SubscriptionTimers:
+    """Redis ZSET timer index for subscription expiries"""
+
+    def __init__(self, queue: RedisQueue):
+        self.client = queue.client
+        self._pop_due = self.client.register_script(POP_DUE_SCRIPT)
+
+    def schedule(self, user_id: int, expires_at: Optional[datetime]) -> bool:
+        """Set (or move) a user's expiry timer; no expiry means no timer"""
+        if expires_at is None:
+            return self.cancel(user_id)
+        try:
+            self.client.zadd(TIMERS_KEY, {str(user_id): expires_at.timestamp()})
+            return True
+        except Exception as e:
+            logger.error(f"❌ Expiry timer schedule failed for user {user_id}: {e}")
+            return False
+
+    def schedule_many(self, timers: Dict[int, datetime]) -> int:
+        """Set many timers with one ZADD (reconciliation / retries)"""
+        if not timers:
+            return 0
+        try:
+            self.client.zadd(
+                TIMERS_KEY,
+                {str(user_id): expires_at.timestamp() for user_id, expires_at in timers.items()}
+            )
+            return len(timers)
+        except Exception as e:
+            logger.error(f"❌ Expiry timer bulk schedule failed: {e}")
+            return 0
+
+    def cancel(self, user_id: int) -> bool:
+        """Remove a user's expiry timer"""
+        try:
+            self.client.zrem(TIMERS_KEY, str(user_id))
+            return True
+        except Exception as e:
+            logger.error(f"❌ Expiry timer cancel failed for user {user_id}: {e}")
+            return False
+
+    def pop_due(self, now: datetime, limit: int) -> List[int]:
+        """Atomically remove and return up to `limit` users whose timer is before `now`"""
+        due = self._pop_due(keys=[TIMERS_KEY], args=[now.timestamp(), limit])
+        return [int(user_id) for user_id in due]
+
+    def size(self) -> int:
+        """Number of pending timers"""
+        try:
+            return self.client.zcard(TIMERS_KEY)
+        except Exception as e:
+            logger.error(f"❌ Expiry timer count failed: {e}")
+            return 0
+
+
+# Global instance (built on first use)
+subscription_timers = LazyClient(lambda: SubscriptionTimers(redis_queue), "Subscription timers")
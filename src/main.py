@@ -1,14 +1,32 @@
 """
 FastAPI Application Entry Point
+Importing this module has no side effects beyond building the app;
+integrations are warmed in the lifespan hook. The schema is created
+beforehand by the one-shot scripts.create_tables step (start.sh).
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.v1 import admin, auth, user
 from src.api.v1.subscription import admin_router as subscription_admin_router, user_router as subscription_user_router
+from src.api.responses import FastJSONResponse
+from src.api.middleware.compression import CompressionMiddleware
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.query_inspector import QueryInspectorMiddleware
+from src.api.middleware.rate_limit import RateLimitMiddleware
 from src.config import settings
-from src.database.session import engine
-from src.models import base
+from src.utils.logger import setup_logging
+from src.database.session import engine, replica_engine
+from src.integrations.redis_queue import redis_queue
+from src.integrations.firebase_auth import firebase_auth_client
+from src.integrations.r2_storage import r2_storage
+from src.integrations.queue_metrics import QueueDepthCollector
+from src.utils.metrics import render_metrics
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy import text
+import asyncio
 import logging
+import time
 from src.api.v1 import content
 # Import all models to register SQLAlchemy relationships
 from src.models.user import User
@@ -21,22 +39,60 @@ from src.models.subscription_history import SubscriptionHistory
 from src.models.question import Question
 from src.models.pdf_job import PDFJob
 
-# Create tables
-base.Base.metadata.create_all(bind=engine)
-
-# Setup logging
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Setup logging (JSON via a background listener thread)
+setup_logging("api")
 
 logger = logging.getLogger(__name__)
 
+
+def prepare_database():
+    """Open the first pooled connection and check its timezone"""
+    with engine.connect() as conn:
+        timezone = conn.execute(text("SHOW timezone")).scalar()
+    if timezone != settings.TIMEZONE:
+        # DB_PGBOUNCER mode relies on ALTER ROLE/DATABASE ... SET timezone
+        logger.warning(f"⚠️ Database session timezone is {timezone}, expected {settings.TIMEZONE}")
+
+
+def prepare_replica():
+    """Open the first pooled replica connection"""
+    with replica_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+# Warmed concurrently at startup; anything that fails is retried on first use
+STARTUP_WARMUPS = {
+    "Database": prepare_database,
+    "Redis": lambda: redis_queue.client.ping(),
+    "Firebase Auth": firebase_auth_client.instance,
+    "R2": r2_storage.instance,
+}
+if replica_engine is not None:
+    STARTUP_WARMUPS["Database replica"] = prepare_replica
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm integrations in parallel before serving traffic"""
+    if settings.STARTUP_WARMUP:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(warmup) for warmup in STARTUP_WARMUPS.values()),
+            return_exceptions=True
+        )
+        for name, result in zip(STARTUP_WARMUPS, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Startup warmup failed for {name}: {result}")
+        logger.info(f"🚀 Startup warmup finished in {(time.perf_counter() - started) * 1000:.0f} ms")
+    yield
+
 # Create FastAPI app
 app = FastAPI(
     title="Current Affairs Platform",
     description="API for PDF upload, user management, and notification delivery",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware (allow mobile app requests)
@@ -48,6 +104,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (fetch-daily / history carry long Devanagari texts)
+app.add_middleware(CompressionMiddleware)
+
+# Slow-query / N+1 report per request (opt-in, development and staging)
+if settings.SQL_INSPECTOR_ENABLED:
+    app.add_middleware(QueryInspectorMiddleware)
+
+# Per-user / per-admin-key token buckets (429s skip everything below, but are still measured)
+app.add_middleware(RateLimitMiddleware)
+
+# Latency / DB usage per route (outermost, so compression time is included)
+app.add_middleware(MetricsMiddleware)
+
 # Mount API routes
 app.include_router(admin.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
@@ -69,21 +138,48 @@ async def root():
 
 
 @app.get("/health")
-async def health():
-    """Detailed health check"""
+def health(response: Response):
+    """Detailed health check (503 if the database, its replica or Redis is unreachable)"""
+    services = {}
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        services["database"] = "up"
+    except Exception as e:
+        logger.error(f"❌ Health check: database unreachable: {e}")
+        services["database"] = "down"
+    if replica_engine is not None:
+        try:
+            with replica_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            services["database_replica"] = "up"
+        except Exception as e:
+            logger.error(f"❌ Health check: database replica unreachable: {e}")
+            services["database_replica"] = "down"
+    try:
+        redis_queue.client.ping()
+        services["redis"] = "up"
+    except Exception as e:
+        logger.error(f"❌ Health check: redis unreachable: {e}")
+        services["redis"] = "down"
+    
+    healthy = all(state == "up" for state in services.values())
+    if not healthy:
+        response.status_code = 503
     return {
-        "status": "healthy",
+        "status": "healthy" if healthy else "unhealthy",
         "environment": settings.ENVIRONMENT,
         "timezone": settings.TIMEZONE,
-        "services": {
-            "admin_api": "active",
-            "user_api": "active",
-            "auth_api": "active",
-            "subscriptions_api": "active"
-        }
+        "services": services
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(render_metrics([QueueDepthCollector()]), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -26,12 +26,15 @@ from src.models.user import User
 from src.models.user_preferences import UserPreferences
 from src.models.device_token import DeviceToken
 from src.models.subscription_history import SubscriptionHistory
+from src.models.user_notification_slot import UserNotificationSlot
+from src.models.trial_claim import TrialClaim
 
 # Question model (independent but referenced by DeliveryLog)
 from src.models.question import Question
 
 # DeliveryLog (depends on both User and Question)
 from src.models.delivery_log import DeliveryLog
+from src.models.delivered_question_summary import DeliveredQuestionSummary
 
 # Export all models and enums
 __all__ = [
@@ -45,6 +48,7 @@ __all__ = [
     'notification_status_enum',
     
     # Models (alphabetical for easy reference)
+    'DeliveredQuestionSummary',
     'DeliveryLog',
     'DeviceToken',
     'PDFJob',
@@ -52,6 +56,8 @@ __all__ = [
     'Question',
     'SubscriptionHistory',
     'SubscriptionPlan',
+    'TrialClaim',
     'User',
+    'UserNotificationSlot',
     'UserPreferences',
 ]
@@ -0,0 +1,34 @@
+"""
+Delivered Question Summary - Archived delivery history per user
+"""
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import ARRAY
+from src.database.base import Base
+from datetime import datetime
+from src.config import settings
+
+
+class DeliveredQuestionSummary(Base):
+    """
+    Question ids delivered to a user in archived (dropped) delivery_logs partitions
+    Keeps the no-repeat guarantee after raw logs leave Postgres
+    """
+    __tablename__ = "delivered_question_summaries"
+    
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    
+    # Sorted, de-duplicated question ids
+    question_ids = Column(ARRAY(Integer), default=list, nullable=False)
+    
+    # Upper bound (exclusive) of the newest archived partition merged in
+    archived_through = Column(DateTime(timezone=True), nullable=True)
+    
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(settings.IST),
+        onupdate=lambda: datetime.now(settings.IST),
+        nullable=False
+    )
+    
+    def __repr__(self):
+        return f"<DeliveredQuestionSummary user_id={self.user_id} ids={len(self.question_ids or [])}>"
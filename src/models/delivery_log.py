@@ -5,7 +5,7 @@ Delivery Log Model - Track Notification History
 # Import Enum directly from sqlalchemy for casting
 from sqlalchemy import (
     Column, Integer, ForeignKey, DateTime, String, Text, Enum as SQLEnum,
-    cast, type_coerce
+    Index, DDL, event, cast, type_coerce
 )
 # Keep your Python enum definition
 import enum
@@ -33,8 +33,17 @@ notification_status_enum = SQLEnum(
 )
 
 class DeliveryLog(BaseModel):
-    """Log of delivered notifications to users"""
+    """
+    Log of delivered notifications to users
+    Range-partitioned by month on delivered_at (see src/database/partitions.py);
+    partitions past the retention horizon are archived to R2 and folded into
+    DeliveredQuestionSummary
+    """
     __tablename__ = "delivery_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (delivered_at)"}
+
+    # Partition key must be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     user = relationship("User", back_populates="delivery_logs")
@@ -42,7 +51,7 @@ class DeliveryLog(BaseModel):
     question_id = Column(Integer, ForeignKey('questions.id'), nullable=False, index=True)
     question = relationship("Question")
 
-    delivered_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    delivered_at = Column(DateTime(timezone=True), primary_key=True, nullable=False, index=True)
     platform = Column(String(20), default="mobile", nullable=False)
 
     # --- Use the pre-defined SQLEnum instance ---
@@ -62,3 +71,22 @@ class DeliveryLog(BaseModel):
         # Access .value for representation if delivery_status holds the enum object
         status_repr = self.delivery_status.value if isinstance(self.delivery_status, NotificationStatus) else self.delivery_status
         return f"<DeliveryLog user_id={self.user_id} question_id={self.question_id} status={status_repr}>"
+
+
+# History keyset pages: seek on (delivered_at, id) per user, question_id covered
+Index(
+    "ix_delivery_logs_user_history",
+    DeliveryLog.user_id,
+    DeliveryLog.delivered_at.desc(),
+    DeliveryLog.id.desc(),
+    postgresql_include=["question_id"]
+)
+
+
+# Fresh databases (create_all) get a catch-all partition so inserts never fail
+# before the maintenance task has created the monthly partitions
+event.listen(
+    DeliveryLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS delivery_logs_default PARTITION OF delivery_logs DEFAULT")
+)
@@ -26,6 +26,9 @@ class PDFJob(BaseModel):
     # Admin who uploaded
     uploaded_by = Column(String(255), nullable=True)
     
+    # Scheduling weight in the AI queue (higher = bigger share of workers)
+    priority = Column(Integer, default=1, server_default="1", nullable=False)
+    
     # Processing timestamps
     processing_started_at = Column(DateTime(timezone=True), nullable=True)
     processing_completed_at = Column(DateTime(timezone=True), nullable=True)
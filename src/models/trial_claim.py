@@ -0,0 +1,31 @@
+"""
+Trial Claim - One free trial per user and per device
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from src.database.base import Base
+from src.config import settings
+
+
+class TrialClaim(Base):
+    """
+    Written in the same transaction as every trial grant
+    The unique user_id / device_id make eligibility one index probe, and a
+    second concurrent claim fails on INSERT ... ON CONFLICT instead of racing
+    a SELECT. user_id is SET NULL on delete so a device can't re-claim by
+    deleting and re-creating its account.
+    """
+    __tablename__ = "trial_claims"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), nullable=True, unique=True)
+    device_id = Column(String(255), nullable=True, unique=True)
+    source = Column(String(50), nullable=False)  # "trial_granted" (admin) or "trial_applied" (promo)
+    claimed_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(settings.IST),
+        nullable=False
+    )
+    
+    def __repr__(self):
+        return f"<TrialClaim user {self.user_id} device {self.device_id}>"
@@ -1,7 +1,7 @@
 """
 User Model - Firebase Authentication Sync
 """
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
 import enum
@@ -19,6 +19,14 @@ class SubscriptionStatus(str, enum.Enum):
 class User(BaseModel):
     """User accounts synced with Firebase Auth"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Partial index for expiry sweeps (only trial/premium users can expire)
+        Index(
+            "ix_users_subscription_expiring",
+            "subscription_expires_at",
+            postgresql_where=text("subscription_status IN ('trial', 'premium')")
+        ),
+    )
     
     # Firebase UID (primary identifier from Firebase Auth)
     firebase_uid = Column(String(255), unique=True, nullable=False, index=True)
@@ -0,0 +1,20 @@
+"""
+User Notification Slot - Normalised index of notification times
+"""
+from sqlalchemy import Column, Integer, SmallInteger, ForeignKey
+from src.database.base import Base
+
+
+class UserNotificationSlot(Base):
+    """
+    One row per (minute of day, user), mirrors UserPreferences.notification_times
+    The (slot_minute, user_id) primary key makes "who is due at HH:MM" an index-only scan
+    """
+    __tablename__ = "user_notification_slots"
+    
+    # Minutes since midnight IST (0-1439), e.g. "09:30" -> 570
+    slot_minute = Column(SmallInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, index=True)
+    
+    def __repr__(self):
+        return f"<UserNotificationSlot {self.slot_minute} - user {self.user_id}>"
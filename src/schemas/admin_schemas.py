@@ -4,6 +4,7 @@ Admin API Schemas (Pydantic models)
 from pydantic import BaseModel, Field
 from typing import List
 from datetime import date
+from src.constants import MAX_JOB_PRIORITY
 
 class PDFUploadRequest(BaseModel):
     """Request schema for PDF upload"""
@@ -44,5 +45,17 @@ class JobStatusResponse(BaseModel):
     date_from: date
     date_to: date
     created_at: str
+    priority: int | None = None
     total_questions_generated: int | None = None
     total_facts_generated: int | None = None
+    # Live progress (from Redis counters while the job is tracked)
+    total_chunks: int | None = None
+    chunks_done: int | None = None
+    chunks_failed: int | None = None
+    tokens_used: int | None = None
+    progress_percent: float | None = None
+    eta_seconds: int | None = None
+
+class JobPriorityRequest(BaseModel):
+    """Change AI queue priority of a job"""
+    priority: int = Field(..., ge=1, le=MAX_JOB_PRIORITY, description="Round-robin weight (higher = faster)")
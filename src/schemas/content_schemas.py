@@ -37,6 +37,8 @@ class FetchDailyResponse(BaseModel):
     items: List[ContentItem]
     metadata: Dict
     error: Optional[str] = None
+    next_sync_after: Optional[datetime] = Field(None, description="Earliest time for this device's next nightly sync (IST)")
+    next_sync_before: Optional[datetime] = Field(None, description="Sync before this time (end of the nightly window)")
 
 
 class DailySyncResponse(BaseModel):
@@ -44,6 +46,7 @@ class DailySyncResponse(BaseModel):
     success: bool
     content: List[ContentItem]
     metadata: Dict
+    next_cursor: Optional[str] = None  # History: pass back as ?cursor= for the next page
     error: Optional[str] = None
 
 
@@ -0,0 +1,139 @@
+"""
+Logging Setup
+Non-blocking, structured (JSON) and sampled logging for the API and workers
+
+Callers only enqueue records (QueueHandler); one background listener thread
+renders them (JSON) and does the actual I/O, so a slow stdout/log file never
+stalls a request. The message itself is built in the caller, as the stock
+QueueHandler does - args (ORM objects, mutable lists) must not be read later
+from another thread. Use lazy %-style arguments in hot paths:
+
+    logger.debug("Slots for user %s: %s", user.id, slots)
+
+so the message is only built if the record survives level and sampling.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from src.config import settings
+
+# Attributes every LogRecord has; anything else came in via extra={...}
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line (extra={...} fields are kept as top-level keys)"""
+    
+    def __init__(self, service: str = "api"):
+        super().__init__()
+        self.service = service
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "service": self.service,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO/DEBUG records per logger prefix
+    Warnings and errors always pass.
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix wins ("src.core.services.content_service" over "src.core")
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return rate >= 1.0 or random.random() < rate
+        return True
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"src.core.services.content_service=0.1,src.workers=0.5" -> {prefix: rate}"""
+    rates = {}
+    for part in (spec or "").split(","):
+        name, sep, rate = part.strip().partition("=")
+        if sep and name:
+            rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+    return rates
+
+
+def setup_logging(service: str = "api") -> None:
+    """Route all logging through a queue to one background listener (idempotent)"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter(service))
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _queue_handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(parse_sample_rates(settings.LOG_SAMPLE_RATES)))
+    
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+    
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def _restart_after_fork() -> None:
+    """
+    Threads don't survive fork(): a child of a preloaded parent (gunicorn
+    --preload, Celery prefork) gets a fresh queue and its own listener
+    """
+    global _listener
+    if _listener is None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
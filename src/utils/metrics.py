@@ -0,0 +1,163 @@
+"""
+Prometheus Metrics
+Process-wide metric objects shared by the API and workers
+
+Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py) and
+every worker writes its samples there; /metrics aggregates all of them.
+"""
+from prometheus_client import (
+    REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess, start_http_server
+)
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Response compression (src/api/middleware/compression.py)
+COMPRESSION_BYTES_SAVED = Counter(
+    "http_compression_bytes_saved_total",
+    "Response bytes saved by compression",
+    ["route", "encoding"]
+)
+COMPRESSED_RESPONSES = Counter(
+    "http_compressed_responses_total",
+    "Responses sent compressed",
+    ["route", "encoding"]
+)
+
+# HTTP (src/api/middleware/metrics.py) - route is the path template, never the raw URL
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["route", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being served",
+    multiprocess_mode="livesum"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed while serving one request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL while serving one request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+# Rate limiting (src/api/middleware/rate_limit.py)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests answered 429 (source: redis = bucket empty, local = still inside Retry-After)",
+    ["policy", "source"]
+)
+RATE_LIMIT_BACKEND_ERRORS = Counter(
+    "rate_limit_backend_errors_total",
+    "Rate limit checks that failed open because Redis was unavailable",
+    ["policy"]
+)
+
+# Nightly fetch-daily spike (src/api/v1/content.py)
+FETCH_DAILY_COALESCED = Counter(
+    "fetch_daily_coalesced_total",
+    "fetch-daily requests answered with an identical in-flight request's result"
+)
+FETCH_DAILY_SHED = Counter(
+    "fetch_daily_shed_total",
+    "fetch-daily requests shed while the DB pool was saturated (outcome: pack = last pack served, rejected = 503)",
+    ["outcome"]
+)
+
+# Database (src/database/instrumentation.py)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Single SQL statement execution time",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time waiting for a connection from the pool (includes opening new ones)",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up because the pool was exhausted"
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by state (open = established, checked_out = in use)",
+    ["engine", "state"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Configured pool limits (pool_size, max_overflow) summed over processes",
+    ["engine", "limit"],
+    multiprocess_mode="livesum"
+)
+
+# PDF processor worker
+PDF_PAGES_EXTRACTED = Counter(
+    "pdf_pages_extracted_total",
+    "PDF pages run through text extraction"
+)
+PDF_EXTRACTION_DURATION = Histogram(
+    "pdf_extraction_duration_seconds",
+    "Text extraction time per PDF",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+
+# AI generator worker (rate() of the counters gives pages/sec, items/sec, tokens/sec)
+GROQ_REQUEST_DURATION = Histogram(
+    "groq_request_duration_seconds",
+    "Groq chat completion latency",
+    ["outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+)
+GROQ_TOKENS = Counter(
+    "groq_tokens_total",
+    "Tokens billed by Groq",
+    ["kind"]
+)
+AI_ITEMS_GENERATED = Counter(
+    "ai_items_generated_total",
+    "Facts and questions saved by the AI generator",
+    ["type"]
+)
+AI_CHUNK_DURATION = Histogram(
+    "ai_chunk_duration_seconds",
+    "End-to-end processing time per chunk (excludes the rate-limit sleep)",
+    ["outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+)
+
+
+def render_metrics(extra_collectors=()) -> bytes:
+    """Exposition payload for /metrics (aggregated across gunicorn workers when multiprocess)"""
+    registry = CollectorRegistry()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(REGISTRY)
+    for collector in extra_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
+
+
+def start_metrics_server(port: int, name: str) -> bool:
+    """Expose /metrics for a worker process on its own port (0 disables)"""
+    if not port:
+        return False
+    try:
+        start_http_server(port)
+        logger.info(f"📈 {name} metrics on :{port}/metrics")
+        return True
+    except OSError as e:
+        # Port taken (e.g. a second replica on the same host) - keep working without metrics
+        logger.warning(f"⚠️ {name} metrics server not started on :{port}: {e}")
+        return False
@@ -0,0 +1,26 @@
+"""
+Keyset Pagination Cursors
+Opaque tokens for seek pagination over (timestamp, id) ordered lists
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode the last row's sort key into an opaque URL-safe token"""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a token produced by encode_cursor
+    Raises ValueError for malformed or tampered tokens
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
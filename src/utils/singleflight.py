@@ -0,0 +1,53 @@
+"""
+Single-flight
+Coalesce identical concurrent async calls in this process: the first caller
+for a key runs the work, later callers await its result instead of repeating it
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Per-process map of in-flight calls (key -> shared future)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() unless a call for key is already in flight
+        Returns: (result, shared) - shared is True when another caller's result was reused
+        """
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                return await self._lead(key, fn), False
+            try:
+                # shield: a follower's disconnect must not cancel the leader's work
+                return await asyncio.shield(call), True
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+                # The leader was cancelled (its client went away) - take over
+                continue
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            call.exception()  # Mark retrieved: with no followers asyncio would log it as lost
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
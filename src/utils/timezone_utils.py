@@ -38,3 +38,8 @@ def format_ist(dt: datetime) -> str:
     """Format datetime for display"""
     ist_dt = to_ist(dt)
     return ist_dt.strftime("%d %b %Y, %I:%M %p")
+
+def time_str_to_minute(time_str: str) -> int:
+    """Convert "HH:MM" to minutes since midnight (notification slot key)"""
+    hour, minute = time_str.split(':')
+    return int(hour) * 60 + int(minute)
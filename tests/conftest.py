@@ -0,0 +1,56 @@
+"""
+Shared test fixtures
+No Postgres or Redis needed: an in-memory SQLite engine with the query
+inspector installed, and fakeredis (with Lua) standing in for Redis.
+Nothing here imports src.database.session, so DATABASE_URL can stay unset.
+"""
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.database.query_inspector import inspect_queries, install_query_inspector
+
+
+@pytest.fixture
+def db_engine():
+    """In-memory SQLite engine (one shared connection) with the query inspector"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_query_inspector(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    session = Session(db_engine)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def query_inspector(db_engine):
+    """
+    SQL issued during the test, as a QuerySummary
+    Fails the test on repeated statement shapes (N+1); tighten further with
+    summary.assert_max_queries(n)
+    """
+    with inspect_queries("test", report=False) as summary:
+        yield summary
+    summary.assert_no_repeats()
+
+
+@pytest.fixture
+def redis_queue_stub():
+    """RedisQueue look-alike (decoded .client, bytes .raw_client) on one fake server"""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    return SimpleNamespace(
+        client=fakeredis.FakeRedis(server=server, decode_responses=True),
+        raw_client=fakeredis.FakeRedis(server=server),
+    )
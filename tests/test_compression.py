@@ -0,0 +1,42 @@
+"""
+Accept-Encoding negotiation and Vary merging
+"""
+import pytest
+
+from src.api.middleware import compression
+from src.api.middleware.compression import add_vary, choose_encoding
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("*", "gzip"),
+    ("gzip;q=0, deflate", None),
+    ("identity", None),
+    ("br;q=1.0, gzip;q=0.5", "gzip"),
+    ("GZIP;q=0.8", "gzip"),
+    ("gzip;q=abc", None),
+])
+def test_choose_encoding_without_brotli(gzip_only, header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_prefers_brotli():
+    pytest.importorskip("brotli")
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+
+
+def test_add_vary_keeps_existing_fields():
+    headers = add_vary([(b"content-type", b"application/json"), (b"vary", b"Origin")])
+    assert [v for k, v in headers if k == b"vary"] == [b"Origin, Accept-Encoding"]
+
+
+def test_add_vary_is_idempotent_and_respects_star():
+    assert add_vary([(b"Vary", b"accept-encoding")]) == [(b"Vary", b"accept-encoding")]
+    assert add_vary([(b"vary", b"*")]) == [(b"vary", b"*")]
+    assert add_vary([]) == [(b"vary", b"Accept-Encoding")]
@@ -0,0 +1,24 @@
+"""
+FCM dispatch: multicast splitting and per-token accounting
+"""
+from src.core.services.fcm_service import FCMService
+from src.integrations.fcm_client import FCM_MULTICAST_LIMIT, LocalFCMClient
+
+
+def test_send_batch_splits_into_multicasts():
+    client = LocalFCMClient(latency_ms=0, failure_rate=0)
+    tokens = [f"token-{i}" for i in range(FCM_MULTICAST_LIMIT * 2 + 1)] + ["invalid-1"]
+    result = FCMService(client=client).send_batch(tokens, "title", "body")
+    assert client.calls == 3  # LocalFCMClient rejects multicasts over the limit
+    assert len(result["sent"]) == FCM_MULTICAST_LIMIT * 2 + 1
+    assert result["invalid"] == ["invalid-1"]
+    assert result["retry"] == [] and result["failed"] == []
+
+
+def test_send_batches_counts_every_token():
+    client = LocalFCMClient(latency_ms=0, failure_rate=0)
+    batches = [[f"token-{i}" for i in range(1200)], ["invalid-1", "token-x"]]
+    dead = []
+    stats = FCMService(client=client, concurrency=2).send_batches(batches, "title", "body", on_invalid=dead.extend)
+    assert stats == {"batches": 2, "sent": 1201, "invalid": 1, "failed": 0}
+    assert dead == ["invalid-1"]
@@ -0,0 +1,20 @@
+"""
+Keyset cursor codec
+"""
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from src.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    stamp = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    cursor = encode_cursor(stamp, 42)
+    assert "=" not in cursor  # URL-safe, unpadded
+    assert decode_cursor(cursor) == (stamp, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "bm9waXBl", encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
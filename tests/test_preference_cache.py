@@ -0,0 +1,24 @@
+"""
+Preference snapshot cache: per-user version guard (Lua under fakeredis)
+"""
+import pytest
+
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+from src.integrations.preference_cache import PreferenceCache
+
+
+def test_preference_snapshot_not_stored_after_a_bump(redis_queue_stub):
+    cache = PreferenceCache(redis_queue_stub)
+    snapshot, version = cache.lookup(9)
+    assert snapshot is None and version == 0
+
+    # A writer bumps the version while the snapshot was being read
+    assert cache.bump(9) == 1
+    assert cache.store(9, {"version": version, "exam_types": ["UPSC"]}) is False
+    assert cache.lookup(9) == (None, 1)
+
+    assert cache.store(9, {"version": 1, "exam_types": ["SSC"]}) is True
+    assert cache.lookup(9) == ({"version": 1, "exam_types": ["SSC"]}, 1)
+    cache.bump(9)
+    assert cache.lookup(9) == (None, 2)
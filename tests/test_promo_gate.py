@@ -0,0 +1,21 @@
+"""
+Promo redemption gate (Lua under fakeredis)
+"""
+import pytest
+
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+from src.integrations.promo_gate import PromoGate
+
+
+def test_promo_gate_reserves_until_used_up(redis_queue_stub):
+    gate = PromoGate(redis_queue_stub)
+    assert [gate.reserve("launch", 2) for _ in range(3)] == [True, True, False]
+    gate.release("launch")
+    assert gate.reserve("LAUNCH", 2) is True  # Codes are case-insensitive
+
+
+def test_promo_gate_release_after_expiry_does_not_recreate(redis_queue_stub):
+    gate = PromoGate(redis_queue_stub)
+    gate.release("gone")
+    assert redis_queue_stub.client.exists("promo_remaining:GONE") == 0
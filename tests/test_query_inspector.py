@@ -0,0 +1,62 @@
+"""
+Query budget tests: statement counts that must not grow with input size
+"""
+import pytest
+from sqlalchemy import text
+
+from src.core.repositories.delivery_log_repository import DeliveryLogRepository
+from src.database.query_inspector import inspect_queries, statement_shape
+
+# SQLite stand-in for the partitioned Postgres table (same columns)
+DELIVERY_LOGS_DDL = """
+    CREATE TABLE delivery_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        delivered_at TIMESTAMP NOT NULL,
+        platform VARCHAR(20) NOT NULL,
+        delivery_status VARCHAR(20) NOT NULL,
+        fcm_message_id VARCHAR(255),
+        error_message TEXT,
+        retry_count INTEGER NOT NULL,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP
+    )
+"""
+
+
+@pytest.fixture
+def delivery_logs(db):
+    db.execute(text(DELIVERY_LOGS_DDL))
+    db.commit()
+    return db
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT 1 WHERE id IN (?, ?, ?)") == statement_shape("SELECT 1 WHERE id IN (?)")
+    assert statement_shape("SELECT  a\n FROM t WHERE x IN (%(x_1)s, %(x_2)s)") == "SELECT a FROM t WHERE x IN (...)"
+
+
+def test_inspector_flags_repeated_shapes(db):
+    with inspect_queries("loop", repeat_threshold=3, report=False) as summary:
+        for i in range(3):
+            db.execute(text("SELECT :i"), {"i": i})
+    assert summary.count == 3
+    with pytest.raises(AssertionError, match="N\\+1"):
+        summary.assert_no_repeats()
+
+
+@pytest.mark.parametrize("n", [1, 50])
+def test_mark_as_delivered_is_constant_queries(delivery_logs, query_inspector, n):
+    ok = DeliveryLogRepository().mark_as_delivered(user_id=1, question_ids=list(range(n)), db=delivery_logs)
+    assert ok
+    # One lookup of already-delivered ids + one multi-row INSERT, whatever n is
+    query_inspector.assert_max_queries(2)
+
+
+def test_mark_as_delivered_skips_already_delivered(delivery_logs, query_inspector):
+    repo = DeliveryLogRepository()
+    assert repo.mark_as_delivered(user_id=1, question_ids=[1, 2], db=delivery_logs)
+    assert repo.mark_as_delivered(user_id=1, question_ids=[2, 3, 3], db=delivery_logs)
+    rows = delivery_logs.execute(text("SELECT question_id FROM delivery_logs ORDER BY question_id")).scalars().all()
+    assert rows == [1, 2, 3]
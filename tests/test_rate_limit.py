@@ -0,0 +1,27 @@
+"""
+Token bucket rate limiter (Lua under fakeredis)
+"""
+import asyncio
+import pytest
+
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+from src.api.middleware import rate_limit
+from src.api.middleware.rate_limit import Policy, RateLimiter
+
+
+def test_token_bucket_allows_burst_then_rejects(monkeypatch):
+    from fakeredis import aioredis
+    monkeypatch.setattr(rate_limit.aioredis, "from_url", lambda *a, **k: aioredis.FakeRedis(decode_responses=True))
+    policy = Policy("user_api", capacity=3, per_seconds=60)
+
+    async def main():
+        limiter = RateLimiter()
+        return [await limiter.take("rate_limit:user_api:abc", policy) for _ in range(4)]
+
+    decisions = asyncio.run(main())
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+    # One token refills every 20 s
+    assert 0 < decisions[3].retry_after <= 20
+    assert decisions[3].reset == pytest.approx(60, abs=1)
@@ -0,0 +1,23 @@
+"""
+Queue wire format: plain JSON for small jobs, zlib-compressed JSON for large ones
+"""
+import zlib
+
+from src.config import settings
+from src.integrations.redis_queue import RedisQueue
+
+
+def test_small_jobs_stay_plain_json():
+    job = {"job_id": 1, "text": "short"}
+    raw = RedisQueue.encode(job)
+    assert raw.startswith(b"{")
+    assert RedisQueue.decode(raw) == job
+    assert RedisQueue.decode(raw.decode()) == job
+
+
+def test_large_jobs_are_compressed():
+    job = {"job_id": 1, "text": "परीक्षा " * settings.QUEUE_COMPRESS_MIN_BYTES}
+    raw = RedisQueue.encode(job)
+    assert not raw.startswith(b"{")
+    assert len(raw) < len(zlib.decompress(raw))
+    assert RedisQueue.decode(raw) == job
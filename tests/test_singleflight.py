@@ -0,0 +1,76 @@
+"""
+In-process request coalescing
+"""
+import asyncio
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flights, runs = SingleFlight(), []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return {"items": [1, 2]}
+
+    async def main():
+        return await asyncio.gather(*(flights.do("user-1", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(runs) == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result is results[0][0] for result, _ in results)
+    assert len(flights) == 0
+
+
+def test_different_keys_run_separately():
+    flights, runs = SingleFlight(), []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(flights.do("a", work), flights.do("b", work))
+
+    asyncio.run(main())
+    assert len(runs) == 2
+
+
+def test_leader_exception_reaches_followers():
+    flights = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("db down")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("k", boom) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flights) == 0
+
+
+def test_follower_takes_over_when_leader_is_cancelled():
+    flights, runs = SingleFlight(), []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return 7
+
+    async def main():
+        leader = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == (7, False)
+    assert len(runs) == 2
@@ -0,0 +1,35 @@
+"""
+Subscription expiry timers (Lua pop under fakeredis)
+"""
+from datetime import datetime, timedelta, timezone
+import pytest
+
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+from src.integrations.subscription_timers import SubscriptionTimers
+
+
+def test_pop_due_takes_only_past_timers(redis_queue_stub):
+    timers = SubscriptionTimers(redis_queue_stub)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    timers.schedule_many({1: now - timedelta(seconds=1), 2: now + timedelta(minutes=1)})
+    assert timers.pop_due(now, limit=10) == [1]
+    assert timers.pop_due(now, limit=10) == []
+    assert timers.size() == 1
+
+
+def test_pop_due_excludes_timers_due_exactly_now(redis_queue_stub):
+    timers = SubscriptionTimers(redis_queue_stub)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    timers.schedule_many({1: now - timedelta(seconds=1), 2: now, 3: now + timedelta(minutes=1)})
+    assert timers.pop_due(now, limit=10) == [1]
+    assert timers.pop_due(now + timedelta(seconds=1), limit=10) == [2]
+    assert timers.size() == 1
+
+
+def test_pop_due_respects_limit(redis_queue_stub):
+    timers = SubscriptionTimers(redis_queue_stub)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    timers.schedule_many({user_id: now - timedelta(minutes=user_id) for user_id in range(1, 6)})
+    assert len(timers.pop_due(now, limit=2)) == 2
+    assert timers.size() == 3
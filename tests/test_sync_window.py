@@ -0,0 +1,44 @@
+"""
+Per-user nightly fetch-daily window
+"""
+from datetime import timedelta
+import pytest
+
+from src.config import settings
+from src.core.services.content_service import ContentService
+from src.utils.timezone_utils import now_ist
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_SYNC_WINDOW_START", "21:00")
+    monkeypatch.setattr(settings, "FETCH_SYNC_SPREAD_MINUTES", 150)
+    noon = now_ist().replace(hour=12, minute=0, second=0, microsecond=0)
+    start = noon.replace(hour=21)
+    return noon, start, start + timedelta(minutes=150)
+
+
+def test_window_is_stable_and_inside_the_spread(window):
+    noon, start, end = window
+    for user_id in range(1, 200):
+        after, before = ContentService.sync_window(user_id, noon)
+        assert (after, before) == ContentService.sync_window(user_id, noon)
+        assert start <= after < end
+        assert before == end
+
+
+def test_users_are_spread_across_the_window(window):
+    noon, start, _ = window
+    buckets = {
+        (ContentService.sync_window(user_id, noon)[0] - start) // timedelta(minutes=15)
+        for user_id in range(1, 1000)
+    }
+    assert buckets == set(range(10))
+
+
+def test_rolls_to_tomorrow_once_the_slot_has_passed(window):
+    noon, _, _ = window
+    after, before = ContentService.sync_window(7, noon)
+    next_after, next_before = ContentService.sync_window(7, after)
+    assert next_after == after + timedelta(days=1)
+    assert next_before == before + timedelta(days=1)
@@ -9,27 +9,42 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 backend_dir = Path(__file__).parent.parent
 load_dotenv(backend_dir / '.env')
+os.environ.setdefault("PROCESS_ROLE", "ai_worker")  # Pool profile (read when settings load)
 # ✅ IMPORT MODELS FIRST!
 import src.models
 
 from src.integrations.redis_queue import redis_queue
+from src.integrations.job_scheduler import job_scheduler
 from src.integrations.groq_client import groq_client
+from src.integrations.job_progress import job_progress
+from src.integrations.job_events import publish_job_event
 from src.database.session import SessionLocal
 from src.models.question import Question
 from src.core.repositories.pdf_job_repository import PDFJobRepository
 from src.config import settings
+from src.constants import JobStatus
+from src.utils.metrics import AI_CHUNK_DURATION, AI_ITEMS_GENERATED, start_metrics_server
+from workers.base_worker import BaseWorker
 from datetime import datetime
+from src.utils.logger import setup_logging
 import logging
 import time
 
-logging.basicConfig(level="INFO")
+setup_logging("ai_generator")
 logger = logging.getLogger(__name__)
 
+# Plain FIFO queue from before fair-share scheduling (old PDF workers during a deploy)
+LEGACY_QUEUE = "ai_processing_queue"
+LEGACY_QUEUE_POLL_EVERY = 10    # Loop turns between legacy checks while the scheduler is busy
 
-class AIGenerator:
+
+class AIGenerator(BaseWorker):
     """Generate rich Hinglish content using Groq"""
     
+    name = "AI generator"
+    
     def __init__(self):
+        super().__init__()
         # Smart delay based on mode
         if settings.PROCESSING_MODE == "slow":
             self.delay = settings.CHUNK_DELAY_SECONDS
@@ -51,11 +66,16 @@ class AIGenerator:
         eta_mins = (remaining * self.delay) / 60
         logger.info(f"⏱️  ETA for this job: {eta_mins:.1f} minutes")
         
+        started = time.perf_counter()
         db = SessionLocal()
+        facts_count = 0
+        questions_count = 0
+        tokens_used = 0
+        chunk_failed = False
         
         try:
             # Generate content with Groq
-            items = groq_client.generate_content(
+            items, tokens_used = groq_client.generate_content_with_usage(
                 text_chunk=job_data['text'],
                 exam_types=job_data['exam_types'],
                 date_from=job_data['date_from'],
@@ -67,9 +87,6 @@ class AIGenerator:
                 return
             
             # Save to database with NEW FIELDS
-            facts_count = 0
-            questions_count = 0
-            
             for item in items:
                 # Validate item structure
                 if not item.get('text') or not item.get('type'):
@@ -100,23 +117,58 @@ class AIGenerator:
             
             db.commit()
             logger.info(f"✅ Saved {facts_count} facts + {questions_count} questions")
-            
-            # Smart delay
-            logger.info(f"😴 Sleeping {self.delay}s to respect rate limits...")
-            time.sleep(self.delay)
+            AI_ITEMS_GENERATED.labels("fact").inc(facts_count)
+            AI_ITEMS_GENERATED.labels("question").inc(questions_count)
             
         except Exception as e:
             logger.error(f"❌ Chunk processing failed: {e}")
             db.rollback()
+            facts_count = questions_count = 0
+            chunk_failed = True
+            return
         finally:
+            # Every chunk counts towards completion, even empty or failed ones
+            AI_CHUNK_DURATION.labels("failed" if chunk_failed else "ok").observe(time.perf_counter() - started)
+            self.track_progress(job_id, facts_count, questions_count, tokens_used, chunk_failed, db)
             db.close()
+        
+        # Smart delay
+        logger.info(f"😴 Sleeping {self.delay}s to respect rate limits...")
+        self.sleep(self.delay)
+    
+    def track_progress(self, job_id: int, facts: int, questions: int, tokens: int, failed: bool, db):
+        """Update job counters; the worker finishing the last chunk completes the job"""
+        progress = job_progress.record_chunk(job_id, facts, questions, tokens, failed)
+        if not progress:
+            return
+        
+        snapshot = job_progress.get(job_id) or {}
+        publish_job_event(job_id, "chunk_done", snapshot)
+        if not progress['is_last']:
+            return
+        
+        stats = {
+            "facts": snapshot.get("facts", 0),
+            "questions": snapshot.get("questions", 0),
+            "tokens": snapshot.get("tokens", 0),
+            "chunks": progress['total_chunks'],
+            "failed_chunks": snapshot.get("chunks_failed", 0)
+        }
+        try:
+            PDFJobRepository(db).mark_completed(job_id, stats)
+            job_progress.finish(job_id, JobStatus.COMPLETED.value)
+            publish_job_event(job_id, "completed", job_progress.get(job_id) or stats)
+        except Exception as e:
+            logger.error(f"❌ Failed to complete Job {job_id}: {e}")
+            db.rollback()
     
     def run(self):
         """Main worker loop"""
         logger.info("🚀 AI Generator Worker started")
-        logger.info("👂 Listening to: ai_processing_queue")
+        logger.info("👂 Listening to: ai_processing_queue (weighted round-robin across jobs)")
         logger.info(f"⚙️  Mode: {settings.PROCESSING_MODE.upper()}")
         logger.info(f"⏱️  Delay: {self.delay}s per chunk")
+        start_metrics_server(settings.METRICS_PORT_AI_WORKER, "AI generator")
         
         if settings.PROCESSING_MODE == "slow":
             logger.info("📋 Production mode - safe & stable!")
@@ -124,19 +176,30 @@ class AIGenerator:
             logger.info("   ✅ Monthly PDFs processed overnight")
             logger.info("   ✅ Free Groq tier stays safe")
         
-        while True:
+        self.install_signal_handlers()
+        
+        turn = 0
+        while not self.should_stop:
             try:
-                job = redis_queue.pop("ai_processing_queue", timeout=5)
+                self.heartbeat()
+                turn += 1
+                job = None
+                # Every Nth turn the legacy queue goes first, so a scheduler that
+                # always has work can't starve it (LLEN first: no 1 s wait when empty)
+                if turn % LEGACY_QUEUE_POLL_EVERY == 0 and redis_queue.length(LEGACY_QUEUE):
+                    job = redis_queue.pop(LEGACY_QUEUE, timeout=1)
+                if not job:
+                    job = job_scheduler.pop()
+                if not job:
+                    # Scheduler idle: wait on the legacy queue
+                    job = redis_queue.pop(LEGACY_QUEUE, timeout=1)
                 if job:
                     self.process_chunk(job)
-                else:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logger.info("🛑 Worker stopped")
-                break
             except Exception as e:
                 logger.error(f"❌ Worker error: {e}")
-                time.sleep(5)
+                self.sleep(5)
+        
+        logger.info("🛑 Worker stopped")
 
 
 if __name__ == "__main__":
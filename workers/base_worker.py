@@ -0,0 +1,76 @@
+"""
+Base Worker
+Graceful shutdown and liveness heartbeat for the long-running queue workers
+
+SIGTERM/SIGINT only set a flag: the current job/chunk is finished, then
+run() returns. While alive, the worker touches WORKER_HEARTBEAT_FILE (set by
+the supervisor) so a hung worker can be detected and replaced.
+"""
+import logging
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL_SECONDS = 5
+
+
+class BaseWorker:
+    """Stop flag, interruptible sleep and heartbeat shared by all workers"""
+    
+    name = "worker"
+    
+    def __init__(self):
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+        heartbeat_file = os.environ.get("WORKER_HEARTBEAT_FILE")
+        self.heartbeat_file: Optional[Path] = Path(heartbeat_file) if heartbeat_file else None
+    
+    @property
+    def should_stop(self) -> bool:
+        return self._stop.is_set()
+    
+    def install_signal_handlers(self) -> None:
+        """Finish the current unit of work on SIGTERM/SIGINT, then exit"""
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+    
+    def _handle_signal(self, signum, frame) -> None:
+        if not self._stop.is_set():
+            logger.info(f"🛑 {self.name}: {signal.Signals(signum).name} received, finishing current work")
+        self._stop.set()
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    def heartbeat(self, force: bool = False) -> None:
+        """Touch the heartbeat file (at most every HEARTBEAT_INTERVAL_SECONDS)"""
+        if self.heartbeat_file is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_beat < HEARTBEAT_INTERVAL_SECONDS:
+            return
+        self._last_beat = now
+        try:
+            self.heartbeat_file.parent.mkdir(parents=True, exist_ok=True)
+            self.heartbeat_file.touch()
+        except OSError as e:
+            logger.warning(f"⚠️ {self.name}: heartbeat write failed: {e}")
+    
+    def sleep(self, seconds: float) -> bool:
+        """
+        Sleep without going silent: keeps beating and wakes up on shutdown
+        Returns False if interrupted by a stop request
+        """
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            self.heartbeat()
+            self._stop.wait(min(remaining, HEARTBEAT_INTERVAL_SECONDS))
+        return False
@@ -1,10 +1,14 @@
 """
 Celery Background Tasks
 """
+import os
+os.environ.setdefault("PROCESS_ROLE", "celery")  # Pool profile (read when settings load)
+
 from src.config import settings
 from celery import Celery
 from celery.schedules import crontab
-from src.database.session import SessionLocal
+from celery.signals import worker_process_init
+from src.database.session import SessionLocal, engine, replica_engine
 
 # Import ALL models from the package (this ensures SQLAlchemy mapper initialization)
 from src.models import (
@@ -16,6 +20,9 @@ from src.models import (
     DeliveryLog
 )
 
+from src.core.repositories.user_repository import UserRepository
+from src.integrations.subscription_timers import subscription_timers
+from src.utils.timezone_utils import now_ist
 from datetime import datetime
 import sys
 import logging
@@ -32,38 +39,79 @@ print(f"✅ Using Redis broker: {settings.REDIS_URL[:30]}...")
 celery = Celery('current_affairs', broker=settings.REDIS_URL, backend=settings.REDIS_URL)
 
 
+@worker_process_init.connect
+def reset_db_pools(**kwargs):
+    """Prefork children must not share pooled connections inherited from the parent"""
+    engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.dispose(close=False)
+
+
+@celery.task
+def expire_due_subscriptions():
+    """Run every minute - Expire users whose Redis expiry timer is due"""
+    db = SessionLocal()
+    try:
+        repo = UserRepository(db)
+        now = now_ist()
+        batch_size = settings.SUBSCRIPTION_EXPIRY_BATCH_SIZE
+        total = 0
+        
+        while True:
+            user_ids = subscription_timers.pop_due(now, batch_size)
+            if not user_ids:
+                break
+            try:
+                # Wait for row locks here: a popped timer is not seen again
+                expired = repo.expire_subscriptions_batch(now, len(user_ids), user_ids, skip_locked=False)
+            except Exception:
+                db.rollback()
+                # Put the timers back so the next run retries them
+                subscription_timers.schedule_many({user_id: now for user_id in user_ids})
+                raise
+            total += len(expired)
+            if len(user_ids) < batch_size:
+                break
+        
+        if total:
+            logger.info(f"Expired {total} subscriptions from timers")
+        return f"Expired {total} subscriptions"
+    except Exception as e:
+        logger.error(f"Error expiring due subscriptions: {e}")
+        raise
+    finally:
+        db.close()
+
+
 @celery.task
 def expire_subscriptions():
-    """Run daily at 00:00 IST - Downgrade expired trials/premiums to FREE"""
+    """
+    Run daily at 00:00 IST - Reconcile subscription expiry
+    Expires anything the minute timers missed, then re-seeds the Redis timers
+    """
     db = SessionLocal()
     try:
-        # Find expired subscriptions
-        now = datetime.now()
-        expired = db.query(User).filter(
-            User.subscription_status.in_([SubscriptionStatus.TRIAL.value, SubscriptionStatus.PREMIUM.value]),
-            User.subscription_expires_at < now
-        ).all()
+        repo = UserRepository(db)
+        now = now_ist()
+        batch_size = settings.SUBSCRIPTION_EXPIRY_BATCH_SIZE
+        total = 0
         
-        for user in expired:
-            old_status = user.subscription_status
-            
-            # Downgrade to FREE
-            user.subscription_status = SubscriptionStatus.FREE.value  # type: ignore
-            user.subscription_expires_at = None  # type: ignore
-            
-            # Log expiration
-            history = SubscriptionHistory(
-                user_id=user.id,
-                action="subscription_expired",
-                notes=f"Auto-downgraded from {old_status} to FREE",
-                granted_by="system"
-            )
-            db.add(history)
-            logger.info(f"Expired subscription for user {user.email}")
+        # Each batch is one UPDATE ... RETURNING + one history INSERT, committed on its own
+        while True:
+            expired = repo.expire_subscriptions_batch(now, batch_size)
+            total += len(expired)
+            if len(expired) < batch_size:
+                break
         
-        db.commit()
-        logger.info(f"Expired {len(expired)} subscriptions")
-        return f"Expired {len(expired)} subscriptions"
+        # Re-seed timers (covers Redis flushes and writes that missed Redis)
+        seeded = 0
+        for batch in repo.iter_subscription_expiries(batch_size):
+            seeded += subscription_timers.schedule_many(dict(batch))
+        
+        if total:
+            logger.warning(f"Reconciliation expired {total} subscriptions missed by timers")
+        logger.info(f"Expired {total} subscriptions, re-seeded {seeded} expiry timers")
+        return f"Expired {total} subscriptions"
     except Exception as e:
         logger.error(f"Error expiring subscriptions: {e}")
         db.rollback()
@@ -72,8 +120,61 @@ def expire_subscriptions():
         db.close()
 
 
-# Schedule task - runs daily at midnight IST
+@celery.task
+def dispatch_notifications():
+    """Run every minute - Push to all users whose notification time is this HH:MM (IST)"""
+    from src.core.services.notification_service import NotificationService
+    
+    time_str = now_ist().strftime("%H:%M")
+    db = SessionLocal()
+    try:
+        stats = NotificationService(db).dispatch_slot(time_str)
+        return f"Slot {time_str}: {stats['sent']} notifications sent"
+    except Exception as e:
+        logger.error(f"Error dispatching notifications for {time_str}: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery.task
+def maintain_delivery_logs():
+    """Run daily at 02:30 IST - Create upcoming delivery_logs partitions, archive expired ones"""
+    from src.core.services.delivery_archive_service import DeliveryArchiveService
+    
+    db = SessionLocal()
+    try:
+        result = DeliveryArchiveService(db).run()
+        archived = [a["partition"] for a in result["archived"]]
+        logger.info(f"Delivery log partitions created: {result['created']}, archived: {archived}")
+        return f"Created {len(result['created'])} partitions, archived {len(archived)}"
+    except Exception as e:
+        logger.error(f"Error maintaining delivery log partitions: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 celery.conf.beat_schedule = {
+    # Push notifications for the current HH:MM slot
+    'dispatch-notifications': {
+        'task': 'workers.celery_tasks.dispatch_notifications',
+        'schedule': crontab(minute='*'),  # Every minute
+        'options': {'expires': 55},  # Stale slot runs are dropped, not sent late
+    },
+    # Event-driven expiry from the Redis timer set
+    'expire-due-subscriptions': {
+        'task': 'workers.celery_tasks.expire_due_subscriptions',
+        'schedule': crontab(minute='*'),  # Every minute
+    },
+    # Partition maintenance + archival of old delivery logs
+    'maintain-delivery-logs': {
+        'task': 'workers.celery_tasks.maintain_delivery_logs',
+        'schedule': crontab(hour='2', minute='30'),  # Daily 02:30, off-peak
+    },
+    # Reconciliation sweep - runs daily at midnight IST
     'expire-subscriptions': {
         'task': 'workers.celery_tasks.expire_subscriptions',
         'schedule': crontab(hour='0', minute='0'),  # Daily midnight
@@ -10,12 +10,20 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 backend_dir = Path(__file__).parent.parent
 load_dotenv(backend_dir / '.env')
+os.environ.setdefault("PROCESS_ROLE", "pdf_worker")  # Pool profile (read when settings load)
 import fitz  
 import tempfile
 from src.integrations.redis_queue import redis_queue
+from src.integrations.job_scheduler import job_scheduler
+from src.integrations.job_progress import job_progress
+from src.integrations.job_events import publish_job_event
 from src.integrations.r2_storage import r2_storage
 from src.database.session import SessionLocal
 from src.core.repositories.pdf_job_repository import PDFJobRepository
+from src.config import settings
+from workers.base_worker import BaseWorker
+from src.utils.metrics import PDF_EXTRACTION_DURATION, PDF_PAGES_EXTRACTED, start_metrics_server
+from src.utils.logger import setup_logging
 import logging
 import time
 import re
@@ -27,21 +35,28 @@ from src.models.delivery_log import DeliveryLog
 from src.models.pdf_job import PDFJob
 from src.models.question import Question
 
-logging.basicConfig(level="INFO")
+setup_logging("pdf_processor")
 logger = logging.getLogger(__name__)
 
-class PDFProcessor:
+class PDFProcessor(BaseWorker):
     """Extract and chunk PDF text"""
     
+    name = "PDF processor"
+    
     def extract_text(self, pdf_path: str) -> str:
         """Extract all text from PDF"""
         try:
+            started = time.perf_counter()
             doc = fitz.open(pdf_path)
             text = ""
             for page in doc:
                 text += page.get_text()
+            pages = doc.page_count
             doc.close()
-            logger.info(f"✅ Extracted {len(text)} characters from PDF")
+            elapsed = time.perf_counter() - started
+            PDF_PAGES_EXTRACTED.inc(pages)
+            PDF_EXTRACTION_DURATION.observe(elapsed)
+            logger.info(f"✅ Extracted {len(text)} characters from {pages} pages ({pages / max(elapsed, 1e-6):.1f} pages/s)")
             return text
         except Exception as e:
             logger.error(f"❌ PDF extraction failed: {e}")
@@ -86,7 +101,9 @@ class PDFProcessor:
         # Update status to processing
         db = SessionLocal()
         repo = PDFJobRepository(db)
-        repo.mark_processing(job_id)
+        job = repo.mark_processing(job_id)
+        priority = job.priority if job else job_data.get('priority')
+        publish_job_event(job_id, "processing", {"filename": job_data.get('filename')})
         
         try:
             # Download PDF from R2
@@ -100,6 +117,7 @@ class PDFProcessor:
             
             if not full_text:
                 raise Exception("No text extracted from PDF")
+            publish_job_event(job_id, "extracted", {"characters": len(full_text)})
             
             # Chunk into topics
             chunks = self.chunk_by_topics(full_text)
@@ -110,9 +128,9 @@ class PDFProcessor:
                 chunks = [full_text[i:i+chunk_size] for i in range(0, len(full_text), chunk_size)]
                 logger.info(f"✅ Created {len(chunks)} size-based chunks")
             
-            # Push each chunk to AI processing queue
-            for idx, chunk in enumerate(chunks):
-                ai_job = {
+            # Push all chunks to this job's AI sub-queue in one round-trip
+            ai_jobs = [
+                {
                     "job_id": job_id,
                     "chunk_index": idx,
                     "total_chunks": len(chunks),
@@ -121,9 +139,22 @@ class PDFProcessor:
                     "date_from": job_data['date_from'],
                     "date_to": job_data['date_to']
                 }
-                redis_queue.push("ai_processing_queue", ai_job)
-            
+                for idx, chunk in enumerate(chunks)
+            ]
+            # Open progress counters before the first chunk can be picked up
+            job_progress.start(job_id, len(ai_jobs), {
+                "filename": job.filename if job else job_data.get('filename'),
+                "exam_types": job_data['exam_types'],
+                "date_from": job_data['date_from'],
+                "date_to": job_data['date_to'],
+                "created_at": job.created_at if job else None,
+                "priority": priority
+            })
+            if job_scheduler.enqueue_job(job_id, ai_jobs, priority) != len(ai_jobs):
+                raise Exception("Failed to queue chunks for AI processing")
+
             logger.info(f"✅ Job {job_id}: Queued {len(chunks)} chunks for AI processing")
+            publish_job_event(job_id, "queued", {"total_chunks": len(chunks), "priority": priority})
             
             # Clean up
             os.unlink(tmp_path)
@@ -131,6 +162,8 @@ class PDFProcessor:
         except Exception as e:
             logger.error(f"❌ Job {job_id} failed: {e}")
             repo.update_status(job_id, "failed", str(e))
+            job_progress.finish(job_id, "failed", str(e))
+            publish_job_event(job_id, "failed", {"error_message": str(e)})
         finally:
             db.close()
     
@@ -138,20 +171,22 @@ class PDFProcessor:
         """Main worker loop"""
         logger.info("🚀 PDF Processor Worker started")
         logger.info("👂 Listening to: pdf_processing_queue")
+        start_metrics_server(settings.METRICS_PORT_PDF_WORKER, "PDF processor")
+        self.install_signal_handlers()
         
-        while True:
+        while not self.should_stop:
             try:
+                self.heartbeat()
                 job = redis_queue.pop("pdf_processing_queue", timeout=5)
                 if job:
                     self.process_job(job)
                 else:
-                    time.sleep(1)  # No jobs, wait a bit
-            except KeyboardInterrupt:
-                logger.info("🛑 Worker stopped")
-                break
+                    self.sleep(1)  # No jobs, wait a bit
             except Exception as e:
                 logger.error(f"❌ Worker error: {e}")
-                time.sleep(5)
+                self.sleep(5)
+        
+        logger.info("🛑 Worker stopped")
 
 if __name__ == "__main__":
     processor = PDFProcessor()
@@ -0,0 +1,240 @@
+"""
+Process Supervisor
+Container entry point: API (gunicorn + uvicorn workers), Celery worker,
+Celery beat and N PDF processors / AI generators as separate processes
+
+- A child that exits is restarted with exponential backoff
+- Queue workers that stop heart-beating and an API that stops answering
+  are terminated and replaced
+- SIGTERM/SIGINT: SIGTERM to every child (each finishes its current
+  request/task/chunk), SIGKILL whatever is left after the grace period
+
+Run: python -m workers.supervisor
+"""
+import sys
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+backend_dir = Path(__file__).parent.parent
+load_dotenv(backend_dir / '.env')
+
+from src.config import settings
+from src.utils.logger import setup_logging
+from dataclasses import dataclass, field
+import logging
+import signal
+import subprocess
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+setup_logging("supervisor")
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 1
+HEALTHCHECK_INTERVAL_SECONDS = 10
+STARTUP_GRACE_SECONDS = 60      # No health checks while a process boots
+MAX_FAILED_CHECKS = 3
+MAX_BACKOFF_SECONDS = 60
+STABLE_AFTER_SECONDS = 120      # Running this long resets the restart backoff
+METRICS_PORT_STRIDE = 100       # Instance i of a worker type gets base port + i * stride
+
+
+@dataclass
+class ProcessSpec:
+    name: str
+    cmd: List[str]
+    env: Dict[str, str] = field(default_factory=dict)
+    heartbeat_file: Optional[Path] = None
+    http_check: Optional[str] = None
+
+
+class ManagedProcess:
+    """One supervised child with its restart and health-check state"""
+    
+    def __init__(self, spec: ProcessSpec):
+        self.spec = spec
+        self.proc: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.next_start = 0.0
+        self.term_sent_at: Optional[float] = None
+        self.failed_checks = 0
+        self.last_check = 0.0
+    
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+    
+    def start(self) -> None:
+        if self.spec.heartbeat_file:
+            self.spec.heartbeat_file.unlink(missing_ok=True)
+        env = {**os.environ, **self.spec.env}
+        # Own process group, so a SIGKILL also reaches its children (gunicorn/celery workers)
+        self.proc = subprocess.Popen(self.spec.cmd, cwd=backend_dir, env=env, start_new_session=True)
+        self.started_at = time.monotonic()
+        self.term_sent_at = None
+        self.failed_checks = 0
+        logger.info(f"▶️ {self.spec.name} started (PID {self.proc.pid})")
+    
+    def terminate(self) -> None:
+        if self.alive and self.term_sent_at is None:
+            self.proc.send_signal(signal.SIGTERM)
+            self.term_sent_at = time.monotonic()
+    
+    def kill(self) -> None:
+        if self.alive:
+            logger.warning(f"💀 {self.spec.name} did not stop in time, killing (PID {self.proc.pid})")
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    
+    def healthy(self) -> bool:
+        """Heartbeat freshness or HTTP liveness; True while still booting"""
+        now = time.monotonic()
+        if now - self.started_at < STARTUP_GRACE_SECONDS:
+            return True
+        if self.spec.heartbeat_file is not None:
+            try:
+                age = time.time() - self.spec.heartbeat_file.stat().st_mtime
+            except FileNotFoundError:
+                age = now - self.started_at
+            if age > settings.WORKER_HEARTBEAT_TIMEOUT:
+                logger.error(f"❌ {self.spec.name}: no heartbeat for {age:.0f}s")
+                return False
+        if self.spec.http_check is not None:
+            try:
+                with urllib.request.urlopen(self.spec.http_check, timeout=5) as response:
+                    ok = response.status < 500
+            except Exception as e:
+                logger.warning(f"⚠️ {self.spec.name}: liveness check failed: {e}")
+                ok = False
+            self.failed_checks = 0 if ok else self.failed_checks + 1
+            if self.failed_checks >= MAX_FAILED_CHECKS:
+                logger.error(f"❌ {self.spec.name}: {self.failed_checks} failed liveness checks")
+                return False
+        return True
+
+
+class Supervisor:
+    """Start, watch and restart a set of child processes"""
+    
+    def __init__(self, specs: List[ProcessSpec]):
+        self.processes = [ManagedProcess(spec) for spec in specs]
+        self.stopping = False
+    
+    def _handle_signal(self, signum, frame) -> None:
+        logger.info(f"🛑 {signal.Signals(signum).name} received, shutting down")
+        self.stopping = True
+    
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        for managed in self.processes:
+            managed.start()
+        
+        while not self.stopping:
+            now = time.monotonic()
+            for managed in self.processes:
+                self._tend(managed, now)
+            time.sleep(POLL_SECONDS)
+        
+        self.shutdown()
+    
+    def _tend(self, managed: ManagedProcess, now: float) -> None:
+        """Restart exited children, replace unhealthy ones"""
+        if managed.proc is None:
+            if now >= managed.next_start:
+                managed.start()
+            return
+        
+        if not managed.alive:
+            code = managed.proc.returncode
+            if now - managed.started_at > STABLE_AFTER_SECONDS:
+                managed.restarts = 0
+            delay = min(MAX_BACKOFF_SECONDS, 2 ** managed.restarts)
+            managed.restarts += 1
+            managed.next_start = now + delay
+            managed.proc = None
+            logger.error(f"❌ {managed.spec.name} exited with code {code}, restarting in {delay}s")
+            return
+        
+        if managed.term_sent_at is not None:
+            if now - managed.term_sent_at > settings.SUPERVISOR_GRACEFUL_TIMEOUT:
+                managed.kill()
+            return
+        
+        if now - managed.last_check >= HEALTHCHECK_INTERVAL_SECONDS:
+            managed.last_check = now
+            if not managed.healthy():
+                logger.error(f"🔁 Replacing unhealthy {managed.spec.name}")
+                managed.terminate()
+    
+    def shutdown(self) -> None:
+        """Graceful stop of every child, then SIGKILL stragglers"""
+        for managed in self.processes:
+            managed.terminate()
+        deadline = time.monotonic() + settings.SUPERVISOR_GRACEFUL_TIMEOUT
+        while time.monotonic() < deadline and any(m.alive for m in self.processes):
+            time.sleep(0.2)
+        for managed in self.processes:
+            managed.kill()
+        logger.info("🛑 All processes stopped")
+
+
+def build_specs() -> List[ProcessSpec]:
+    """Process layout from settings (counts, ports)"""
+    port = os.environ.get("PORT", "10000")
+    heartbeat_dir = Path(settings.WORKER_HEARTBEAT_DIR)
+    specs = [
+        ProcessSpec(
+            name="api",
+            cmd=[sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "src.main:app"],
+            env={"PORT": port, "API_WORKERS": str(settings.API_WORKERS), "PROCESS_ROLE": "api"},
+            http_check=f"http://127.0.0.1:{port}/",
+        ),
+        ProcessSpec(
+            name="celery-worker",
+            cmd=[sys.executable, "-m", "celery", "-A", "workers.celery_tasks", "worker",
+                 "--loglevel=info", f"--concurrency={settings.CELERY_CONCURRENCY}"],
+            env={"PROCESS_ROLE": "celery"},
+        ),
+        ProcessSpec(
+            name="celery-beat",
+            cmd=[sys.executable, "-m", "celery", "-A", "workers.celery_tasks", "beat", "--loglevel=info"],
+            env={"PROCESS_ROLE": "script"},   # Only schedules; never touches the database
+        ),
+    ]
+    for i in range(settings.PDF_WORKERS):
+        specs.append(ProcessSpec(
+            name=f"pdf-processor-{i}",
+            cmd=[sys.executable, "-m", "workers.pdf_processor"],
+            env={
+                "PROCESS_ROLE": "pdf_worker",
+                "WORKER_HEARTBEAT_FILE": str(heartbeat_dir / f"pdf-processor-{i}"),
+                "METRICS_PORT_PDF_WORKER": str(settings.METRICS_PORT_PDF_WORKER + i * METRICS_PORT_STRIDE)
+                if settings.METRICS_PORT_PDF_WORKER else "0",
+            },
+            heartbeat_file=heartbeat_dir / f"pdf-processor-{i}",
+        ))
+    for i in range(settings.AI_WORKERS):
+        specs.append(ProcessSpec(
+            name=f"ai-generator-{i}",
+            cmd=[sys.executable, "-m", "workers.ai_generator"],
+            env={
+                "PROCESS_ROLE": "ai_worker",
+                "WORKER_HEARTBEAT_FILE": str(heartbeat_dir / f"ai-generator-{i}"),
+                "METRICS_PORT_AI_WORKER": str(settings.METRICS_PORT_AI_WORKER + i * METRICS_PORT_STRIDE)
+                if settings.METRICS_PORT_AI_WORKER else "0",
+            },
+            heartbeat_file=heartbeat_dir / f"ai-generator-{i}",
+        ))
+    return specs
+
+
+if __name__ == "__main__":
+    specs = build_specs()
+    logger.info(f"🚀 Supervisor starting {len(specs)} processes: {', '.join(s.name for s in specs)}")
+    Supervisor(specs).run()